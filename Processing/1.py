@@ -1,6 +1,8 @@
 import numpy as np
 import pandas as pd
 
+from eeg_segmen import deteksi_segmen
+
 def deteksi_disleksia(
     data,
     sampling_rate,
@@ -16,39 +18,19 @@ def deteksi_disleksia(
     indikasi_ratio    : rasio minimal segmen terindikasi
     """
 
-    data = np.array(data)
-    samples_per_segment = sampling_rate * segment_duration
-
-    # Jumlah segmen
-    total_segments = len(data) // samples_per_segment
-    if total_segments == 0:
-        raise ValueError("Data terlalu pendek untuk dibagi menjadi segmen")
-
-    indikasi = 0
-
-    for i in range(total_segments):
-        start = i * samples_per_segment
-        end = start + samples_per_segment
-        segment = data[start:end]
-
-        # Contoh fitur: rata-rata nilai absolut
-        feature_value = np.mean(np.abs(segment))
-
-        if feature_value > threshold:
-            indikasi += 1
-
-    rasio_indikasi = indikasi / total_segments
-
-    if rasio_indikasi >= indikasi_ratio:
-        hasil = "disleksia"
-    else:
-        hasil = "tidak disleksia"
+    hasil = deteksi_segmen(
+        data,
+        sampling_rate,
+        segment_duration=segment_duration,
+        rules=[("mean_abs", ">", threshold)],
+        indikasi_ratio=indikasi_ratio
+    )
 
     return {
-        "total_segmen": total_segments,
-        "segmen_terindikasi": indikasi,
-        "rasio": rasio_indikasi,
-        "hasil": hasil
+        "total_segmen": hasil["total_segmen"],
+        "segmen_terindikasi": hasil["segmen_terindikasi"],
+        "rasio": hasil["rasio"],
+        "hasil": hasil["hasil"]
     }
 
 df = pd.read_csv("Deteksi Disleksia 16 Agustus 2024.csv")
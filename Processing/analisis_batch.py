@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Analisis batch tanpa GUI untuk arsip rekaman.
+
+    python analisis_batch.py arsip/ "klinik_*/sesi_*.csv" [--out hasil.ndjson]
+                             [--jobs 4] [--max-mb 1500] [--bootstrap] [--lanjut]
+
+Setiap argumen berupa folder (semua *.csv di dalamnya, rekursif) atau pola
+glob. File dianalisis paralel di ProcessPoolExecutor (eeg_proses.ringkasan_cache,
+jadi rekaman yang pernah dianalisis langsung diambil dari cache) dan setiap
+hasil ditulis sebagai satu baris JSON (NDJSON) begitu selesai. --lanjut
+melewati file yang sudah ada di --out sehingga job semalam bisa disambung.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from eeg_epoch import MARKER_SUFFIX
+
+# ================== DAFTAR FILE ==================
+def kumpulkan_file(patterns):
+    """Folder / pola glob -> daftar path CSV rekaman (tanpa file marker), unik & terurut."""
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            found = glob.glob(os.path.join(pattern, "**", "*.csv"), recursive=True)
+        else:
+            found = glob.glob(pattern, recursive=True)
+        files += [f for f in found if os.path.isfile(f) and not f.endswith(MARKER_SUFFIX)]
+    return sorted(set(os.path.abspath(f) for f in files))
+
+def sudah_selesai(path):
+    """Path file yang sudah punya baris di NDJSON keluaran (untuk --lanjut)."""
+    done = set()
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    done.add(json.loads(line)['file'])
+                except (ValueError, KeyError):
+                    continue    # baris terakhir terpotong (job sebelumnya dihentikan)
+    return done
+
+# ================== WORKER ==================
+def _batasi_memori(max_mb):
+    # Initializer worker: alokasi di atas batas -> MemoryError untuk file itu saja
+    if max_mb:
+        import resource
+        limit = int(max_mb * 1024 * 1024)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+def baris_hasil(filename, ringkasan, bootstrap=False):
+    """Ringkasan satu rekaman -> dict datar siap JSON (fitur, kriteria, tingkat)."""
+    from eeg_bootstrap import bootstrap_kriteria
+    from eeg_epoch import skor_soal
+    from eeg_kriteria import ATURAN, BAND_KEYS, skor_batch
+    from eeg_model import MODEL
+
+    band_power, delta_variability, correlation = ringkasan['statistik']
+    skor = skor_batch(np.asarray(band_power, dtype=float)[None], [delta_variability], [correlation])[0]
+    row = {
+        'file': filename,
+        'ok': True,
+        'cache': ringkasan.get('cache', False),
+        'bertahap': ringkasan['bertahap'],
+        'fs': float(ringkasan['fs']),
+        'durasi': float(ringkasan['durasi']),
+        'mains_hz': ringkasan['mains_hz'],
+        'rasio_artefak': float(ringkasan['rasio_artefak']),
+    }
+    row.update({f'rel_{k}': float(v) for k, v in zip(BAND_KEYS, skor['relative_power'])})
+    row.update({f'fitur_{k}': v for k, v in ringkasan['fitur'].items()})
+    for name, value, passed in zip(ATURAN.names, skor['values'], skor['passed']):
+        row[f'nilai_{name}'] = float(value)
+        row[f'lulus_{name}'] = bool(passed)
+    row.update({
+        'kriteria_terpenuhi': int(skor['kriteria_terpenuhi']),
+        'skor': float(skor['skor']),
+        'confidence_score': float(skor['confidence_score']),
+        'tingkat': ATURAN.tingkat_names[skor['tingkat']],
+        'probabilitas': None if MODEL is None else float(MODEL.prob_statistik(*ringkasan['statistik'])),
+    })
+    if bootstrap:
+        boot = bootstrap_kriteria(ringkasan['segmen'])
+        if boot:
+            row.update({f'p_{name}': float(p) for name, p in zip(ATURAN.tingkat_names, boot['p_tingkat'])})
+    if ringkasan.get('soal'):
+        # Tingkat kanal kiri per soal, urut nomor soal
+        per_soal = skor_soal(ringkasan['soal'])
+        row['tingkat_per_soal'] = [ATURAN.tingkat_names[t] for t in per_soal['tingkat'][:, 0]]
+    return row
+
+def analisis_satu(filename, bootstrap=False, **config):
+    """Dijalankan di worker: satu file -> (baris hasil, ukuran file). Error jadi baris ok=False."""
+    from eeg_proses import ringkasan_cache
+    size = 0
+    try:
+        size = os.path.getsize(filename)
+        # CSV tanpa kolom logger -> FormatRekamanError dari ringkasan_file, jadi baris ok=False
+        return baris_hasil(filename, ringkasan_cache(filename, **config), bootstrap), size
+    except MemoryError:
+        return {'file': filename, 'ok': False, 'error': "MemoryError (melebihi --max-mb)"}, size
+    except Exception as e:
+        return {'file': filename, 'ok': False, 'error': f"{type(e).__name__}: {e}"}, size
+
+# ================== BATCH ==================
+def jalankan_batch(files, out, jobs=None, max_mb=None, tasks_per_child=50, bootstrap=False, progress=sys.stderr,
+                   **config):
+    """
+    Analisis semua files di pool proses, tulis NDJSON ke file object out.
+    File yang sedang diproses dibatasi 2 x jobs (antrian tidak menahan
+    ribuan future); worker didaur ulang setiap tasks_per_child file agar
+    fragmentasi memori tidak menumpuk semalaman (Python >= 3.11). Worker
+    yang mati tidak menghentikan batch: pool dibuat ulang, file yang ikut
+    gagal dicoba sekali lagi lalu ditulis sebagai baris ok=False. Return
+    (ok, gagal).
+    """
+    jobs = jobs or os.cpu_count() or 1
+    n_ok = n_fail = 0
+    n_bytes = 0
+    t0 = last = time.perf_counter()
+    pending = iter(files)
+    ulang = []          # file yang ikut gagal saat worker mati: dicoba sekali lagi di pool baru
+    dicoba = set()
+    daur_ulang = {}
+    if sys.version_info >= (3, 11):
+        # max_tasks_per_child baru ada di Python 3.11; versi lama: worker hidup sampai batch selesai
+        daur_ulang['max_tasks_per_child'] = tasks_per_child
+
+    def buat_pool():
+        return ProcessPoolExecutor(jobs, initializer=_batasi_memori, initargs=(max_mb,), **daur_ulang)
+
+    pool = buat_pool()
+    running = {}        # future -> file
+
+    def isi():
+        while len(running) < 2 * jobs:
+            filename = ulang.pop() if ulang else next(pending, None)
+            if filename is None:
+                break
+            running[pool.submit(analisis_satu, filename, bootstrap, **config)] = filename
+
+    try:
+        isi()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            if any(isinstance(fut.exception(), BrokenProcessPool) for fut in done):
+                # Worker mati (mis. dibunuh karena RLIMIT_AS): semua future pool ini ikut gagal,
+                # kumpulkan semuanya lalu lanjutkan batch di pool baru
+                done |= wait(running)[0]
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool = buat_pool()
+            for fut in done:
+                filename = running.pop(fut)
+                try:
+                    row, size = fut.result()
+                except BrokenProcessPool:
+                    if filename not in dicoba:
+                        dicoba.add(filename)
+                        ulang.append(filename)
+                        continue
+                    row, size = {'file': filename, 'ok': False,
+                                 'error': "BrokenProcessPool: worker mati (mis. melebihi --max-mb)"}, 0
+                except Exception as e:
+                    row, size = {'file': filename, 'ok': False, 'error': f"{type(e).__name__}: {e}"}, 0
+                out.write(json.dumps(row, ensure_ascii=False) + "\n")
+                n_bytes += size
+                if row['ok']:
+                    n_ok += 1
+                else:
+                    n_fail += 1
+            out.flush()
+            isi()
+
+            now = time.perf_counter()
+            if progress and (now - last > 2 or not running):
+                last = now
+                n, dt = n_ok + n_fail, now - t0
+                eta = (len(files) - n) * dt / max(n, 1)
+                print(f"\r{n}/{len(files)} file | {n / dt:.2f} file/dtk | {n_bytes / dt / 1e6:.1f} MB/dtk | "
+                      f"gagal {n_fail} | sisa ~{eta / 60:.0f} mnt", end="", file=progress, flush=True)
+    finally:
+        pool.shutdown(cancel_futures=True)
+    if progress:
+        print(file=progress)
+    return n_ok, n_fail
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("input", nargs="+", help="folder atau pola glob rekaman CSV")
+    ap.add_argument("--out", default="-", help="file NDJSON keluaran ('-' = stdout)")
+    ap.add_argument("--jobs", type=int, default=None)
+    ap.add_argument("--max-mb", type=float, default=None, help="batas memori virtual per worker (MB)")
+    ap.add_argument("--tasks-per-child", type=int, default=50)
+    ap.add_argument("--bootstrap", action="store_true", help="tambah peluang tingkat (eeg_bootstrap)")
+    ap.add_argument("--lanjut", action="store_true", help="lewati file yang sudah ada di --out")
+    ap.add_argument("--gain", type=float, default=1000.0)
+    ap.add_argument("--vref", type=float, default=1.65)
+    ap.add_argument("--float32", action="store_true")
+    ap.add_argument("--multirate", action="store_true")
+    ap.add_argument("--mains", type=float, default=None)
+    ap.add_argument("--resample-fs", type=float, default=None)
+    ap.add_argument("--chunked-mb", type=float, default=50, help="CSV sebesar ini ke atas dianalisis bertahap")
+    args = ap.parse_args()
+
+    files = kumpulkan_file(args.input)
+    if args.lanjut and args.out != "-":
+        done = sudah_selesai(args.out)
+        files = [f for f in files if f not in done]
+    if not files:
+        raise SystemExit("Tidak ada rekaman untuk dianalisis")
+    print(f"{len(files)} rekaman, {args.jobs or os.cpu_count()} worker", file=sys.stderr)
+
+    # Argumen ringkasan_file, sama dengan konfigurasi_pipeline aplikasi
+    config = dict(gain=args.gain, vref=args.vref, dtype=np.float32 if args.float32 else np.float64,
+                  multirate=args.multirate, mains_freq=args.mains, resample_fs=args.resample_fs,
+                  chunked_min_bytes=int(args.chunked_mb * 1024 * 1024))
+
+    out = sys.stdout if args.out == "-" else open(args.out, "a" if args.lanjut else "w", encoding="utf-8")
+    try:
+        t0 = time.perf_counter()
+        n_ok, n_fail = jalankan_batch(files, out, args.jobs, args.max_mb, args.tasks_per_child, args.bootstrap,
+                                      **config)
+        dt = time.perf_counter() - t0
+        print(f"Selesai: {n_ok} berhasil, {n_fail} gagal dalam {dt:.1f} detik "
+              f"({(n_ok + n_fail) / dt:.2f} file/dtk)", file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
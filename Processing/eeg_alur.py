@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from eeg_artefak import deteksi_artefak
+from eeg_bootstrap import jumlah_segmen
+from eeg_dag import PipelineDAG
+from eeg_dsp import analysis_rate, bandpass, decimate_mask, filter_bands, filter_bands_multirate, lut_to_uv, mains_filter
+from eeg_kriteria import BANDS, statistik_band
+
+# ================== DAG PIPELINE EEG ==================
+def alur_eeg(adc, fs, gain, vref, mains_hz, dtype=np.float64, multirate=False,
+             channels=("kiri", "kanan"), max_workers=None):
+    """
+    adc      : array uint16 (kanal x sampel) pada grid seragam
+    fs       : sampling rate (Hz)
+    mains_hz : 50 / 60 Hz jala-jala
+
+    DAG tahap per kanal (nama output, <ch> = 'kiri' / 'kanan'):
+      uv_<ch>          µV setelah notch jala-jala + harmonik
+      artefak_<ch>     dict mask deteksi_artefak
+      mask_<ch>        mask sampel bersih di fs_bands
+      <ch>/<band>      satu bandpass per band (non-multirate, tidak di-cache)
+      bands_<ch>       dict band analisis di fs_bands (tidak di-cache)
+      statistik_<ch>   (band_power, delta_variability, correlation)
+      band_powers_<ch> dict nama band -> mean(x**2)
+      segmen_<ch>      jumlahan per segmen untuk bootstrap (eeg_bootstrap)
+      filtered_<ch>    band di fs asli untuk grafik (tidak di-cache)
+    plus input 'adc' dan 'fs_bands'. Notch kedua kanal dan kelima filter
+    band per kanal tidak saling bergantung dan berjalan paralel.
+    """
+    dag = PipelineDAG(max_workers)
+    fs_bands = analysis_rate(fs, multirate=multirate)
+    dag.set("adc", adc).set("fs_bands", fs_bands)
+
+    def kanal(c, ch):
+        dag.add(f"uv_{ch}", lambda adc: mains_filter(lut_to_uv(adc[c], gain, vref, dtype), fs, mains_hz),
+                inputs=["adc"])
+        dag.add(f"artefak_{ch}", lambda adc, uv: deteksi_artefak(adc[c], uv, fs),
+                inputs=["adc", f"uv_{ch}"])
+        dag.add(f"mask_{ch}", lambda artefak: decimate_mask(artefak['bersih'], fs, fs_bands),
+                inputs=[f"artefak_{ch}"])
+
+        if multirate:
+            # Tahap desimasi dipakai bersama semua band -> satu node
+            dag.add(f"bands_{ch}", lambda uv: filter_bands_multirate(uv, fs, output='common')[0],
+                    inputs=[f"uv_{ch}"], cache=False)
+            dag.add(f"filtered_{ch}", lambda uv: filter_bands(uv, fs, multirate=True),
+                    inputs=[f"uv_{ch}"], cache=False)
+        else:
+            for name, (l, h) in BANDS.items():
+                dag.add(f"{ch}/{name}", lambda uv, l=l, h=h: bandpass(uv, l, h, fs),
+                        inputs=[f"uv_{ch}"], cache=False)
+            dag.add(f"bands_{ch}", lambda *sig: dict(zip(BANDS, sig)),
+                    inputs=[f"{ch}/{name}" for name in BANDS], cache=False)
+            dag.add(f"filtered_{ch}", lambda bands: bands,
+                    inputs=[f"bands_{ch}"], cache=False)
+
+        dag.add(f"statistik_{ch}", statistik_band, inputs=[f"bands_{ch}", f"mask_{ch}"])
+        dag.add(f"segmen_{ch}", lambda bands, mask: jumlah_segmen(bands, mask, fs_bands),
+                inputs=[f"bands_{ch}", f"mask_{ch}"])
+        dag.add(f"band_powers_{ch}", lambda bands: {name: np.mean(sig**2) for name, sig in bands.items()},
+                inputs=[f"bands_{ch}"])
+
+    for c, ch in enumerate(channels):
+        kanal(c, ch)
+    return dag
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Antrian job analisis yang persisten (SQLite), agar analisis tidak hilang
+bila aplikasi ditutup / crash di ProcessPage.
+
+    python eeg_antrian.py tambah sesi.csv ...     # masukkan rekaman ke antrian
+    python eeg_antrian.py pekerja [--jobs 2]      # proses antrian tanpa GUI
+    python eeg_antrian.py status                  # jumlah job per status + job terakhir
+    python eeg_antrian.py hasil 12                # baris hasil (JSON) job 12
+
+Job diklaim pekerja dengan lease (diperpanjang selama analisis berjalan);
+lease yang habis (pekerja mati) membuat job bisa diklaim ulang. Gagal ->
+dicoba lagi dengan jeda bertambah sampai MAX_PERCOBAAN. Hasil (ringkasan
++ baris datar analisis_batch.baris_hasil) tersimpan sebagai JSON sehingga
+bisa di-query langsung, mis. json_extract(baris, '$.tingkat').
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeout
+from contextlib import contextmanager
+
+from eeg_layanan import config_json, config_python, dari_json, ke_json
+
+# ================== KONFIGURASI ==================
+# Di samping modul (seperti aturan_kriteria.json), bukan folder kerja: antrian sama dari mana pun aplikasi dijalankan
+ANTRIAN_PATH = os.environ.get(
+    "EEG_ANTRIAN", os.path.join(os.path.dirname(os.path.abspath(__file__)), "antrian_analisis.sqlite"))
+LEASE_SECONDS = 120.0       # diperpanjang tiap LEASE_SECONDS / 3 selama job berjalan
+MAX_PERCOBAAN = 3
+RETRY_SECONDS = 5.0         # jeda sebelum percobaan ke-k: RETRY_SECONDS * 2**(k-1)
+POLL_SECONDS = 2.0          # pekerja menganggur mengecek job dari proses lain
+
+ANTRE, PROSES, SELESAI, GAGAL = "antre", "proses", "selesai", "gagal"
+
+SKEMA = """
+CREATE TABLE IF NOT EXISTS job (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    file         TEXT NOT NULL,
+    config       TEXT NOT NULL,              -- JSON argumen ringkasan_file
+    status       TEXT NOT NULL DEFAULT 'antre',
+    percobaan    INTEGER NOT NULL DEFAULT 0,
+    siap         REAL NOT NULL,              -- tidak diklaim sebelum waktu ini (jeda retry)
+    pemilik      TEXT,                       -- host:pid:thread pekerja
+    lease_sampai REAL,
+    dibuat       REAL NOT NULL,
+    selesai      REAL,
+    error        TEXT,
+    tingkat      TEXT,
+    baris        TEXT,                       -- JSON datar (analisis_batch.baris_hasil)
+    ringkasan    TEXT                        -- JSON eeg_layanan.ke_json
+);
+CREATE INDEX IF NOT EXISTS job_status ON job (status, siap);
+CREATE INDEX IF NOT EXISTS job_file ON job (file);
+"""
+
+def _hidup(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def _pid_pemilik(pemilik):
+    # 'host:pid:thread' -> pid, atau None jika format rusak (job itu dibiarkan sampai lease habis)
+    try:
+        return int((pemilik or "").split(':')[1])
+    except (IndexError, ValueError):
+        return None
+
+# ================== ANTRIAN ==================
+class AntrianAnalisis:
+    """
+    Akses antrian; satu koneksi SQLite per thread (mode WAL, jadi thread Tk
+    bisa membaca status sementara pekerja menulis). Klaim memakai
+    BEGIN IMMEDIATE sehingga beberapa pekerja / proses tidak pernah
+    mengambil job yang sama.
+    """
+
+    def __init__(self, path=ANTRIAN_PATH, lease=LEASE_SECONDS, max_percobaan=MAX_PERCOBAAN):
+        self.path = path
+        self.lease = lease
+        self.max_percobaan = max_percobaan
+        self._local = threading.local()
+        self._db().executescript(SKEMA)
+
+    def _db(self):
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.row_factory = sqlite3.Row
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    @contextmanager
+    def _transaksi(self):
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    def tambah(self, filename, **config):
+        """
+        Masukkan rekaman ke antrian -> id job. Jika rekaman + konfigurasi
+        yang sama masih antre / diproses, id job itu yang dikembalikan.
+        Job yang sudah selesai tidak dipakai ulang (file di path yang sama
+        bisa sudah direkam ulang); analisis ulang isi yang sama tetap murah
+        lewat cache eeg_cache.
+        """
+        filename = os.path.abspath(filename)
+        config = json.dumps(config_json(config), sort_keys=True)
+        with self._transaksi() as db:
+            row = db.execute("SELECT id FROM job WHERE file = ? AND config = ? AND status IN (?, ?) "
+                             "ORDER BY id DESC LIMIT 1", (filename, config, ANTRE, PROSES)).fetchone()
+            if row is not None:
+                return row['id']
+            now = time.time()
+            return db.execute("INSERT INTO job (file, config, siap, dibuat) VALUES (?, ?, ?, ?)",
+                              (filename, config, now, now)).lastrowid
+
+    def klaim(self, pemilik):
+        """
+        Ambil job tertua yang siap (atau yang lease-nya habis) -> dict
+        (id, file, config, percobaan) atau None. Job yang lease-nya sudah
+        habis MAX_PERCOBAAN kali (pekerja terus mati) ditandai gagal.
+        """
+        now = time.time()
+        with self._transaksi() as db:
+            while True:
+                row = db.execute("SELECT id, file, config, percobaan FROM job "
+                                 "WHERE (status = ? AND siap <= ?) OR (status = ? AND lease_sampai < ?) "
+                                 "ORDER BY id LIMIT 1", (ANTRE, now, PROSES, now)).fetchone()
+                if row is None:
+                    return None
+                if row['percobaan'] >= self.max_percobaan:
+                    db.execute("UPDATE job SET status = ?, selesai = ?, error = ? WHERE id = ?",
+                               (GAGAL, now, "Pekerja berhenti di tengah analisis", row['id']))
+                    continue
+                db.execute("UPDATE job SET status = ?, pemilik = ?, lease_sampai = ?, percobaan = percobaan + 1 "
+                           "WHERE id = ?", (PROSES, pemilik, now + self.lease, row['id']))
+                return {'id': row['id'], 'file': row['file'], 'percobaan': row['percobaan'] + 1,
+                        'config': config_python(json.loads(row['config']))}
+
+    def perpanjang(self, job_id, pemilik):
+        """Heartbeat; False jika lease sudah diambil pekerja lain."""
+        with self._transaksi() as db:
+            return db.execute("UPDATE job SET lease_sampai = ? WHERE id = ? AND status = ? AND pemilik = ?",
+                              (time.time() + self.lease, job_id, PROSES, pemilik)).rowcount == 1
+
+    def selesaikan(self, job_id, pemilik, ringkasan, baris=None):
+        with self._transaksi() as db:
+            return db.execute("UPDATE job SET status = ?, selesai = ?, error = NULL, lease_sampai = NULL, "
+                              "tingkat = ?, baris = ?, ringkasan = ? WHERE id = ? AND status = ? AND pemilik = ?",
+                              (SELESAI, time.time(), (baris or {}).get('tingkat'),
+                               None if baris is None else json.dumps(baris, ensure_ascii=False),
+                               ke_json(ringkasan).decode('utf-8'), job_id, PROSES, pemilik)).rowcount == 1
+
+    def gagalkan(self, job_id, pemilik, error, permanen=False):
+        """Percobaan gagal -> antre lagi dengan jeda, atau gagal permanen setelah MAX_PERCOBAAN."""
+        now = time.time()
+        with self._transaksi() as db:
+            row = db.execute("SELECT percobaan FROM job WHERE id = ? AND status = ? AND pemilik = ?",
+                             (job_id, PROSES, pemilik)).fetchone()
+            if row is None:
+                return
+            if permanen or row['percobaan'] >= self.max_percobaan:
+                db.execute("UPDATE job SET status = ?, selesai = ?, error = ?, lease_sampai = NULL WHERE id = ?",
+                           (GAGAL, now, error, job_id))
+            else:
+                db.execute("UPDATE job SET status = ?, siap = ?, error = ?, lease_sampai = NULL WHERE id = ?",
+                           (ANTRE, now + RETRY_SECONDS * 2 ** (row['percobaan'] - 1), error, job_id))
+
+    def pulihkan(self):
+        """
+        Job 'proses' milik proses mati di host ini (aplikasi crash / ditutup)
+        langsung dibuat bisa diklaim ulang, tanpa menunggu lease habis.
+        """
+        host = socket.gethostname()
+        with self._transaksi() as db:
+            rows = db.execute("SELECT id, pemilik FROM job WHERE status = ? AND pemilik LIKE ?",
+                              (PROSES, host + ":%")).fetchall()
+            pids = {r['id']: _pid_pemilik(r['pemilik']) for r in rows}
+            ids = [i for i, pid in pids.items() if pid is not None and pid != os.getpid() and not _hidup(pid)]
+            db.executemany("UPDATE job SET lease_sampai = 0 WHERE id = ?", [(i,) for i in ids])
+        return len(ids)
+
+    # ---- query ----
+    def job(self, job_id):
+        """Status job (tanpa ringkasan) sebagai dict, atau None."""
+        row = self._db().execute("SELECT id, file, status, percobaan, dibuat, selesai, error, tingkat, baris "
+                                 "FROM job WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['baris'] = json.loads(job['baris']) if job['baris'] else None
+        return job
+
+    def hasil(self, job_id):
+        """Ringkasan job yang selesai (format ringkasan_file), atau None."""
+        row = self._db().execute("SELECT ringkasan FROM job WHERE id = ? AND status = ?",
+                                 (job_id, SELESAI)).fetchone()
+        return None if row is None else dari_json(row['ringkasan'])
+
+    def daftar(self, status=None, limit=20):
+        sql = "SELECT id, file, status, percobaan, dibuat, selesai, error, tingkat FROM job"
+        args = ()
+        if status:
+            sql, args = sql + " WHERE status = ?", (status,)
+        rows = self._db().execute(sql + " ORDER BY id DESC LIMIT ?", args + (limit,)).fetchall()
+        return [dict(r) for r in rows]
+
+    def jumlah(self):
+        rows = self._db().execute("SELECT status, COUNT(*) FROM job GROUP BY status").fetchall()
+        return {status: n for status, n in rows}
+
+# ================== PEKERJA ==================
+class PekerjaAntrian:
+    """
+    Thread latar yang mengklaim job satu per satu dan menjalankannya lewat
+    analisis(filename, **config) -> Future (default AnalysisWorker.submit,
+    jadi tetap di proses worker / layanan server). Thread Tk tidak pernah
+    menunggu: halaman hasil cukup mem-poll antrian.job(id).
+    """
+
+    def __init__(self, antrian, analisis):
+        self.antrian = antrian
+        self.analisis = analisis
+        self._bangun = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="eeg-antrian", daemon=True)
+            self._thread.start()
+        return self
+
+    def tambah(self, filename, **config):
+        job_id = self.antrian.tambah(filename, **config)
+        self._bangun.set()
+        return job_id
+
+    def stop(self):
+        self._stop.set()
+        self._bangun.set()
+
+    def _loop(self):
+        pemilik = f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+        self.antrian.pulihkan()
+        while not self._stop.is_set():
+            job = self.antrian.klaim(pemilik)
+            if job is None:
+                self._bangun.wait(POLL_SECONDS)
+                self._bangun.clear()
+                continue
+            self._jalankan(job, pemilik)
+
+    def _jalankan(self, job, pemilik):
+        from analisis_batch import baris_hasil
+        from eeg_arsip import FormatRekamanError
+
+        try:
+            future = self.analisis(job['file'], **job['config'])
+            while True:
+                try:
+                    ringkasan = future.result(timeout=self.antrian.lease / 3)
+                    break
+                except FutureTimeout:
+                    if self._stop.is_set() or not self.antrian.perpanjang(job['id'], pemilik):
+                        return      # aplikasi ditutup / job diambil alih; lease habis -> diklaim ulang
+            baris = baris_hasil(job['file'], ringkasan)
+        except (FileNotFoundError, FormatRekamanError) as e:
+            # Rekaman dihapus / dipindah / bukan CSV logger: mencoba lagi tidak ada gunanya
+            self.antrian.gagalkan(job['id'], pemilik, f"{type(e).__name__}: {e}", permanen=True)
+            return
+        except Exception as e:
+            self.antrian.gagalkan(job['id'], pemilik, f"{type(e).__name__}: {e}")
+            return
+        self.antrian.selesaikan(job['id'], pemilik, ringkasan, baris)
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--db", default=ANTRIAN_PATH)
+    sub = ap.add_subparsers(dest="perintah", required=True)
+    p = sub.add_parser("tambah")
+    p.add_argument("files", nargs="+")
+    p = sub.add_parser("pekerja")
+    p.add_argument("--jobs", type=int, default=1)
+    sub.add_parser("status")
+    p = sub.add_parser("hasil")
+    p.add_argument("id", type=int)
+    args = ap.parse_args()
+
+    antrian = AntrianAnalisis(args.db)
+    if args.perintah == "tambah":
+        # Konfigurasi yang sama dengan aplikasi: kunci cache & hasil sama dengan job dari r_1 / r_2
+        from eeg_aplikasi import konfigurasi_pipeline
+        config = konfigurasi_pipeline()
+        for f in args.files:
+            print(antrian.tambah(f, **config), os.path.abspath(f))
+    elif args.perintah == "pekerja":
+        from eeg_worker import AnalysisWorker
+        workers = [AnalysisWorker() for _ in range(args.jobs)]
+        pekerja = [PekerjaAntrian(antrian, w.submit).start() for w in workers]
+        print(f"{args.jobs} pekerja memproses {args.db} (Ctrl+C untuk berhenti)")
+        try:
+            while True:
+                time.sleep(POLL_SECONDS)
+        except KeyboardInterrupt:
+            for p in pekerja:
+                p.stop()
+            for w in workers:
+                w.shutdown()
+    elif args.perintah == "status":
+        print(json.dumps(antrian.jumlah()))
+        for job in antrian.daftar():
+            print(f"{job['id']:>5} {job['status']:<8} {job['percobaan']} {job['tingkat'] or '-':<10} "
+                  f"{os.path.basename(job['file'])} {job['error'] or ''}")
+    else:
+        job = antrian.job(args.id)
+        if job is None:
+            raise SystemExit(f"Job {args.id} tidak ada")
+        print(json.dumps(job, ensure_ascii=False, indent=2))
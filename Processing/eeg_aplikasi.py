@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lem pipeline yang dipakai bersama aplikasi Tk (r_1.py, r_2.py) dan CLI:
+konfigurasi analisis, hasil diagnosis untuk UI (deteksi_dari_statistik),
+pipeline di proses ini (run_eeg_pipeline) dan hasil dari ringkasan worker
+(hasil_dari_ringkasan, kanal kanan juga diminta dari worker). Tidak meng-import Tk / pygame.
+"""
+
+import os
+import numpy as np
+
+from eeg_hasil import LazyResult
+
+# Protokol kriteria (aturan_kriteria.json), model logistik & bootstrap dimuat
+# di dalam fungsi: aplikasi meng-import modul ini saat start (konfigurasi_pipeline).
+
+# ================== KONFIGURASI ==================
+GAIN = 1000.0
+VREF = 1.65
+RESAMPLE_FS = None          # Hz grid analisis, None = fs estimasi dari timestamp
+ANALYSIS_DTYPE = np.float64 # np.float32 untuk Pi 1 GB (konversi, filter & hasil float32)
+MULTIRATE = False           # True = filter bank multirate (delta/theta di fs rendah)
+MAINS_FREQ = None           # 50 / 60 Hz, None = deteksi otomatis dari FFT pendek
+CHUNKED_MIN_BYTES = 50 * 1024 * 1024  # CSV sebesar ini ke atas dianalisis bertahap (out-of-core)
+
+def konfigurasi_pipeline(dtype=ANALYSIS_DTYPE):
+    """Konfigurasi run_eeg_pipeline sebagai argumen ringkasan_file (worker, antrian, CLI)."""
+    return dict(gain=GAIN, vref=VREF, dtype=dtype, multirate=MULTIRATE, mains_freq=MAINS_FREQ,
+                resample_fs=RESAMPLE_FS, chunked_min_bytes=CHUNKED_MIN_BYTES)
+
+# ================== DIAGNOSIS ==================
+def deteksi_disleksia_riset(delta_signal, theta_signal, alpha_signal, beta_signal, gamma_signal, fs, mask=None):
+    from eeg_kriteria import statistik_band
+
+    # Power, variabilitas & korelasi hanya dari sampel bersih (mask dari deteksi_artefak)
+    statistik = statistik_band([delta_signal, theta_signal, alpha_signal, beta_signal, gamma_signal], mask)
+    return deteksi_dari_statistik(*statistik)
+
+def deteksi_dari_statistik(band_power, delta_variability, correlation):
+    """
+    Statistik band satu kanal -> dict diagnosis untuk UI. Teks per tingkat
+    dari protokol (aturan_kriteria.json) ada di 'tampilan'; tiap aplikasi
+    memilih field yang ditampilkan (r_1: label, rekomendasi_singkat;
+    r_2: ringkas, icon, color, rekomendasi, narasi).
+    """
+    from eeg_kriteria import aturan_aktif, skor_batch
+    from eeg_model import model_aktif
+
+    aturan = aturan_aktif()
+    results = {'kriteria': {}, 'scores': {}, 'indikasi': []}
+
+    # Power per band (delta..gamma), bisa dari sinyal penuh atau akumulasi bertahap.
+    # Kriteria & tingkat dihitung skor_batch (satu sesi), di sini hanya dibungkus dict untuk UI.
+    skor = skor_batch(np.asarray(band_power, dtype=float)[None], [delta_variability], [correlation])[0]
+    delta_rel, theta_rel, alpha_rel, beta_rel, gamma_rel = (float(r) for r in skor['relative_power'])
+
+    for (name, threshold, description), value, passed in zip(aturan.kriteria, skor['values'], skor['passed']):
+        results['kriteria'][name] = {'value': float(value), 'threshold': threshold, 'passed': bool(passed), 'description': description}
+
+    tampilan = aturan.tampilan[skor['tingkat']]
+
+    # Probabilitas model logistik (eeg_model) di samping tingkat aturan; None jika belum ada model
+    probabilitas = None
+    model = model_aktif()
+    if model is not None:
+        probabilitas = float(model.prob_statistik(band_power, delta_variability, correlation))
+
+    results.update({
+        'tingkat': aturan.tingkat_names[skor['tingkat']],
+        'diagnosis': tampilan['label'],
+        'tampilan': tampilan,
+        'probabilitas': probabilitas,
+        'confidence': aturan.keyakinan[skor['tingkat']],
+        'confidence_score': float(skor['confidence_score']),
+        'kriteria_terpenuhi': int(skor['kriteria_terpenuhi']),
+        'total_kriteria': len(aturan.kriteria),
+        'rekomendasi': tampilan['rekomendasi'],
+        'relative_power': {
+            'delta': delta_rel, 'theta': theta_rel, 'alpha': alpha_rel, 'beta': beta_rel, 'gamma': gamma_rel
+        }
+    })
+    return results
+
+def teks_bootstrap(boot):
+    """Baris teks peluang tingkat dari bootstrap_kriteria (untuk hasil & laporan)."""
+    from eeg_kriteria import aturan_aktif
+
+    baris = [f"PELUANG TINGKAT (bootstrap {boot['n_boot']} replikat, {boot['n_segmen']} segmen):"]
+    baris += [f"  {name:<18}: {p * 100:.1f}%" for name, p in zip(aturan_aktif().tingkat_names, boot['p_tingkat'])]
+    return baris
+
+def teks_soal(soal):
+    """Baris teks tingkat per soal kiri | kanan (eeg_epoch.statistik_soal), semua soal dinilai sekaligus."""
+    from eeg_epoch import skor_soal
+    from eeg_kriteria import aturan_aktif
+
+    aturan = aturan_aktif()
+    baris = [f"PER SOAL ({soal['panjang']:.1f} detik pertama tiap soal, kiri | kanan):"]
+    for nomor, skor in zip(soal['nomor'], skor_soal(soal)):
+        kanal = " | ".join(f"{s['kriteria_terpenuhi']}/{len(aturan.kriteria)} {aturan.tingkat_names[s['tingkat']]}" for s in skor)
+        baris.append(f"Soal {nomor}: {kanal}")
+    return baris
+
+# ================== PIPELINE ==================
+def run_eeg_pipeline_bertahap(filename, dtype=ANALYSIS_DTYPE):
+    """Rekaman panjang: statistik diakumulasi per blok, sinyal lengkap tidak disimpan."""
+    from eeg_arsip import ADC_COLUMNS
+    from eeg_bertahap import analisis_bertahap
+    from eeg_bootstrap import bootstrap_kriteria
+    from eeg_kriteria import BANDS, kriteria_bilateral
+
+    config = dict(dtype=dtype, multirate=MULTIRATE)
+    kiri = analisis_bertahap(filename, GAIN, VREF, fs=RESAMPLE_FS, columns=ADC_COLUMNS[:1], mains_hz=MAINS_FREQ,
+                             **config)
+    statistik_kiri = kiri['statistik'][0]
+    hasil = deteksi_dari_statistik(*statistik_kiri)
+    hasil['rasio_artefak'] = float(kiri['rasio_artefak'][0])
+
+    res = LazyResult({
+        "ok": True,
+        "bertahap": True,
+        "analysis": hasil,
+        "fs": kiri['fs'],
+        "durasi": kiri['t_end'] - kiri['t_start'],
+        "mains_hz": kiri['mains_hz'],
+        "band_powers": dict(zip(BANDS, statistik_kiri[0]))
+    })
+    res.lazy("bootstrap", lambda: bootstrap_kriteria(kiri['segmen'][0]))
+
+    def analisis_kanan():
+        kanan = res["bertahap_kanan"]
+        hasil_kanan = deteksi_dari_statistik(*kanan['statistik'][0])
+        hasil_kanan['rasio_artefak'] = float(kanan['rasio_artefak'][0])
+        return hasil_kanan
+
+    # Kanal kanan = satu lintasan baca file lagi, hanya jika diminta
+    res.lazy("bertahap_kanan", lambda: analisis_bertahap(
+        filename, GAIN, VREF, fs=kiri['fs'], columns=ADC_COLUMNS[1:], mains_hz=kiri['mains_hz'], **config))
+    res.lazy("analysis_kanan", analisis_kanan)
+    res.lazy("bilateral", lambda: kriteria_bilateral(
+        *(np.stack(pair) for pair in zip(statistik_kiri, res["bertahap_kanan"]['statistik'][0]))))
+    return res
+
+def run_eeg_pipeline(filename, dtype=ANALYSIS_DTYPE):
+    try:
+        from eeg_bootstrap import bootstrap_kriteria
+        from eeg_epoch import baca_marker
+        from eeg_kriteria import kriteria_bilateral
+        from eeg_proses import siapkan_alur, soal_dari_alur
+
+        if os.path.getsize(filename) >= CHUNKED_MIN_BYTES:
+            return run_eeg_pipeline_bertahap(filename, dtype)
+
+        # Tahap pipeline sebagai DAG: notch per kanal dan filter per band
+        # berjalan paralel di thread pool, hasil tiap tahap di-cache.
+        t, fs, mains_hz, alur = siapkan_alur(filename, GAIN, VREF, dtype, MULTIRATE, MAINS_FREQ, RESAMPLE_FS)
+
+        # Diagnosis hanya butuh kanal kiri. Band kanal kanan dan sinyal band
+        # untuk grafik baru dihitung saat pertama kali diakses (LazyResult).
+        awal = alur.run("statistik_kiri", "band_powers_kiri", "artefak_kiri", "segmen_kiri", "uv_kiri")
+        # Statistik kiri disimpan agar analisis bilateral cukup memfilter kanal kanan
+        statistik_kiri = awal["statistik_kiri"]
+        hasil = deteksi_dari_statistik(*statistik_kiri)
+        hasil['rasio_artefak'] = awal["artefak_kiri"]['rasio_artefak']
+
+        res = LazyResult({
+            "ok": True,
+            "analysis": hasil,
+            "fs": fs,
+            "t": t,
+            "durasi": float(t[-1] - t[0]),
+            "raw_uv": awal["uv_kiri"],
+            "mains_hz": mains_hz,
+            "band_powers": awal["band_powers_kiri"],
+            "fs_bands": alur["fs_bands"],
+            "alur": alur
+        })
+
+        def analisis_kanan():
+            hasil_kanan = deteksi_dari_statistik(*alur["statistik_kanan"])
+            hasil_kanan['rasio_artefak'] = res["artefak_kanan"]['rasio_artefak']
+            return hasil_kanan
+
+        def bilateral():
+            # Kiri (sudah dihitung) + kanan -> matriks kanal x band, satu pass kriteria
+            statistik_kanan = alur["statistik_kanan"]
+            return kriteria_bilateral(*(np.stack(pair) for pair in zip(statistik_kiri, statistik_kanan)))
+
+        # 'filtered' untuk grafik selalu di fs asli; 'kanan' di fs_bands
+        res.lazy("filtered", lambda: alur["filtered_kiri"])
+        res.lazy("raw_uv_kanan", lambda: alur["uv_kanan"])
+        res.lazy("kanan", lambda: alur["bands_kanan"])
+        res.lazy("artefak_kanan", lambda: alur["artefak_kanan"])
+        res.lazy("analysis_kanan", analisis_kanan)
+        res.lazy("bilateral", bilateral)
+        res.lazy("bootstrap", lambda: bootstrap_kriteria(awal["segmen_kiri"]))
+        # Statistik per soal dari marker timeline tes (None jika tidak ada file marker)
+        res.lazy("soal", lambda: soal_dari_alur(alur, t, baca_marker(filename)))
+        return res
+    except Exception as e:
+        return {"ok": False, "message": str(e)}
+
+def hasil_dari_ringkasan(filename, ringkasan, minta_kanan=None):
+    """
+    Ringkasan kanal kiri dari worker (eeg_proses.ringkasan_cache) ->
+    LazyResult untuk halaman hasil. Data grafik ada di 'plot' (sudah
+    didesimasi), sinyal lengkap tidak pernah dihitung di proses Tk.
+    minta_kanan() mengembalikan ringkasan kanal kanan (mis. worker.submit(
+    filename, kanal="kanan", ...).result()); dipanggil hanya jika
+    'analysis_kanan' / 'bilateral' diakses.
+    """
+    from eeg_bootstrap import bootstrap_kriteria
+    from eeg_kriteria import kriteria_bilateral
+
+    hasil = deteksi_dari_statistik(*ringkasan['statistik'])
+    hasil['rasio_artefak'] = ringkasan['rasio_artefak']
+    res = LazyResult({"ok": True, "analysis": hasil, **ringkasan})
+    res.lazy("bootstrap", lambda: bootstrap_kriteria(ringkasan['segmen']))
+    if minta_kanan is None:
+        return res
+
+    def analisis_kanan():
+        kanan = res["ringkasan_kanan"]
+        hasil_kanan = deteksi_dari_statistik(*kanan['statistik'])
+        hasil_kanan['rasio_artefak'] = kanan['rasio_artefak']
+        return hasil_kanan
+
+    res.lazy("ringkasan_kanan", minta_kanan)
+    res.lazy("analysis_kanan", analisis_kanan)
+    res.lazy("bilateral", lambda: kriteria_bilateral(
+        *(np.stack(pair) for pair in zip(ringkasan['statistik'], res["ringkasan_kanan"]['statistik']))))
+    return res
+
+# ================== ANTRIAN (POLL DARI TK) ==================
+POLL_AWAL_MS = 100      # interval poll pertama; naik dua kali lipat per poll
+POLL_MAKS_MS = 1000     # analisis lama tidak membebani SQLite dari thread Tk
+
+def pantau_job(widget, antrian, job_id, selesai, status=None, interval=POLL_AWAL_MS):
+    """
+    Poll job antrian (eeg_antrian) dengan widget.after() sampai SELESAI /
+    GAGAL, lalu panggil selesai(job) sekali. status(job) dipanggil pada
+    tiap poll selama job belum selesai. Job yang hilang dari antrian atau
+    antrian yang tidak bisa dibaca dianggap GAGAL (spinner tidak berputar
+    selamanya).
+    """
+    from eeg_antrian import GAGAL, SELESAI
+
+    try:
+        job = antrian.job(job_id)
+        if job is None:
+            job = {'id': job_id, 'status': GAGAL, 'error': f"Job {job_id} tidak ada di antrian"}
+    except Exception as e:
+        job = {'id': job_id, 'status': GAGAL, 'error': f"Antrian tidak bisa dibaca: {e}"}
+    if job['status'] in (SELESAI, GAGAL):
+        selesai(job)
+        return
+    if status is not None:
+        status(job)
+    widget.after(interval, pantau_job, widget, antrian, job_id, selesai, status, min(interval * 2, POLL_MAKS_MS))
+
+def hasil_job(filename, antrian, job, minta_kanan=None):
+    """Job selesai / gagal dari pantau_job -> hasil untuk halaman hasil ({'ok': False, 'message'} jika gagal)."""
+    from eeg_antrian import GAGAL
+
+    try:
+        if job['status'] == GAGAL:
+            raise RuntimeError(job['error'])
+        ringkasan = antrian.hasil(job['id'])
+        if ringkasan is None:
+            raise RuntimeError(f"Ringkasan job {job['id']} tidak ada di antrian")
+        return hasil_dari_ringkasan(filename, ringkasan, minta_kanan=minta_kanan)
+    except Exception as e:
+        return {"ok": False, "message": str(e)}
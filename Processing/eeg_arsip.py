@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pandas as pd
+
+from eeg_dsp import ADC_BITS, lut_to_uv
+
+ADC_COLUMNS = ["ADC_KIRI", "ADC_KANAN"]
+
+# ================== REKAMAN (uint16) ==================
+class RekamanEEG:
+    """
+    Rekaman EEG dengan sampel tetap uint16 (kanal x sampel) plus kalibrasi
+    headset (gain, vref). Konversi ke µV dilakukan per blok lewat LUT
+    hanya saat sebuah tahap membutuhkannya.
+    """
+
+    def __init__(self, t, adc, gain, vref, channels=("kiri", "kanan")):
+        self.t = np.asarray(t, dtype=float)
+        self.adc = as_adc(np.atleast_2d(adc))
+        self.gain = float(gain)
+        self.vref = float(vref)
+        self.channels = list(channels)
+
+    def __len__(self):
+        return self.adc.shape[1]
+
+    @property
+    def nbytes(self):
+        return self.t.nbytes + self.adc.nbytes
+
+    def uv(self, channel=None, start=None, stop=None, dtype=np.float64):
+        """Blok µV (float) untuk kanal (indeks/nama, None = semua) dan rentang sampel."""
+        if isinstance(channel, str):
+            channel = self.channels.index(channel)
+        block = self.adc[:, start:stop] if channel is None else self.adc[channel, start:stop]
+        return lut_to_uv(block, self.gain, self.vref, dtype)
+
+    def with_calibration(self, gain, vref):
+        """Rekaman yang sama dengan kalibrasi lain (hanya ganti tabel, sampel dibagi)."""
+        return RekamanEEG(self.t, self.adc, gain, vref, self.channels)
+
+def as_adc(values):
+    """Nilai ADC -> uint16, di-clip ke rentang 12-bit."""
+    values = np.asarray(values)
+    if values.dtype == np.uint16:
+        return values
+    if np.issubdtype(values.dtype, np.floating):
+        values = np.rint(values)
+    return np.clip(values, 0, 2**ADC_BITS - 1).astype(np.uint16)
+
+# ================== CSV ==================
+class FormatRekamanError(ValueError):
+    """File bukan CSV logger (kolom Timestamp / ADC tidak ada)."""
+
+def cek_kolom(filename):
+    """Tolak CSV tanpa kolom logger sebelum dianalisis (hanya membaca baris header)."""
+    with open(filename, newline='', encoding='utf-8', errors='replace') as f:
+        header = [c.strip() for c in f.readline().split(',')]
+    missing = [c for c in ["Timestamp"] + ADC_COLUMNS if c not in header]
+    if missing:
+        raise FormatRekamanError(f"Format rekaman tidak dikenal, kolom tidak ada: {', '.join(missing)}")
+
+def adc_dari_frame(df, columns=ADC_COLUMNS):
+    """
+    DataFrame CSV logger -> (t, adc uint16 (kolom x n)). Baris dengan sel
+    ADC kosong dibuang, nilai di luar rentang di-clip (as_adc).
+    """
+    if any(df[c].dtype != np.uint16 for c in columns):
+        df = df.dropna(subset=list(columns))
+    return df["Timestamp"].to_numpy(float), as_adc(np.vstack([df[c].to_numpy() for c in columns]))
+
+def baca_csv(filename, gain, vref):
+    """CSV logger (Timestamp, ADC_KIRI, ADC_KANAN) -> RekamanEEG tanpa kolom int64 sementara."""
+    try:
+        df = pd.read_csv(filename, dtype={c: np.uint16 for c in ADC_COLUMNS})
+    except (ValueError, OverflowError):
+        # Nilai di luar rentang / kosong: baca biasa lalu clip
+        df = pd.read_csv(filename)
+    return RekamanEEG(*adc_dari_frame(df), gain, vref)
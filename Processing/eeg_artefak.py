@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from eeg_kriteria import hitung_kriteria, statistik_band
+
+# ================== KONFIGURASI ==================
+ADC_MIN = 0
+ADC_MAX = 4095
+FLAT_DURATION = 0.1     # detik nilai ADC identik berturut-turut = flat-line
+AMPLITUDE_UV = 200.0    # |µV - median| di atas ini = ekskursi amplitudo
+STEP_UV = 100.0         # |lompatan| antar sampel di atas ini = electrode pop
+MARGIN = 0.25           # detik, perluasan mask di kiri-kanan artefak
+
+# ================== MASK HELPERS ==================
+def _dilate(mask, margin):
+    # Perluas setiap sampel True sejauh margin sampel (O(n), via cumsum)
+    if margin <= 0 or not mask.any():
+        return mask
+    c = np.concatenate(([0], np.cumsum(mask, dtype=np.int64)))
+    idx = np.arange(len(mask))
+    lo = np.clip(idx - margin, 0, len(mask))
+    hi = np.clip(idx + margin + 1, 0, len(mask))
+    return (c[hi] - c[lo]) > 0
+
+def _runs(eq, min_len):
+    # Tandai run True (pada eq) yang panjangnya >= min_len
+    edges = np.diff(np.concatenate(([0], eq.view(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    keep = (ends - starts) >= min_len
+    marks = np.zeros(len(eq) + 1, dtype=np.int64)
+    np.add.at(marks, starts[keep], 1)
+    np.add.at(marks, ends[keep], -1)
+    return np.cumsum(marks[:-1]) > 0
+
+# ================== DETEKSI ARTEFAK ==================
+def deteksi_artefak(adc, eeg_uv, fs,
+                    flat_duration=FLAT_DURATION, amplitude_uv=AMPLITUDE_UV,
+                    step_uv=STEP_UV, margin=MARGIN):
+    """
+    adc     : array ADC mentah (0..4095)
+    eeg_uv  : array µV (setelah konversi, boleh sudah di-notch)
+    fs      : sampling rate (Hz)
+
+    Return dict mask boolean per jenis artefak ('saturasi', 'flat',
+    'amplitudo', 'lompatan'), gabungan yang sudah diperluas margin
+    ('artefak'), kebalikannya ('bersih') dan 'rasio_artefak' (0..1).
+    """
+    adc = np.asarray(adc)
+    eeg_uv = np.asarray(eeg_uv, dtype=float)
+    n = len(adc)
+
+    saturasi = (adc <= ADC_MIN) | (adc >= ADC_MAX)
+
+    flat = np.zeros(n, dtype=bool)
+    flat_n = max(2, int(round(flat_duration * fs)))
+    if n > 1:
+        same = np.diff(adc) == 0
+        run = _runs(same, flat_n - 1)
+        flat[:-1] |= run
+        flat[1:] |= run
+
+    amplitudo = np.abs(eeg_uv - np.median(eeg_uv)) > amplitude_uv
+
+    lompatan = np.zeros(n, dtype=bool)
+    if n > 1:
+        jump = np.abs(np.diff(eeg_uv)) > step_uv
+        lompatan[:-1] |= jump
+        lompatan[1:] |= jump
+
+    artefak = _dilate(saturasi | flat | amplitudo | lompatan, int(round(margin * fs)))
+
+    return {
+        'saturasi': saturasi,
+        'flat': flat,
+        'amplitudo': amplitudo,
+        'lompatan': lompatan,
+        'artefak': artefak,
+        'bersih': ~artefak,
+        'rasio_artefak': float(np.count_nonzero(artefak)) / n if n else 0.0,
+    }
+
+# ================== STATISTIK BERSIH ==================
+def statistik_bersih(band_signals, mask):
+    """
+    band_signals : array (5, n) delta..gamma atau dict hasil bandpass
+    mask         : boolean (n,), True = sampel bersih
+
+    Band power, variabilitas delta dan korelasi delta-gamma hanya dari
+    sampel bersih (lihat eeg_kriteria.statistik_band).
+    """
+    return statistik_band(band_signals, mask)
+
+def kriteria_bersih(band_signals, mask):
+    """Seperti hitung_kriteria, tetapi dari sinyal band + mask sampel bersih."""
+    return hitung_kriteria(*statistik_band(band_signals, mask))
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Analisis bertahap (out-of-core) untuk rekaman yang lebih besar dari RAM.
+
+CSV dibaca per blok; setiap blok diberi konteks kiri/kanan (padding) dari
+blok tetangga sebelum filter zero-phase, lalu hanya bagian inti blok yang
+masuk ke akumulator. Memori konstan: beberapa blok + jumlahan statistik.
+
+Timestamp host yang tidak seragam diinterpolasi per blok ke satu grid
+global t0 + k / fs (fs = jumlah sampel / durasi seluruh rekaman, dari
+lintasan ringan kolom Timestamp), sama seperti resample_uniform di jalur
+memori penuh.
+
+Toleransi terhadap run_eeg_pipeline (seluruh file di memori): nilai
+kriteria dalam ~1% relatif (atau 0.01 absolut untuk nilai dekat nol) untuk
+rekaman >= beberapa menit, dengan timestamp seragam maupun tidak. Sumber
+selisih: transien filter di sambungan blok (diredam oleh padding) dan
+median amplitudo artefak yang dihitung per blok, bukan global.
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from eeg_arsip import ADC_COLUMNS, adc_dari_frame
+from eeg_artefak import deteksi_artefak
+from eeg_bootstrap import jumlah_segmen
+from eeg_dsp import (DEFAULT_FS, JITTER_TOLERANCE, _interp_channels, _merge_duplicates, detect_mains, filter_bands,
+                     is_irregular, lut_to_uv, mains_filter)
+from eeg_kriteria import DELTA, GAMMA, hitung_kriteria
+
+# ================== KONFIGURASI ==================
+CHUNK_SECONDS = 60
+PAD_SECONDS = 10
+SCAN_ROWS = 1_000_000     # baris per blok saat memindai kolom Timestamp
+
+# ================== AKUMULATOR ==================
+class AkumulatorBand:
+    """Jumlahan berbobot mask untuk band power, variabilitas delta & korelasi delta-gamma."""
+
+    def __init__(self, n_bands=5):
+        self.s0 = 0.0
+        self.s1 = np.zeros(n_bands)
+        self.s2 = np.zeros(n_bands)
+        self.s_abs = 0.0
+        self.s_dg = 0.0
+
+    def tambah(self, bands, mask):
+        """bands: list 5 sinyal (inti blok), mask: boolean sampel bersih."""
+        m = np.asarray(mask, dtype=float)
+        self.s0 += m.sum()
+        for i, x in enumerate(bands):
+            self.s1[i] += x @ m
+            self.s2[i] += np.einsum('n,n,n->', x, x, m)
+        d, g = bands[DELTA], bands[GAMMA]
+        self.s_abs += np.abs(d) @ m
+        self.s_dg += np.einsum('n,n,n->', d, g, m)
+
+    def statistik(self):
+        """Sama dengan eeg_kriteria.statistik_band untuk seluruh data."""
+        if self.s0 < 2:
+            raise ValueError("Sampel bersih terlalu sedikit untuk dianalisis")
+        power = self.s2 / self.s0
+        mean = self.s1 / self.s0
+        d_std = np.sqrt(max(power[DELTA] - mean[DELTA]**2, 0.0))
+        g_std = np.sqrt(max(power[GAMMA] - mean[GAMMA]**2, 0.0))
+        delta_variability = d_std / (self.s_abs / self.s0 + 1e-10)
+        cov = self.s_dg / self.s0 - mean[DELTA] * mean[GAMMA]
+        correlation = cov / (d_std * g_std) if d_std > 0 and g_std > 0 else 0.0
+        return power, delta_variability, correlation
+
+# ================== PEMBACA BLOK ==================
+def _baca_blok(filename, rows, columns):
+    # float32 (bukan uint16): sel kosong (NaN) / di luar rentang tidak menggagalkan
+    # pembacaan; per blok dibuang / di-clip seperti baca_csv (adc_dari_frame)
+    reader = pd.read_csv(
+        filename, chunksize=rows,
+        usecols=["Timestamp"] + list(columns),
+        dtype={c: np.float32 for c in columns}
+    )
+    for df in reader:
+        t, adc = adc_dari_frame(df, columns)
+        if len(t):
+            yield t, adc
+
+def _pindai_waktu(filename, tol=JITTER_TOLERANCE):
+    """
+    Lintasan ringan (kolom Timestamp saja): (jumlah sampel, t awal, t akhir,
+    tidak seragam?). Keseragaman dicek per blok (termasuk sambungan blok),
+    sehingga memori tetap konstan.
+    """
+    n, t_first, last, irregular = 0, None, None, False
+    for df in pd.read_csv(filename, chunksize=SCAN_ROWS, usecols=["Timestamp"]):
+        t = df["Timestamp"].to_numpy(float)
+        if t_first is None:
+            t_first = t[0]
+        irregular = irregular or is_irregular(t if last is None else np.concatenate([[last], t]), tol)
+        n += len(t)
+        last = t[-1]
+    if t_first is None:
+        raise ValueError("File EEG kosong")
+    return n, t_first, last, irregular
+
+def _blok_seragam(blocks, t0, fs):
+    """
+    Blok (t, adc) bertimestamp tidak seragam -> blok pada grid global
+    t0 + k / fs, interpolasi linier & pembulatan ke LSB seperti
+    resample_uniform. Sampel terakhir blok sebelumnya dibawa sebagai titik
+    interpolasi pertama blok berikutnya; sampel yang mundur melewati
+    sambungan blok dibuang (di dalam blok diurutkan / dirata-rata).
+    """
+    carry_t = carry_x = None
+    k = 0
+    for t, adc in blocks:
+        if carry_t is not None:
+            keep = t > carry_t[-1]
+            t = np.concatenate([carry_t, t[keep]])
+            adc = np.concatenate([carry_x, adc[:, keep]], axis=1)
+        ts, xs = _merge_duplicates(t, adc)
+        k_end = int(np.floor((ts[-1] - t0) * fs)) + 1     # titik grid <= sampel terakhir blok
+        if len(ts) >= 2 and k_end > k:
+            grid = t0 + np.arange(k, k_end) / fs
+            data = np.rint(_interp_channels(ts, xs, grid))
+            yield grid, np.clip(data, 0, np.iinfo(np.uint16).max).astype(np.uint16)
+            k = k_end
+        carry_t, carry_x = ts[-1:], xs[:, -1:]
+
+# ================== ANALISIS BERTAHAP ==================
+def analisis_bertahap(filename, gain, vref, fs=None, columns=ADC_COLUMNS[:1],
+                      chunk_seconds=CHUNK_SECONDS, pad_seconds=PAD_SECONDS, mains_hz=None,
+                      dtype=np.float64, multirate=False):
+    """
+    filename      : CSV logger (Timestamp, ADC_KIRI, ADC_KANAN)
+    gain, vref    : kalibrasi headset
+    fs            : grid resampling (Hz), None = jumlah sampel / durasi rekaman.
+                    Di bawah fs rekaman ditolak (ValueError): desimasi butuh
+                    anti-alias lintas blok (resample_uniform), belum didukung
+    columns       : kolom ADC yang dianalisis (default hanya kiri)
+    chunk_seconds : panjang inti blok (detik)
+    pad_seconds   : konteks kiri/kanan untuk filter zero-phase (detik)
+    mains_hz      : 50 / 60, None = deteksi dari blok pertama (setelah resampling)
+    dtype         : dtype konversi µV & filter per blok (akumulasi tetap float64)
+    multirate     : filter bank multirate (eeg_dsp.filter_bands), kembali ke fs
+
+    Return dict berisi 'statistik' per kolom (band_power, variability,
+    correlation) yang bisa langsung ke deteksi_dari_statistik, plus
+    'values'/'passed' (kolom x 7), 'rasio_artefak', 'fs', durasi, dan
+    'segmen' (jumlahan per segmen per kolom, untuk eeg_bootstrap).
+    """
+    acc = [AkumulatorBand() for _ in columns]
+    segmen = [[] for _ in columns]
+    rejected = np.zeros(len(columns))
+    n_total = 0
+    t_start = t_end = None
+    left = prev = None
+
+    def proses(core, right):
+        ctx = np.concatenate([left, core, right], axis=1)
+        uv = mains_filter(lut_to_uv(ctx, gain, vref, dtype), fs, mains_hz)
+        inti = slice(left.shape[1], left.shape[1] + core.shape[1])
+        for c in range(len(columns)):
+            artefak = deteksi_artefak(ctx[c], uv[c], fs)
+            bands = filter_bands(uv[c], fs, multirate=multirate)
+            clean = artefak['bersih'][inti]
+            inti_bands = [b[inti] for b in bands.values()]
+            acc[c].tambah(inti_bands, clean)
+            segmen[c].append(jumlah_segmen(inti_bands, clean, fs))
+            rejected[c] += np.count_nonzero(~clean)
+
+    n_raw, t_first, t_last, irregular = _pindai_waktu(filename)
+    fs_rekaman = n_raw / (t_last - t_first) if t_last > t_first else DEFAULT_FS
+    if fs is None or np.isclose(fs, fs_rekaman, rtol=1e-6):
+        fs = fs_rekaman
+    elif fs < fs_rekaman:
+        raise ValueError(f"Analisis bertahap tidak mendukung resampling ke {fs:g} Hz "
+                         f"(di bawah fs rekaman {fs_rekaman:.2f} Hz)")
+    rows = max(1, int(chunk_seconds * fs))
+    pad = int(pad_seconds * fs)
+
+    blocks = _baca_blok(filename, rows, columns)
+    if irregular or fs != fs_rekaman:
+        blocks = _blok_seragam(blocks, t_first, fs)
+    first = next(blocks, None)
+    if first is None:
+        raise ValueError("File EEG kosong")
+    if mains_hz is None:
+        # Frekuensi jala-jala dari blok pertama yang sudah di grid seragam (FFT butuh fs pasti)
+        mains_hz = detect_mains(first[1], fs)
+    for t, adc in itertools.chain([first], blocks):
+        if t_start is None:
+            t_start = t[0]
+            left = adc[:, :0]
+        t_end = t[-1]
+        n_total += adc.shape[1]
+        if prev is not None:
+            proses(prev, adc[:, :pad])
+            left = np.concatenate([left, prev], axis=1)[:, -pad:] if pad else prev[:, :0]
+        prev = adc
+    if prev is None:
+        raise ValueError("File EEG kosong")
+    proses(prev, prev[:, :0])
+
+    statistik = [a.statistik() for a in acc]
+    values, passed = hitung_kriteria(*(np.stack(s) for s in zip(*statistik)))
+    return {
+        'columns': list(columns),
+        'fs': fs,
+        'mains_hz': mains_hz,
+        'n_samples': n_total,
+        't_start': t_start,
+        't_end': t_end,
+        'statistik': statistik,
+        'values': values,
+        'passed': passed,
+        'kriteria_terpenuhi': passed.sum(axis=-1),
+        'rasio_artefak': rejected / max(n_total, 1),
+        'segmen': [np.vstack(s) for s in segmen],
+    }
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    t0 = time.perf_counter()
+    hasil = analisis_bertahap(sys.argv[1], gain=1000.0, vref=1.65, columns=ADC_COLUMNS)
+    dt = time.perf_counter() - t0
+    print(f"{hasil['n_samples']:,} sampel @ {hasil['fs']:.1f} Hz dalam {dt:.1f} detik")
+    for col, k, r in zip(hasil['columns'], hasil['kriteria_terpenuhi'], hasil['rasio_artefak']):
+        print(f"{col}: {k}/7 kriteria, artefak {r * 100:.1f}%")
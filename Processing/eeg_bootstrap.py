@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Block bootstrap ketidakpastian nilai kriteria dan tingkat diagnosis.
+
+Sinyal band diringkas menjadi jumlahan per segmen (sama seperti
+eeg_bertahap.AkumulatorBand: s0, s1, s2, |delta|, delta*gamma) sehingga
+statistik band sebuah replikat cukup dihitung dari jumlah segmen yang
+terpilih. Replikat dibangkitkan per batch dengan array indeks blok, tanpa
+loop Python per replikat, sampai jumlah replikat atau batas waktu tercapai.
+"""
+
+import time
+import numpy as np
+
+from eeg_kriteria import DELTA, GAMMA, aturan_aktif
+
+# ================== KONFIGURASI ==================
+SEGMENT_SECONDS = 2.0   # panjang segmen ringkasan (detik)
+N_BOOT = 2000           # jumlah replikat maksimum
+BOOT_BUDGET = 0.5       # detik; di Pi jumlah replikat dipotong agar UI tidak menunggu
+BOOT_BATCH = 500        # replikat per langkah vektor (cek batas waktu per batch)
+N_JUMLAH = 13           # kolom jumlahan: s0, s1 (5 band), s2 (5 band), s_abs, s_dg
+
+# ================== JUMLAHAN PER SEGMEN ==================
+def jumlah_segmen(band_signals, mask=None, fs=256, segment_sec=SEGMENT_SECONDS):
+    """
+    band_signals : dict / list 5 sinyal band (delta..gamma), panjang n
+    mask         : boolean (n,) sampel bersih, None = semua
+
+    Return array (segmen, N_JUMLAH) float64. Sisa di ujung menjadi segmen
+    terakhir yang lebih pendek, sehingga jumlah semua segmen = jumlahan
+    seluruh rekaman (statistik_dari_jumlah(sums.sum(0)) = statistik_band).
+    """
+    bands = list(band_signals.values()) if isinstance(band_signals, dict) else list(band_signals)
+    n = len(bands[0])
+    m = np.ones(n) if mask is None else np.asarray(mask, dtype=float)[:n]
+    seg = max(2, int(round(segment_sec * fs)))
+    starts = np.arange(0, n, seg)
+
+    out = np.empty((len(starts), N_JUMLAH))
+    out[:, 0] = np.add.reduceat(m, starts)
+    for i, x in enumerate(bands):
+        xm = np.multiply(x, m)
+        out[:, 1 + i] = np.add.reduceat(xm, starts)
+        out[:, 6 + i] = np.add.reduceat(xm * x, starts)
+    d, g = bands[DELTA], bands[GAMMA]
+    out[:, 11] = np.add.reduceat(np.abs(d) * m, starts)
+    out[:, 12] = np.add.reduceat(np.multiply(d, g) * m, starts)
+    return out
+
+def statistik_dari_jumlah(sums):
+    """Jumlahan (..., N_JUMLAH) -> (band_power (..., 5), delta_variability (...), correlation (...))."""
+    sums = np.asarray(sums, dtype=float)
+    s0 = np.maximum(sums[..., 0], 1e-12)[..., None]
+    mean = sums[..., 1:6] / s0
+    power = sums[..., 6:11] / s0
+    d_std = np.sqrt(np.maximum(power[..., DELTA] - mean[..., DELTA]**2, 0))
+    g_std = np.sqrt(np.maximum(power[..., GAMMA] - mean[..., GAMMA]**2, 0))
+    delta_variability = d_std / (sums[..., 11] / s0[..., 0] + 1e-10)
+    cov = sums[..., 12] / s0[..., 0] - mean[..., DELTA] * mean[..., GAMMA]
+    denom = d_std * g_std
+    correlation = np.where(denom > 0, cov / np.where(denom > 0, denom, 1), 0.0)
+    return power, delta_variability, correlation
+
+# ================== BOOTSTRAP ==================
+def bootstrap_kriteria(sums, n_boot=N_BOOT, block=None, budget=BOOT_BUDGET, batch=BOOT_BATCH,
+                       level=0.95, seed=0, aturan=None):
+    """
+    sums  : (segmen, N_JUMLAH) dari jumlah_segmen
+    block : panjang blok (segmen) moving-block bootstrap, None = ~segmen^(1/3)
+            (menjaga autokorelasi EEG antar segmen yang berdekatan)
+
+    Jumlahan setiap blok dihitung sekali lewat cumsum; satu batch replikat
+    = gather indeks blok (batch, blok per replikat) + satu panggilan
+    aturan.skor. Return dict atau None jika segmen < 2:
+      n_boot, block, n_segmen, level, detik
+      ci_values (K, 2)          interval nilai tiap kriteria
+      p_passed (K,)             peluang tiap kriteria terpenuhi
+      p_tingkat (tingkat,)      peluang tiap tingkat diagnosis
+      ci_relative_power (5, 2)  interval daya relatif (%) delta..gamma
+      ci_confidence_score (2,)
+    """
+    aturan = aturan or aturan_aktif()
+    sums = np.asarray(sums, dtype=float)
+    n_seg = len(sums)
+    if n_seg < 2:
+        return None
+    block = min(n_seg, block or max(1, int(round(n_seg ** (1 / 3)))))
+    per_rep = -(-n_seg // block)
+    csum = np.concatenate([np.zeros((1, sums.shape[1])), np.cumsum(sums, axis=0)])
+    block_sums = csum[block:] - csum[:-block]                          # (segmen - block + 1, N_JUMLAH)
+
+    rng = np.random.default_rng(seed)
+    t0 = time.perf_counter()
+    skor, done = [], 0
+    while done < n_boot:
+        b = min(batch, n_boot - done)
+        idx = rng.integers(0, len(block_sums), (b, per_rep))
+        skor.append(aturan.skor(*statistik_dari_jumlah(block_sums[idx].sum(axis=1))))
+        done += b
+        if budget is not None and time.perf_counter() - t0 > budget:
+            break
+    skor = np.concatenate(skor)
+
+    q = [(1 - level) / 2, (1 + level) / 2]
+    return {
+        'n_boot': done,
+        'block': block,
+        'n_segmen': n_seg,
+        'level': level,
+        'detik': time.perf_counter() - t0,
+        'ci_values': np.quantile(skor['values'], q, axis=0).T,
+        'p_passed': skor['passed'].mean(axis=0),
+        'p_tingkat': np.bincount(skor['tingkat'], minlength=len(aturan.tingkat_names)) / done,
+        'ci_relative_power': np.quantile(skor['relative_power'], q, axis=0).T,
+        'ci_confidence_score': np.quantile(skor['confidence_score'], q),
+    }
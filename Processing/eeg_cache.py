@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache hasil analisis di disk, dialamati konten: kunci = hash isi rekaman +
+versi pipeline + konfigurasi analisis. File yang sama (walau di-rename /
+disalin) tidak dianalisis ulang; perubahan kode algoritma otomatis
+membuat kunci baru sehingga entri lama tidak pernah terpakai.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from functools import lru_cache
+from importlib import metadata
+
+# ================== KONFIGURASI ==================
+CACHE_DIR = os.environ.get(
+    "EEG_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "disleksia-eeg"))
+CACHE_MAX_BYTES = 256 * 1024 * 1024  # di atas ini entri paling lama tidak dipakai dihapus (LRU)
+
+# Modul yang menentukan hasil analisis. Threshold & tingkat (aturan_kriteria.json)
+# sengaja tidak termasuk: cache menyimpan statistik & fitur, bukan keputusan.
+MODUL_PIPELINE = ("eeg_arsip", "eeg_dsp", "eeg_artefak", "eeg_alur", "eeg_bertahap", "eeg_bootstrap", "eeg_epoch",
+                  "eeg_kriteria", "eeg_proses")
+PAKET_PIPELINE = ("numpy", "scipy", "pandas")
+
+# ================== KUNCI ==================
+HASH_CHUNK = 1 << 20     # byte per baca saat meng-hash rekaman
+_hash_memo = {}     # (path, ukuran, mtime_ns) -> hash isi, agar file besar tidak di-hash ulang
+
+def hash_file(filename):
+    """Hash BLAKE2b isi file (hex), di-memo per (path, ukuran, mtime)."""
+    st = os.stat(filename)
+    memo = (os.path.realpath(filename), st.st_size, st.st_mtime_ns)
+    if memo not in _hash_memo:
+        # Dibaca per blok (bukan hashlib.file_digest, baru ada di Python 3.11)
+        h = hashlib.blake2b()
+        with open(filename, 'rb') as f:
+            for blok in iter(lambda: f.read(HASH_CHUNK), b''):
+                h.update(blok)
+        _hash_memo[memo] = h.hexdigest()
+    return _hash_memo[memo]
+
+@lru_cache(maxsize=None)
+def versi_pipeline():
+    """Hash sumber MODUL_PIPELINE + versi pustaka numerik."""
+    h = hashlib.blake2b(digest_size=16)
+    folder = os.path.dirname(os.path.abspath(__file__))
+    for name in MODUL_PIPELINE:
+        with open(os.path.join(folder, name + ".py"), 'rb') as f:
+            h.update(f.read())
+    for pkg in PAKET_PIPELINE:
+        try:
+            h.update(metadata.version(pkg).encode())
+        except metadata.PackageNotFoundError:
+            pass
+    return h.hexdigest()
+
+# ================== CACHE DISK ==================
+class CacheHasil:
+    """
+    Satu file pickle per kunci di folder cache. Setiap get() yang berhasil
+    memperbarui mtime entri; put() lalu membuang entri dengan mtime tertua
+    sampai total ukuran <= max_bytes (LRU). Tulis atomik (file sementara +
+    os.replace) sehingga proses lain tidak pernah membaca entri setengah jadi.
+    """
+
+    def __init__(self, folder=CACHE_DIR, max_bytes=CACHE_MAX_BYTES, versi=None):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.versi = versi or versi_pipeline()
+
+    def kunci(self, filename, *extra, **config):
+        """
+        Kunci entri untuk rekaman (+ file pendamping extra, mis. marker) dan
+        konfigurasi analisis (argumen ringkasan_file).
+        """
+        h = hashlib.blake2b(digest_size=20)
+        for path in (filename, *extra):
+            h.update(hash_file(path).encode())
+        h.update(self.versi.encode())
+        h.update(json.dumps(config, sort_keys=True, default=str).encode())
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.folder, key + ".pkl")
+
+    def get(self, key, default=None):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return default
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # Entri rusak / dari versi kelas lama -> buang
+            self._hapus(path)
+            return default
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key, value):
+        os.makedirs(self.folder, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.folder, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            self._hapus(tmp)
+            raise
+        self.evict()
+
+    def __contains__(self, key):
+        return os.path.exists(self._path(key))
+
+    def entries(self):
+        """[(mtime, ukuran, path)] semua entri, tertua dulu."""
+        try:
+            names = os.listdir(self.folder)
+        except FileNotFoundError:
+            return []
+        out = []
+        for name in names:
+            if name.endswith(".pkl"):
+                path = os.path.join(self.folder, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                out.append((st.st_mtime_ns, st.st_size, path))
+        return sorted(out)
+
+    def evict(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._hapus(path)
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            self._hapus(path)
+
+    @staticmethod
+    def _hapus(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
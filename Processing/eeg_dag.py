@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# ================== TAHAP ==================
+class Stage:
+    """Satu node DAG: func(*inputs) -> nilai (atau tuple jika outputs > 1)."""
+
+    def __init__(self, name, func, inputs=(), outputs=None, cache=True):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs) if outputs else (name,)
+        self.cache = cache
+
+# ================== EXECUTOR ==================
+class PipelineDAG:
+    """
+    Pipeline sebagai DAG tahap bernama dengan input/output yang dideklarasikan.
+
+    run(*targets) hanya menjalankan tahap yang dibutuhkan target dan belum
+    ada di cache; tahap yang saling independen (notch per kanal, filter per
+    band, ...) berjalan paralel di thread pool. SciPy melepas GIL saat
+    memfilter, sehingga beberapa core benar-benar terpakai.
+
+    Tahap dengan cache=False (sinyal band besar) dibuang segera setelah
+    semua tahap yang memakainya selesai, dan dihitung ulang jika diminta lagi.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.timing = {}        # nama tahap -> detik (pemanggilan terakhir)
+        self._stages = {}
+        self._producer = {}     # nama output -> nama tahap
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def set(self, name, value):
+        """Nilai input awal (atau override hasil tahap)."""
+        self._cache[name] = value
+        return self
+
+    def add(self, name, func, inputs=(), outputs=None, cache=True):
+        stage = Stage(name, func, inputs, outputs, cache)
+        if name in self._stages:
+            raise ValueError(f"Tahap '{name}' sudah ada")
+        for out in stage.outputs:
+            if out in self._producer:
+                raise ValueError(f"Output '{out}' sudah dihasilkan tahap '{self._producer[out]}'")
+            self._producer[out] = name
+        self._stages[name] = stage
+        return self
+
+    def is_cached(self, name):
+        return name in self._cache
+
+    def __contains__(self, name):
+        return name in self._cache or name in self._producer
+
+    def __getitem__(self, name):
+        return self.run(name)[name]
+
+    def _plan(self, targets):
+        # Tahap yang dibutuhkan target (urutan bebas), dengan deteksi siklus
+        needed, visiting = set(), set()
+
+        def visit(name):
+            if name in self._cache:
+                return
+            stage = self._producer.get(name)
+            if stage is None:
+                raise KeyError(f"Tidak ada tahap yang menghasilkan '{name}'")
+            if stage in needed:
+                return
+            if stage in visiting:
+                raise ValueError(f"Siklus pada tahap '{stage}'")
+            visiting.add(stage)
+            for inp in self._stages[stage].inputs:
+                visit(inp)
+            visiting.discard(stage)
+            needed.add(stage)
+
+        for target in targets:
+            visit(target)
+        return needed
+
+    def _call(self, stage, args):
+        t0 = time.perf_counter()
+        value = stage.func(*args)
+        self.timing[stage.name] = time.perf_counter() - t0
+        return value
+
+    def run(self, *targets):
+        """Jalankan tahap yang dibutuhkan, return dict target -> nilai."""
+        with self._lock:
+            needed = self._plan(targets)
+            values = {}
+            waiting = {}                        # tahap -> tahap input yang belum selesai
+            dependents = {s: [] for s in needed}
+            consumers = {}                      # output non-cache -> sisa pemakai
+            for s in needed:
+                waiting[s] = set()
+                for inp in self._stages[s].inputs:
+                    producer = self._producer.get(inp)
+                    if inp not in self._cache and producer in needed:
+                        waiting[s].add(producer)
+                        consumers[inp] = consumers.get(inp, 0) + 1
+                for producer in waiting[s]:
+                    dependents[producer].append(s)
+
+            def lookup(name):
+                return values[name] if name in values else self._cache[name]
+
+            with ThreadPoolExecutor(self.max_workers) as pool:
+                running = {}
+
+                def submit(s):
+                    stage = self._stages[s]
+                    args = [lookup(inp) for inp in stage.inputs]
+                    running[pool.submit(self._call, stage, args)] = s
+
+                for s in needed:
+                    if not waiting[s]:
+                        submit(s)
+                while running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        s = running.pop(fut)
+                        stage = self._stages[s]
+                        try:
+                            result = fut.result()
+                        except Exception:
+                            for other in running:
+                                other.cancel()
+                            raise
+                        outs = result if len(stage.outputs) > 1 else (result,)
+                        for out, value in zip(stage.outputs, outs):
+                            values[out] = value
+                            if stage.cache:
+                                self._cache[out] = value
+                        for d in dependents[s]:
+                            waiting[d].discard(s)
+                            if not waiting[d]:
+                                submit(d)
+                        # Input non-cache yang tidak dipakai lagi dilepas dari memori
+                        for inp in stage.inputs:
+                            if inp in consumers:
+                                consumers[inp] -= 1
+                                if consumers[inp] == 0 and inp not in targets:
+                                    values.pop(inp, None)
+
+            return {target: lookup(target) for target in targets}
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import functools
+import math
+import numpy as np
+from scipy.signal import butter, filtfilt, iirnotch, resample_poly, sosfiltfilt, tf2sos
+
+from eeg_kriteria import BANDS
+
+# ================== KONFIGURASI ==================
+DEFAULT_FS = 256
+ADC_BITS = 12
+JITTER_TOLERANCE = 0.05     # std(dt) / median(dt) di atas ini = tidak seragam
+MULTIRATE_MARGIN = 2.5      # fs band minimal = margin x frekuensi atas band
+MAINS_CANDIDATES = (50, 60) # frekuensi jala-jala yang dideteksi otomatis
+PLOT_POINTS = 4000          # titik per sinyal untuk grafik (envelope min/max)
+DESIGN_DIGITS = 3           # angka penting fs untuk kunci desain filter (lru_cache)
+
+# ================== KONVERSI & FILTER ==================
+def adc_to_uv(adc, gain, vref, dtype=np.float64):
+    """
+    adc   : array ADC 12-bit (boleh 2D, kanal x sampel)
+    gain  : gain penguat
+    vref  : tegangan referensi (V)
+    dtype : np.float64 atau np.float32 (mode hemat memori)
+
+    Satu salinan ke dtype tujuan lalu operasi in-place, tanpa array
+    sementara untuk setiap langkah rumus.
+    """
+    uv = np.array(adc, dtype=dtype)
+    uv *= 3.3 / 4095.0
+    uv -= vref
+    uv *= 1e6 / gain
+    return uv
+
+@functools.lru_cache(maxsize=16)
+def adc_lut(gain, vref, dtype=np.float64):
+    """Tabel 4096 entri ADC -> µV per kalibrasi headset (gain, vref), di-cache."""
+    lut = adc_to_uv(np.arange(2**ADC_BITS), gain, vref, dtype)
+    lut.flags.writeable = False
+    return lut
+
+def lut_to_uv(adc, gain, vref, dtype=np.float64):
+    """
+    adc : array uint16 (berapa pun dimensinya)
+
+    Konversi ke µV dengan satu gather dari adc_lut, tanpa aritmetika per
+    sampel. Ganti kalibrasi = ganti tabel.
+    """
+    return np.take(adc_lut(float(gain), float(vref), np.dtype(dtype).type), adc)
+
+def notch_filter(data, freq, fs, Q=30):
+    if len(data) < 12: return data
+    try:
+        nyq = 0.5 * fs
+        b, a = iirnotch(freq / nyq, Q)
+        if data.dtype == np.float32:
+            # float32: bentuk SOS agar stabil di presisi tunggal
+            return sosfiltfilt(tf2sos(b, a).astype(np.float32), data)
+        return filtfilt(b, a, data)
+    except: return data
+
+def design_fs(fs):
+    """
+    fs dibulatkan ke DESIGN_DIGITS angka penting untuk desain filter: fs
+    estimasi tiap rekaman (mis. 255.93) memakai desain yang sama dengan
+    pemanasan (256); geser cutoff paling banyak ~0.2%.
+    """
+    return float(f"{fs:.{DESIGN_DIGITS}g}")
+
+@functools.lru_cache(maxsize=64)
+def band_design(order, low, high, output='ba'):
+    """Desain Butterworth bandpass (frekuensi ternormalisasi), di-cache & read-only."""
+    coefs = butter(order, [low, high], btype='band', output=output)
+    for c in (coefs if output == 'ba' else [coefs]):
+        c.flags.writeable = False
+    return coefs
+
+def bandpass(data, lowcut, highcut, fs, order=4):
+    if len(data) < max(12, order * 6): return data
+    try:
+        nyq = 0.5 * design_fs(fs)
+        low, high = lowcut / nyq, highcut / nyq
+        if low <= 0 or high >= 1: return data
+        if data.dtype == np.float32:
+            sos = band_design(order, low, high, 'sos')
+            return sosfiltfilt(sos.astype(np.float32), data)
+        b, a = band_design(order, low, high)
+        return filtfilt(b, a, data)
+    except: return data
+
+# ================== MAINS (50/60 Hz + HARMONIK) ==================
+def detect_mains(data, fs, seconds=2.0, candidates=MAINS_CANDIDATES):
+    """
+    Tebak frekuensi jala-jala dari FFT pendek (beberapa detik awal, semua
+    kanal dijumlahkan): kandidat dengan puncak tertinggi relatif terhadap
+    lantai spektrum di sekitarnya.
+    """
+    x = np.atleast_2d(np.asarray(data, dtype=float))[:, :int(seconds * fs)]
+    n = x.shape[1]
+    usable = [f for f in candidates if f < fs / 2]
+    if n < 16 or not usable:
+        return candidates[0]
+    x = x - x.mean(axis=-1, keepdims=True)
+    spec = (np.abs(np.fft.rfft(x * np.hanning(n), axis=-1))**2).sum(axis=0)
+    freqs = np.fft.rfftfreq(n, 1.0 / fs)
+
+    best, best_ratio = candidates[0], 0.0
+    for f in usable:
+        dist = np.abs(freqs - f)
+        peak = spec[dist <= 1].max(initial=0.0)
+        floor = np.median(spec[(dist > 2) & (dist <= 6)]) if np.any((dist > 2) & (dist <= 6)) else 0.0
+        ratio = peak / (floor + 1e-20)
+        if ratio > best_ratio:
+            best, best_ratio = f, ratio
+    return best
+
+@functools.lru_cache(maxsize=16)
+def mains_sos(freq, fs, Q=30):
+    # Notch di fundamental + semua harmonik di bawah Nyquist, digabung jadi satu SOS (di-cache)
+    harmonics = np.arange(freq, 0.5 * fs * 0.98, freq)
+    sos = np.vstack([tf2sos(*iirnotch(h, Q, fs=fs)) for h in harmonics] or [np.empty((0, 6))])
+    sos.flags.writeable = False
+    return sos
+
+def mains_filter(data, fs, freq=None, Q=30):
+    """
+    data : array (n,) atau (kanal, n)
+    freq : 50 / 60 Hz, None = detect_mains
+
+    Buang jala-jala dan harmoniknya dalam satu pass sosfiltfilt untuk
+    semua kanal sekaligus. dtype data (float32/float64) dipertahankan.
+    """
+    data = np.asarray(data)
+    if freq is None:
+        freq = detect_mains(data, fs)
+    sos = mains_sos(freq, design_fs(fs), Q)
+    # sosfiltfilt butuh sampel > padlen (maks. 3 x (2 x seksi + 1)); rekaman sependek itu tidak difilter
+    if len(sos) == 0 or data.shape[-1] <= 3 * (2 * len(sos) + 1): return data
+    # Salinan writable: SOS di-cache read-only dan sosfiltfilt menolak buffer read-only
+    return sosfiltfilt(np.array(sos, dtype=data.dtype), data, axis=-1)
+
+def filter_bands(data, fs, bands=BANDS, multirate=False):
+    """
+    Bandpass satu kanal ke semua band di fs asli, return dict nama band ->
+    sinyal. multirate=True memakai filter_bands_multirate lalu kembali ke fs
+    asli (untuk grafik).
+    """
+    if multirate:
+        return filter_bands_multirate(data, fs, bands, output='full')[0]
+    return {name: bandpass(data, l, h, fs) for name, (l, h) in bands.items()}
+
+# ================== MULTIRATE FILTER BANK ==================
+def _decimation_levels(fs, bands, margin):
+    # Faktor desimasi (pangkat 2) terbesar per band yang masih menjaga band
+    levels = {}
+    for name, (l, h) in bands.items():
+        k = 0
+        while fs / 2**(k + 1) >= margin * h:
+            k += 1
+        levels[name] = k
+    return levels
+
+def filter_bands_multirate(data, fs, bands=BANDS, output='native', margin=MULTIRATE_MARGIN):
+    """
+    data   : sinyal 1 kanal (sudah di-notch)
+    fs     : sampling rate (Hz)
+    bands  : dict nama -> (low, high)
+    output : 'native' = tiap band di fs terendahnya sendiri,
+             'common' = semua band di fs band tertinggi (panjang sama,
+                        bisa langsung ke statistik_band / korelasi),
+             'full'   = semua band kembali ke fs asli, panjang = len(data)
+    margin : fs band minimal relatif terhadap frekuensi atas band
+
+    Sinyal didesimasi bertahap /2 (polyphase FIR, zero-phase) sekali saja,
+    lalu tiap band difilter di tingkat desimasi terdalam yang masih
+    menjaganya: delta/theta difilter di fs jauh lebih rendah, yang lebih
+    murah dan lebih stabil untuk IIR dengan cutoff ternormalisasi kecil.
+
+    Return (signals, rates): dict nama -> sinyal dan dict nama -> fs.
+    Untuk output 'common', mask sampel (fs asli) bisa diturunkan dengan
+    mask[::2**k] dan k = log2(fs / rate).
+    """
+    levels = _decimation_levels(fs, bands, margin)
+    stages = [np.asarray(data)]
+    for _ in range(max(levels.values(), default=0)):
+        stages.append(resample_poly(stages[-1], 1, 2))
+
+    signals, rates = {}, {}
+    for name, (l, h) in bands.items():
+        k = levels[name]
+        signals[name] = bandpass(stages[k], l, h, fs / 2**k)
+        rates[name] = fs / 2**k
+
+    if output == 'native':
+        return signals, rates
+    if output == 'common':
+        k_out = min(levels.values(), default=0)
+        n_out = len(stages[k_out])
+    elif output == 'full':
+        k_out, n_out = 0, len(stages[0])
+    else:
+        raise ValueError(f"output tidak dikenal: {output}")
+
+    for name in signals:
+        up = 2**(levels[name] - k_out)
+        if up > 1:
+            signals[name] = resample_poly(signals[name], up, 1)[:n_out]
+        rates[name] = fs / 2**k_out
+    return signals, rates
+
+def decimate_mask(mask, fs, fs_out):
+    """Turunkan mask sampel dari fs ke fs_out (faktor bulat, sama dengan [::2**k])."""
+    if mask is None:
+        return None
+    return mask[::max(1, int(round(fs / fs_out)))]
+
+def analysis_rate(fs, bands=BANDS, multirate=False, margin=MULTIRATE_MARGIN):
+    """fs sinyal band dari analysis_bands, tanpa perlu memfilter."""
+    if not multirate or not bands:
+        return fs
+    return fs / 2**min(_decimation_levels(fs, bands, margin).values())
+
+def analysis_bands(data, fs, mask=None, multirate=False):
+    """
+    Band untuk analisis (bukan grafik). Dengan multirate=True semua band
+    berada di fs bersama terendah (output 'common') dan mask ikut
+    diturunkan. Return (signals, mask, fs_bands).
+    """
+    if not multirate:
+        return filter_bands(data, fs), mask, fs
+    signals, rates = filter_bands_multirate(data, fs, output='common')
+    fs_bands = next(iter(rates.values()), fs)
+    return signals, decimate_mask(mask, fs, fs_bands), fs_bands
+
+# ================== RESAMPLING ==================
+def estimate_fs(t):
+    duration = t[-1] - t[0] if len(t) > 1 else 1
+    return len(t) / duration if duration > 0 else DEFAULT_FS
+
+def is_irregular(t, tol=JITTER_TOLERANCE):
+    dt = np.diff(t)
+    if len(dt) == 0:
+        return False
+    if np.any(dt <= 0):
+        return True
+    return np.std(dt) / np.median(dt) > tol
+
+def _merge_duplicates(t, x):
+    # Urutkan waktu, sampel dengan timestamp sama dirata-rata (semua kanal sekaligus)
+    order = np.argsort(t, kind='stable')
+    ts = t[order]
+    starts = np.flatnonzero(np.concatenate(([True], np.diff(ts) > 0)))
+    if len(starts) == len(ts):
+        return ts, x[:, order]
+    counts = np.diff(np.append(starts, len(ts)))
+    merged = np.add.reduceat(x[:, order], starts, axis=1, dtype=np.float64) / counts
+    return ts[starts], merged
+
+def _interp_channels(t, x, grid):
+    # Interpolasi linier semua kanal dengan satu set indeks & bobot
+    i1 = np.clip(np.searchsorted(t, grid, side='right'), 1, len(t) - 1)
+    i0 = i1 - 1
+    w = (grid - t[i0]) / (t[i1] - t[i0])
+    w = np.clip(w, 0.0, 1.0)
+    if np.issubdtype(x.dtype, np.floating):
+        w = w.astype(x.dtype, copy=False)
+    return x[:, i0] * (1.0 - w) + x[:, i1] * w
+
+def resample_uniform(t, channels, fs_target=None, tol=JITTER_TOLERANCE, dtype=np.float64):
+    """
+    t         : timestamp host (detik), boleh tidak seragam / duplikat
+    channels  : list array atau array (kanal, n)
+    fs_target : Hz grid output, None = fs estimasi (len / durasi)
+    tol       : batas jitter relatif sebelum dianggap tidak seragam
+    dtype     : dtype data keluaran; untuk dtype integer (mis. uint16 ADC)
+                hasil interpolasi dibulatkan ke LSB terdekat
+
+    Return (t_uniform, data (kanal, m), fs). Jika timestamp sudah seragam
+    dan fs_target None, data dikembalikan apa adanya. Untuk fs_target di
+    bawah fs asli, data diinterpolasi ke kelipatan bulat fs_target lalu
+    didesimasi polyphase (dengan anti-alias) sehingga fs keluaran tepat.
+    """
+    t = np.asarray(t, dtype=float)
+    x = np.atleast_2d(np.asarray(channels, dtype=dtype))
+    fs_est = estimate_fs(t)
+
+    if len(t) < 2:
+        return t, x, fs_est
+    if fs_target is None and not is_irregular(t, tol):
+        return t, x, fs_est
+
+    fs_out = float(fs_target) if fs_target else fs_est
+    factor = max(1, math.ceil(fs_est / fs_out - 1e-9))
+    fs_grid = fs_out * factor
+
+    ts, xs = _merge_duplicates(t, x)
+    if len(ts) < 2:
+        return t, x, fs_est
+    n_grid = int(np.floor((ts[-1] - ts[0]) * fs_grid)) + 1
+    grid = ts[0] + np.arange(n_grid) / fs_grid
+    data = _interp_channels(ts, xs, grid)
+
+    if factor > 1:
+        data = resample_poly(data, 1, factor, axis=1)
+    if np.issubdtype(dtype, np.integer):
+        info = np.iinfo(dtype)
+        data = np.clip(np.rint(data), info.min, info.max)
+    data = data.astype(dtype, copy=False)
+    t_out = ts[0] + np.arange(data.shape[1]) / fs_out
+    return t_out, data, fs_out
+
+# ================== GRAFIK ==================
+def minmax_decimate(t, x, max_points=PLOT_POINTS):
+    """
+    Kurangi sinyal (..., n) ke <= max_points titik untuk grafik: tiap blok
+    k sampel diwakili min lalu max-nya pada waktu awal blok, sehingga
+    puncak / artefak tetap terlihat seperti pada plot resolusi penuh.
+    Return (t_plot, x_plot).
+    """
+    t = np.asarray(t)
+    x = np.asarray(x)
+    n = x.shape[-1]
+    k = math.ceil(2 * n / max_points)
+    if k <= 1:
+        return t, x
+    pad = -n % k
+    if pad:
+        x = np.concatenate([x, np.repeat(x[..., -1:], pad, axis=-1)], axis=-1)
+    blocks = x.reshape(*x.shape[:-1], -1, k)
+    y = np.stack([blocks.min(axis=-1), blocks.max(axis=-1)], axis=-1).reshape(*x.shape[:-1], -1)
+    return np.repeat(t[::k], 2), y
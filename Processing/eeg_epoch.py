@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Marker timeline tes (awal soal, audio, akhir tes) dan epoching per soal.
+
+Marker ditulis logger ke file pendamping <rekaman>.marker.csv
+(Timestamp, Event, Soal) dengan jam yang sama seperti kolom Timestamp
+rekaman, sehingga format CSV sampel tidak berubah.
+"""
+
+import csv
+import os
+import threading
+import numpy as np
+from numpy.lib.stride_tricks import as_strided, sliding_window_view
+
+from eeg_kriteria import skor_batch, statistik_band
+
+# ================== MARKER ==================
+MARKER_SUFFIX = ".marker.csv"
+SOAL_MULAI = "soal_mulai"
+AUDIO_MULAI = "audio_mulai"
+AUDIO_SELESAI = "audio_selesai"
+TES_SELESAI = "tes_selesai"
+
+def marker_path(filename):
+    return os.path.splitext(filename)[0] + MARKER_SUFFIX
+
+class MarkerWriter:
+    """Penulis marker thread-safe (dipanggil dari thread Tk, logger di thread lain)."""
+
+    def __init__(self, path, clock):
+        self.path = path
+        self.clock = clock      # fungsi -> detik pada jam kolom Timestamp rekaman
+        self._lock = threading.Lock()
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(["Timestamp", "Event", "Soal"])
+
+    def tulis(self, event, soal=""):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._writer.writerow([f"{self.clock():.6f}", event, soal])
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+def baca_marker(filename):
+    """
+    Marker untuk rekaman (path CSV rekaman atau file marker) -> structured
+    array (t, event, soal) urut waktu, atau None jika tidak ada marker.
+    """
+    path = filename if filename.endswith(MARKER_SUFFIX) else marker_path(filename)
+    if not os.path.exists(path):
+        return None
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = [(float(r["Timestamp"]), r["Event"], int(r["Soal"]) if r["Soal"] else 0)
+                for r in csv.DictReader(f)]
+    markers = np.array(rows, dtype=[('t', 'f8'), ('event', 'U16'), ('soal', 'i4')])
+    return markers[np.argsort(markers['t'], kind='stable')]
+
+def jadwal_soal(markers):
+    """(nomor soal (Q,), onset (Q,) detik, akhir (Q,) detik) dari marker."""
+    soal = markers[markers['event'] == SOAL_MULAI]
+    onset = soal['t']
+    selesai = markers['t'][markers['event'] == TES_SELESAI]
+    akhir_tes = selesai[-1] if len(selesai) else np.inf
+    akhir = np.append(onset[1:], akhir_tes) if len(onset) else onset
+    return soal['soal'], onset, akhir
+
+# ================== EPOCHING ==================
+def epoch(x, starts, length):
+    """
+    x (..., n) -> epoch (Q, ..., length) mulai di indeks sampel starts.
+    Jika onset berjarak sama (kasus tes dengan durasi soal tetap) hasilnya
+    view as_strided tanpa salinan (read-only); onset tidak teratur
+    memakai sliding_window_view lalu satu gather.
+    """
+    x = np.asarray(x)
+    starts = np.asarray(starts, dtype=np.intp)
+    if len(starts) and (starts.min() < 0 or starts.max() + length > x.shape[-1]):
+        raise ValueError("Epoch di luar rentang rekaman")
+    step = np.diff(starts)
+    if len(starts) == 0 or np.all(step == step[:1]):
+        base = x[..., starts[0]:] if len(starts) else x
+        stride = (step[0] if len(step) else 0) * x.strides[-1]
+        return as_strided(base, shape=(len(starts),) + x.shape[:-1] + (length,),
+                          strides=(stride,) + x.strides, writeable=False)
+    windows = sliding_window_view(x, length, axis=-1)      # (..., n - length + 1, length), view
+    return np.moveaxis(windows[..., starts, :], -2, 0)
+
+def statistik_soal(bands, masks, fs, t0, markers):
+    """
+    bands   : list per kanal dict band -> sinyal (fs, sampel) sepanjang rekaman
+    masks   : list per kanal mask sampel bersih (atau None)
+    t0      : waktu sampel pertama (jam Timestamp rekaman)
+    markers : hasil baca_marker
+
+    Band difilter sekali sepanjang rekaman (tanpa transien tepi per soal),
+    lalu setiap soal adalah view (Q, kanal, 5, L) dengan panjang L = soal
+    terpendek. Return dict nomor, onset, panjang (detik) dan statistik
+    (band_power (Q, kanal, 5), delta_variability (Q, kanal), correlation
+    (Q, kanal)) atau None jika tidak ada soal di dalam rekaman.
+    """
+    sig = np.stack([np.stack(list(b.values())) for b in bands])             # (kanal, 5, n)
+    n = sig.shape[-1]
+    nomor, onset, akhir = jadwal_soal(markers)
+    start = np.rint((onset - t0) * fs).astype(np.intp)
+    stop = np.minimum(np.rint((akhir - t0) * fs), n).astype(np.intp)
+    ok = (start >= 0) & (stop > start + 1)
+    if not ok.any():
+        return None
+    nomor, onset, start, stop = nomor[ok], onset[ok], start[ok], stop[ok]
+    length = int((stop - start).min())
+
+    mask = None
+    if any(m is not None for m in masks):
+        mask = np.stack([np.ones(n, dtype=bool) if m is None else m[:n] for m in masks])
+        mask = epoch(mask, start, length)                                       # (Q, kanal, L)
+    statistik = statistik_band(epoch(sig, start, length), mask)
+    return {'nomor': nomor, 'onset': onset, 'panjang': length / fs, 'statistik': statistik}
+
+def skor_soal(soal, aturan=None):
+    """Semua soal x kanal dinilai dalam satu panggilan skor_batch -> structured (Q, kanal)."""
+    return skor_batch(*soal['statistik'], aturan=aturan)
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ================== LAZY RESULT ==================
+class LazyResult(dict):
+    """
+    dict hasil pipeline yang sebagian nilainya baru dihitung saat pertama
+    kali diakses (res['filtered'], res.get('kanan'), ...), lalu disimpan.
+    Kode lama yang memperlakukan hasil sebagai dict tetap berjalan.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._loaders = {}
+
+    def lazy(self, key, loader):
+        self._loaders[key] = loader
+        return self
+
+    def is_loaded(self, key):
+        return dict.__contains__(self, key)
+
+    def __missing__(self, key):
+        loader = self._loaders.get(key)
+        if loader is None:
+            raise KeyError(key)
+        # Loader dilepas setelah berhasil saja, agar error tidak menghapus kunci
+        value = loader()
+        self[key] = value
+        del self._loaders[key]
+        return value
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or key in self._loaders
+
+    def get(self, key, default=None):
+        # Cek kunci dulu: KeyError dari dalam loader tidak boleh jadi default
+        if key not in self:
+            return default
+        return self[key]
+
+    def loaded(self):
+        """dict biasa berisi nilai yang sudah dihitung saja (tanpa memicu loader)."""
+        return dict(self)
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import functools
+import json
+import operator
+import os
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# ================== KONFIGURASI ==================
+BANDS = {
+    "Delta (0.5–4 Hz)": (0.5, 4),
+    "Theta (4–8 Hz)": (4, 8),
+    "Alpha (8–13 Hz)": (8, 13),
+    "Beta (13–30 Hz)": (13, 30),
+    "Gamma (30–45 Hz)": (30, 45)
+}
+BAND_KEYS = ['delta', 'theta', 'alpha', 'beta', 'gamma']
+DELTA, THETA, ALPHA, BETA, GAMMA = range(5)
+
+OPERATORS = {
+    '>': operator.gt, '>=': operator.ge,
+    '<': operator.lt, '<=': operator.le,
+}
+
+# Protokol kriteria (fitur, operator, threshold, bobot, tingkat) dari file
+# konfigurasi; EEG_ATURAN dapat menunjuk ke protokol lain tanpa ubah kode.
+ATURAN_PATH = os.environ.get(
+    "EEG_ATURAN", os.path.join(os.path.dirname(os.path.abspath(__file__)), "aturan_kriteria.json"))
+
+# Teks yang ditampilkan aplikasi per tingkat, wajib ada di setiap tier protokol
+# (r_1: label + rekomendasi_singkat; r_2: ringkas, icon, color, rekomendasi, narasi)
+TAMPILAN_TINGKAT = ('label', 'ringkas', 'icon', 'color', 'rekomendasi', 'rekomendasi_singkat', 'narasi')
+
+# ================== FITUR KRITERIA ==================
+# Setiap fitur menerima konteks {'power', 'rel', 'variability', 'correlation'}
+# dengan dimensi depan bebas (sesi, jendela, kanal) dan return array (...).
+FITUR_KRITERIA = {f'{key}_rel': (lambda i: lambda c: c['rel'][..., i])(i) for i, key in enumerate(BAND_KEYS)}
+FITUR_KRITERIA.update({
+    'delta_gamma_ratio': lambda c: c['power'][..., DELTA] / (c['power'][..., GAMMA] + 1e-10),
+    'delta_variability': lambda c: c['variability'],
+    'delta_dominance': lambda c: c['rel'][..., DELTA] - c['rel'][..., THETA:].max(axis=-1),
+    'beta_gamma_gap': lambda c: c['rel'][..., BETA] - c['rel'][..., GAMMA],
+    'delta_gamma_correlation': lambda c: c['correlation'],
+})
+
+def konteks_fitur(band_power, delta_variability, correlation):
+    power = np.asarray(band_power, dtype=float)
+    shape = power.shape[:-1]
+    return {
+        'power': power,
+        'rel': power / (power.sum(axis=-1, keepdims=True) + 1e-20) * 100,
+        'variability': np.broadcast_to(np.asarray(delta_variability, dtype=float), shape),
+        'correlation': np.broadcast_to(np.asarray(correlation, dtype=float), shape),
+    }
+
+def nilai_fitur(band_power, delta_variability, correlation):
+    """Semua FITUR_KRITERIA (tidak bergantung protokol) -> dict nama -> nilai."""
+    ctx = konteks_fitur(band_power, delta_variability, correlation)
+    return {name: fitur(ctx) for name, fitur in FITUR_KRITERIA.items()}
+
+# ================== ATURAN (RULE ENGINE) ==================
+class AturanKriteria:
+    """
+    Kumpulan kriteria hasil kompilasi konfigurasi. Operator & threshold
+    dikompilasi menjadi vektor (tanda, threshold, inklusif) sehingga semua
+    kriteria dievaluasi dalam satu ekspresi array, untuk satu sesi maupun
+    batch (dimensi depan bebas).
+    """
+
+    def __init__(self, config):
+        criteria = config['criteria']
+        tiers = sorted(config['tiers'], key=lambda t: t['min_score'])
+        for c in criteria:
+            if c['feature'] not in FITUR_KRITERIA:
+                raise ValueError(f"Fitur tidak dikenal: {c['feature']}")
+            if c['operator'] not in OPERATORS:
+                raise ValueError(f"Operator tidak dikenal: {c['operator']}")
+        if not tiers:
+            raise ValueError("Konfigurasi harus punya minimal satu tingkat")
+        for t in tiers:
+            missing = [k for k in TAMPILAN_TINGKAT if not t.get(k)]
+            if missing:
+                raise ValueError(f"Tingkat {t['name']} tanpa teks tampilan: {', '.join(missing)}")
+
+        self.config = config
+        self.name = config.get('name', '')
+        self.kriteria = [(c['name'], c['threshold'], c.get('description', c['name'])) for c in criteria]
+        self.features = [c['feature'] for c in criteria]
+        self.thresholds = np.array([c['threshold'] for c in criteria], dtype=float)
+        self.weights = np.array([c.get('weight', 1) for c in criteria], dtype=float)
+        self.sign = np.array([1.0 if c['operator'][0] == '>' else -1.0 for c in criteria])
+        self.inclusive = np.array([c['operator'].endswith('=') for c in criteria])
+
+        self.tingkat_names = [t['name'] for t in tiers]
+        self.keyakinan = [t.get('confidence', '') for t in tiers]
+        self.tampilan = [{k: t[k] for k in TAMPILAN_TINGKAT} for t in tiers]
+        self.tingkat_batas = tuple(t['min_score'] for t in tiers[1:])
+
+        n = len(criteria)
+        self.dtype = np.dtype([
+            ('values', 'f8', (n,)),
+            ('passed', '?', (n,)),
+            ('kriteria_terpenuhi', 'u1'),
+            ('skor', 'f4'),
+            ('confidence_score', 'f4'),
+            ('tingkat', 'u1'),
+            ('relative_power', 'f8', (len(BANDS),)),
+        ])
+
+    @property
+    def names(self):
+        return [k[0] for k in self.kriteria]
+
+    def _evaluasi(self, band_power, delta_variability, correlation):
+        ctx = konteks_fitur(band_power, delta_variability, correlation)
+        values = np.stack([FITUR_KRITERIA[f](ctx) for f in self.features], axis=-1)
+        return values, self.bandingkan(values), ctx['rel']
+
+    def bandingkan(self, values, thresholds=None):
+        """
+        values (..., K) vs thresholds (..., K) yang bisa di-broadcast
+        (default threshold protokol) -> passed (..., K). Tanda +1 untuk
+        > / >=, -1 untuk < / <=: semua operator jadi satu perbandingan.
+        """
+        thresholds = self.thresholds if thresholds is None else thresholds
+        d = (values - thresholds) * self.sign
+        return (d > 0) | (self.inclusive & (d == 0))
+
+    def evaluasi(self, band_power, delta_variability, correlation):
+        """Return (values, passed), keduanya array (..., jumlah kriteria)."""
+        values, passed, _ = self._evaluasi(band_power, delta_variability, correlation)
+        return values, passed
+
+    def skor(self, band_power, delta_variability, correlation):
+        """Structured array (...) dengan dtype self.dtype, lihat skor_batch."""
+        values, passed, rel = self._evaluasi(band_power, delta_variability, correlation)
+        score = passed @ self.weights
+
+        out = np.empty(score.shape, dtype=self.dtype)
+        out['values'] = values
+        out['passed'] = passed
+        out['kriteria_terpenuhi'] = passed.sum(axis=-1)
+        out['skor'] = score
+        out['confidence_score'] = score / (self.weights.sum() + 1e-20) * 100
+        out['tingkat'] = np.searchsorted(self.tingkat_batas, score, side='right')
+        out['relative_power'] = rel
+        return out
+
+def muat_aturan(path=ATURAN_PATH):
+    """Baca konfigurasi JSON protokol kriteria -> AturanKriteria (dikompilasi sekali)."""
+    with open(path, encoding='utf-8') as f:
+        return AturanKriteria(json.load(f))
+
+@functools.lru_cache(maxsize=None)
+def aturan_aktif():
+    """Protokol aktif (ATURAN_PATH), dibaca saat pertama kali dibutuhkan (bukan saat import)."""
+    return muat_aturan()
+
+# Turunan protokol aktif (urutan sama dengan k1..k7 di deteksi_disleksia_riset).
+# Nama lama tetap bisa di-import (from eeg_kriteria import KRITERIA), tetapi
+# kode yang di-import aplikasi saat start memakai aturan_aktif() di dalam fungsi.
+# SKOR_DTYPE = hasil skor per sesi (pengganti dict per kriteria untuk analisis kohort).
+_TURUNAN = {
+    'ATURAN': lambda a: a,
+    'KRITERIA': lambda a: a.kriteria,
+    'KRITERIA_NAMES': lambda a: a.names,
+    'TINGKAT_BATAS': lambda a: a.tingkat_batas,
+    'TINGKAT_NAMES': lambda a: a.tingkat_names,
+    'KEYAKINAN': lambda a: a.keyakinan,
+    'TAMPILAN': lambda a: a.tampilan,
+    'SKOR_DTYPE': lambda a: a.dtype,
+}
+
+def __getattr__(name):
+    if name in _TURUNAN:
+        return _TURUNAN[name](aturan_aktif())
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# ================== KRITERIA (VEKTOR) ==================
+def hitung_kriteria(band_power, delta_variability, correlation):
+    """
+    band_power        : array (..., 5) power absolut delta..gamma
+    delta_variability : array (...) std / mean(|delta|)
+    correlation       : array (...) korelasi delta-gamma
+
+    Return (values, passed), keduanya array (..., 7) dengan urutan KRITERIA.
+    Semua dimensi depan (jendela, sesi, kanal) dihitung sekaligus dengan
+    protokol aktif (aturan_aktif()).
+    """
+    return aturan_aktif().evaluasi(band_power, delta_variability, correlation)
+
+# ================== SKOR BATCH ==================
+def skor_batch(band_power, delta_variability, correlation, aturan=None):
+    """
+    band_power        : array (sesi, 5) power absolut delta..gamma
+    delta_variability : array (sesi,)
+    correlation       : array (sesi,)
+    aturan            : AturanKriteria, None = protokol aktif
+
+    Kriteria, jumlah terpenuhi, skor berbobot, confidence score dan
+    tingkat diagnosis untuk semua sesi sekaligus. Return structured array
+    (sesi,) dengan dtype SKOR_DTYPE; label teks diambil dari
+    TINGKAT_NAMES / KEYAKINAN per kode 'tingkat' bila perlu.
+    """
+    return (aturan or aturan_aktif()).skor(band_power, delta_variability, correlation)
+
+# ================== STATISTIK BAND ==================
+def statistik_band(band_signals, mask=None):
+    """
+    band_signals : array (..., 5, n) delta..gamma, atau list/dict 5 sinyal
+    mask         : boolean (..., n) atau (n,), True = sampel dipakai
+
+    Return (band_power (..., 5), delta_variability (...), correlation (...))
+    dengan reduksi berbobot mask, diakumulasi dalam float64 (juga untuk
+    sinyal float32) tanpa menumpuk kelima band menjadi satu salinan.
+    Kanal dengan < 2 sampel bersih memakai semua sampel, sama seperti
+    deteksi_disleksia_riset.
+    """
+    if isinstance(band_signals, dict):
+        band_signals = list(band_signals.values())
+    if isinstance(band_signals, (list, tuple)):
+        bands = [np.asarray(b) for b in band_signals]
+    else:
+        sig = np.asarray(band_signals)
+        bands = [sig[..., i, :] for i in range(sig.shape[-2])]
+    shape = bands[0].shape
+    if mask is None:
+        m = np.ones(shape[-1])
+    else:
+        m = np.asarray(mask, dtype=float)
+        m = np.where(m.sum(axis=-1, keepdims=True) < 2, 1.0, m)
+    m = np.broadcast_to(m, shape)
+    count = m.sum(axis=-1)
+
+    def wsum(*xs):
+        return np.einsum(','.join(['...n'] * (len(xs) + 1)) + '->...', *xs, m, dtype=np.float64)
+
+    power = np.stack([wsum(x, x) for x in bands], axis=-1) / count[..., None]
+    d, g = bands[DELTA], bands[GAMMA]
+    d_mean, g_mean = wsum(d) / count, wsum(g) / count
+
+    d_std = np.sqrt(np.maximum(power[..., DELTA] - d_mean**2, 0))
+    g_std = np.sqrt(np.maximum(power[..., GAMMA] - g_mean**2, 0))
+    d_abs = wsum(np.abs(d)) / count
+    delta_variability = d_std / (d_abs + 1e-10)
+
+    cov = wsum(d, g) / count - d_mean * g_mean
+    denom = d_std * g_std
+    correlation = np.where(denom > 0, cov / np.where(denom > 0, denom, 1), 0.0)
+
+    return power, delta_variability, correlation
+
+# ================== BILATERAL ==================
+def kriteria_bilateral(band_power, delta_variability, correlation, channels=('kiri', 'kanan')):
+    """
+    band_power        : array (kanal, 5), baris 0 = kiri, baris 1 = kanan
+    delta_variability : array (kanal,)
+    correlation       : array (kanal,)
+
+    Kriteria k1..k7 per hemisfer dalam satu pemanggilan hitung_kriteria,
+    plus indeks asimetri per band (kanan - kiri) / (kanan + kiri), -1..1.
+    """
+    power = np.asarray(band_power, dtype=float)
+    values, passed = hitung_kriteria(power, delta_variability, correlation)
+    rel = power / (power.sum(axis=-1, keepdims=True) + 1e-20) * 100
+    asym = (power[1] - power[0]) / (power[1] + power[0] + 1e-20)
+
+    return {
+        'kanal': list(channels),
+        'names': aturan_aktif().names,
+        'values': values,
+        'passed': passed,
+        'kriteria_terpenuhi': passed.sum(axis=-1),
+        'relative_power': rel,
+        'asimetri': dict(zip(BAND_KEYS, asym)),
+        # Asimetri nilai kriteria (mis. rasio delta/gamma kanan vs kiri)
+        'asimetri_kriteria': values[1] - values[0],
+    }
+
+def analisis_bilateral(bands_kiri, bands_kanan, mask_kiri=None, mask_kanan=None):
+    """bands_kiri/bands_kanan: dict hasil filter_bands per kanal."""
+    stat = [statistik_band(bands_kiri, mask_kiri), statistik_band(bands_kanan, mask_kanan)]
+    return kriteria_bilateral(*(np.stack(s) for s in zip(*stat)))
+
+# ================== TIMELINE (SLIDING WINDOW) ==================
+def _stack_bands(band_signals):
+    if isinstance(band_signals, dict):
+        band_signals = list(band_signals.values())
+    sig = np.asarray(band_signals, dtype=float)
+    if sig.ndim != 2 or sig.shape[0] != 5:
+        raise ValueError("band_signals harus berisi 5 band (delta..gamma)")
+    return sig
+
+def timeline_kriteria(band_signals, fs, window_sec=4.0, step_sec=1.0):
+    """
+    band_signals : dict hasil bandpass (urutan delta..gamma) atau array (5, n)
+    fs           : sampling rate (Hz)
+    window_sec   : panjang jendela (detik)
+    step_sec     : pergeseran antar jendela (detik), < window_sec = overlap
+
+    Menghitung k1..k7 untuk setiap jendela tanpa loop per jendela:
+    semua jendela adalah view (sliding_window_view) dan setiap statistik
+    direduksi sekaligus di sumbu sampel.
+    """
+    sig = _stack_bands(band_signals)
+    win = max(2, int(round(window_sec * fs)))
+    step = max(1, int(round(step_sec * fs)))
+    if sig.shape[1] < win:
+        raise ValueError("Data terlalu pendek untuk satu jendela")
+
+    # View (5, n_jendela, win) tanpa salinan
+    view = sliding_window_view(sig, win, axis=-1)[:, ::step]
+    n_win = view.shape[1]
+
+    power = np.einsum('bwk,bwk->wb', view, view) / win
+
+    delta = view[DELTA]
+    gamma = view[GAMMA]
+    d_mean = delta.mean(axis=-1)
+    g_mean = gamma.mean(axis=-1)
+    d_abs = sliding_window_view(np.abs(sig[DELTA]), win)[::step].mean(axis=-1)
+    d_var = np.maximum(power[:, DELTA] - d_mean**2, 0)
+    g_var = np.maximum(power[:, GAMMA] - g_mean**2, 0)
+    d_std = np.sqrt(d_var)
+    delta_variability = d_std / (d_abs + 1e-10)
+
+    cov = np.einsum('wk,wk->w', delta, gamma) / win - d_mean * g_mean
+    denom = d_std * np.sqrt(g_var)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        correlation = np.where(denom > 0, cov / denom, 0.0)
+
+    values, passed = hitung_kriteria(power, delta_variability, correlation)
+    t = (np.arange(n_win) * step + win / 2) / fs
+
+    return {
+        't': t,
+        'names': aturan_aktif().names,
+        'values': values,
+        'passed': passed,
+        'kriteria_terpenuhi': passed.sum(axis=-1),
+        'band_power': power,
+        'window_sec': win / fs,
+        'step_sec': step / fs,
+    }
+
+if __name__ == "__main__":
+    import time
+
+    fs = 256
+    n = fs * 3600
+    rng = np.random.default_rng(0)
+    bands = rng.standard_normal((5, n))
+
+    t0 = time.perf_counter()
+    tl = timeline_kriteria(bands, fs, window_sec=4, step_sec=1)
+    dt = time.perf_counter() - t0
+    print(f"{tl['values'].shape[0]} jendela dari rekaman 1 jam dalam {dt:.2f} detik")
+
+    sesi = 100_000
+    t0 = time.perf_counter()
+    skor = skor_batch(rng.gamma(2.0, 10.0, (sesi, 5)), rng.uniform(0.5, 2, sesi), rng.uniform(-1, 1, sesi))
+    dt = time.perf_counter() - t0
+    print(f"{sesi} sesi di-skor dalam {dt:.3f} detik, tingkat: {np.bincount(skor['tingkat'], minlength=4)}")
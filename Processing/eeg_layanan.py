@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Layanan analisis lokal (opsional) untuk beberapa kiosk dalam satu jaringan.
+
+    python eeg_layanan.py [--host 0.0.0.0] [--port 8765] [--jobs 4]
+
+Server asyncio menerima upload rekaman (POST /analisis, body = isi CSV,
+ditulis ke disk per blok tanpa menahan seluruh file di memori), mengantre
+analisis ke pool proses (eeg_proses.ringkasan_cache, versi headless
+run_eeg_pipeline) dan mengembalikan ringkasan sebagai JSON. Kiosk memakai
+KlienAnalisis (lihat eeg_worker.AnalysisWorker): jika server tidak
+terjangkau, analisis jatuh kembali ke worker lokal.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from http import HTTPStatus
+
+# ================== KONFIGURASI ==================
+SERVER_URL = os.environ.get("EEG_SERVER")   # mis. http://192.168.1.10:8765, None = selalu lokal
+DEFAULT_PORT = 8765
+MAX_UPLOAD_BYTES = 512 * 1024 * 1024
+BLOCK_BYTES = 64 * 1024
+DRAIN_BYTES = 1024 * 1024   # body request yang ditolak dibaca & dibuang sampai sebanyak ini, sisanya koneksi ditutup
+DRAIN_TIMEOUT = 2.0
+STATUS_TIMEOUT = 0.5        # detik; cek server sebelum upload
+ANALISIS_TIMEOUT = 600
+
+# ================== JSON ==================
+def _encode(obj):
+    # ndarray / tuple / skalar NumPy -> bentuk JSON yang bisa dikembalikan oleh _decode.
+    # NumPy di-import per fungsi: modul ini ikut di-import aplikasi Tk saat start (eeg_worker).
+    import numpy as np
+
+    if isinstance(obj, np.ndarray):
+        return {'__ndarray__': obj.tolist(), 'dtype': obj.dtype.str}
+    if isinstance(obj, tuple):
+        return {'__tuple__': [_encode(x) for x in obj]}
+    if isinstance(obj, dict):
+        return {str(k): _encode(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_encode(x) for x in obj]
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return obj
+
+def _decode(obj):
+    import numpy as np
+
+    if '__ndarray__' in obj:
+        return np.array(obj['__ndarray__'], dtype=np.dtype(obj['dtype']))
+    if '__tuple__' in obj:
+        return tuple(_decode(x) if isinstance(x, dict) else x for x in obj['__tuple__'])
+    return obj
+
+def ke_json(value):
+    return json.dumps(_encode(value), ensure_ascii=False).encode('utf-8')
+
+def dari_json(data):
+    return json.loads(data, object_hook=_decode)
+
+def config_json(config):
+    # dtype NumPy dikirim sebagai nama ('float32' / 'float64')
+    import numpy as np
+
+    return {k: (np.dtype(v).name if k == 'dtype' else v) for k, v in config.items()}
+
+def config_python(config):
+    import numpy as np
+
+    return {k: (np.dtype(v).type if k == 'dtype' else v) for k, v in config.items()}
+
+# ================== SERVER ==================
+def _header_int(headers, name, default=None):
+    # Header angka (Content-Length, X-Marker-Bytes): bukan bilangan bulat >= 0 -> ValueError (400)
+    value = headers.get(name, default)
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Header {name.title()} harus bilangan bulat, bukan {value!r}") from None
+    if value < 0:
+        raise ValueError(f"Header {name.title()} negatif: {value}")
+    return value
+
+def _analisis(path, config):
+    # Berjalan di proses pool
+    from eeg_proses import ringkasan_cache
+    return ringkasan_cache(path, **config_python(config))
+
+class LayananAnalisis:
+    """
+    Server HTTP/1.1 minimal di atas asyncio (satu request per koneksi).
+      GET  /status    -> {"ok", "jobs", "antrian", "selesai", "gagal"}
+      POST /analisis  -> {"ok": true, "ringkasan": ...} / {"ok": false, "error": ...}
+    Konfigurasi analisis di header X-Konfigurasi (JSON argumen ringkasan_file);
+    header X-Marker-Bytes = n berarti n byte terakhir body adalah file marker.
+    """
+
+    def __init__(self, jobs=None, max_upload=MAX_UPLOAD_BYTES):
+        self.jobs = jobs or os.cpu_count() or 1
+        self.max_upload = max_upload
+        self.pool = None
+        self.antrian = 0
+        self.selesai = 0        # analisis berhasil
+        self.gagal = 0          # analisis / upload gagal (request ditolak sebelum upload tidak dihitung)
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT, ready=None):
+        import asyncio
+        from concurrent.futures import ProcessPoolExecutor
+
+        self.pool = ProcessPoolExecutor(self.jobs)
+        # Upload diterima paralel, tetapi file di disk yang menunggu analisis dibatasi
+        self._slot = asyncio.Semaphore(self.jobs * 4)
+        server = await asyncio.start_server(self._handle, host, port)
+        if ready is not None:
+            ready(server.sockets[0].getsockname()[1])
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+
+    async def _handle(self, reader, writer):
+        try:
+            method, target, _ = (await reader.readline()).decode('latin-1').split(' ', 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                key, value = line.decode('latin-1').split(':', 1)
+                headers[key.strip().lower()] = value.strip()
+            path = urllib.parse.urlsplit(target).path
+            if method == 'GET' and path == '/status':
+                status, body = HTTPStatus.OK, {'ok': True, 'jobs': self.jobs, 'antrian': self.antrian,
+                                               'selesai': self.selesai, 'gagal': self.gagal}
+            elif method == 'POST' and path == '/analisis':
+                status, body = await self._analisis(reader, headers)
+            else:
+                status, body = HTTPStatus.NOT_FOUND, {'ok': False, 'error': f"{method} {path} tidak dikenal"}
+        except (ValueError, UnicodeDecodeError) as e:
+            status, body = HTTPStatus.BAD_REQUEST, {'ok': False, 'error': f"Request tidak valid: {e}"}
+        try:
+            data = ke_json(body)
+            writer.write(f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                         f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                         f"Connection: close\r\n\r\n".encode('latin-1') + data)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _terima(self, reader, folder, length, marker_bytes):
+        # Body ditulis ke disk per blok: rekaman.csv lalu (opsional) rekaman.marker.csv
+        parts = [(os.path.join(folder, "rekaman.csv"), length - marker_bytes)]
+        if marker_bytes:
+            parts.append((os.path.join(folder, "rekaman.marker.csv"), marker_bytes))
+        for path, size in parts:
+            with open(path, 'wb') as f:
+                while size > 0:
+                    block = await reader.read(min(BLOCK_BYTES, size))
+                    if not block:
+                        raise ValueError("Upload terputus")
+                    f.write(block)
+                    size -= len(block)
+        return parts[0][0]
+
+    async def _buang(self, reader, length):
+        # Body request yang ditolak dibaca dulu (sampai DRAIN_BYTES) agar klien sempat
+        # membaca respons; body lebih besar -> koneksi langsung ditutup oleh _handle
+        import asyncio
+
+        sisa = min(length, DRAIN_BYTES)
+        try:
+            while sisa > 0:
+                block = await asyncio.wait_for(reader.read(min(BLOCK_BYTES, sisa)), DRAIN_TIMEOUT)
+                if not block:
+                    break
+                sisa -= len(block)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _analisis(self, reader, headers):
+        import asyncio
+
+        if 'content-length' not in headers:
+            return HTTPStatus.LENGTH_REQUIRED, {'ok': False, 'error': "Content-Length wajib"}
+        length = _header_int(headers, 'content-length')
+        try:
+            marker_bytes = _header_int(headers, 'x-marker-bytes', 0)
+            if length > self.max_upload:
+                await self._buang(reader, length)
+                return HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {'ok': False, 'error': "Rekaman terlalu besar"}
+            if marker_bytes > length:
+                raise ValueError("X-Marker-Bytes di luar body")
+            config = json.loads(headers.get('x-konfigurasi', '{}'))
+        except ValueError:
+            await self._buang(reader, length)
+            raise
+
+        async with self._slot:
+            folder = tempfile.mkdtemp(prefix="eeg_upload_")
+            self.antrian += 1
+            try:
+                path = await self._terima(reader, folder, length, marker_bytes)
+                loop = asyncio.get_running_loop()
+                ringkasan = await loop.run_in_executor(self.pool, _analisis, path, config)
+                self.selesai += 1
+                return HTTPStatus.OK, {'ok': True, 'ringkasan': ringkasan}
+            except ValueError as e:
+                self.gagal += 1
+                return HTTPStatus.BAD_REQUEST, {'ok': False, 'error': str(e)}
+            except Exception as e:
+                self.gagal += 1
+                return HTTPStatus.INTERNAL_SERVER_ERROR, {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+            finally:
+                self.antrian -= 1
+                shutil.rmtree(folder, ignore_errors=True)
+
+# ================== KLIEN (KIOSK) ==================
+class LayananTidakTersedia(Exception):
+    """Server tidak terjangkau / gagal di sisi server -> pakai analisis lokal."""
+
+class _BodyBerantai:
+    # Beberapa file dibaca berurutan sebagai satu body (urllib memanggil read(blok))
+    def __init__(self, paths):
+        self._files = [open(p, 'rb') for p in paths]
+
+    def read(self, size=-1):
+        while self._files:
+            block = self._files[0].read(size)
+            if block:
+                return block
+            self._files.pop(0).close()
+        return b''
+
+    def close(self):
+        for f in self._files:
+            f.close()
+
+class KlienAnalisis:
+    """Klien kiosk; status server diingat sebentar agar kiosk offline tidak menunggu timeout tiap kali."""
+
+    def __init__(self, url=SERVER_URL, status_ttl=30.0):
+        self.url = url.rstrip('/') if url else None
+        self.status_ttl = status_ttl
+        self._status = (0.0, False)
+
+    def tersedia(self):
+        if not self.url:
+            return False
+        checked, ok = self._status
+        if time.monotonic() - checked < self.status_ttl:
+            return ok
+        try:
+            with urllib.request.urlopen(self.url + "/status", timeout=STATUS_TIMEOUT) as r:
+                ok = json.load(r).get('ok', False)
+        except (OSError, ValueError):
+            ok = False
+        self._status = (time.monotonic(), ok)
+        return ok
+
+    def ringkasan(self, filename, **config):
+        """Upload rekaman (+ marker jika ada) secara streaming -> ringkasan seperti ringkasan_file."""
+        from eeg_epoch import marker_path
+
+        if not self.tersedia():
+            raise LayananTidakTersedia(f"Server {self.url} tidak terjangkau")
+        paths = [filename]
+        marker = marker_path(filename)
+        marker_bytes = os.path.getsize(marker) if os.path.exists(marker) else 0
+        if marker_bytes:
+            paths.append(marker)
+        body = _BodyBerantai(paths)
+        request = urllib.request.Request(self.url + "/analisis", data=body, method='POST', headers={
+            'Content-Type': 'application/octet-stream',
+            'Content-Length': str(sum(os.path.getsize(p) for p in paths)),
+            'X-Marker-Bytes': str(marker_bytes),
+            'X-Konfigurasi': json.dumps(config_json(config)),
+        })
+        try:
+            with urllib.request.urlopen(request, timeout=ANALISIS_TIMEOUT) as r:
+                hasil = dari_json(r.read())
+        except urllib.error.HTTPError as e:
+            if e.code < 500:
+                # Rekaman ditolak server: analisis lokal akan gagal dengan cara yang sama
+                raise ValueError(dari_json(e.read()).get('error', str(e))) from e
+            raise LayananTidakTersedia(f"Server error {e.code}") from e
+        except (OSError, ValueError) as e:
+            self._status = (0.0, False)
+            raise LayananTidakTersedia(str(e)) from e
+        finally:
+            body.close()
+        if not hasil.get('ok'):
+            raise LayananTidakTersedia(hasil.get('error', 'Analisis server gagal'))
+        return dict(hasil['ringkasan'], server=self.url)
+
+if __name__ == "__main__":
+    import argparse
+    import asyncio
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", default="127.0.0.1", help="0.0.0.0 agar kiosk lain di jaringan bisa mengakses")
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT)
+    ap.add_argument("--jobs", type=int, default=None)
+    args = ap.parse_args()
+
+    layanan = LayananAnalisis(args.jobs)
+    try:
+        asyncio.run(layanan.serve(args.host, args.port,
+                                  ready=lambda port: print(f"Layanan analisis di http://{args.host}:{port} "
+                                                           f"({layanan.jobs} worker)")))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tahap model opsional: regresi logistik (L2) pada vektor fitur kriteria,
+dilatih offline (latih_model.py) dan disimpan sebagai file bobot JSON
+kecil. Output = probabilitas terkalibrasi, ditampilkan di samping tingkat
+dari aturan kriteria (tidak menggantikannya).
+"""
+
+import functools
+import json
+import os
+import numpy as np
+
+from eeg_kriteria import FITUR_KRITERIA, konteks_fitur
+
+# File bobot; jika tidak ada, tahap model dilewati (model_aktif() = None)
+MODEL_PATH = os.environ.get(
+    "EEG_MODEL", os.path.join(os.path.dirname(os.path.abspath(__file__)), "model_logistik.json"))
+
+def sigmoid(z):
+    return 0.5 * (1 + np.tanh(0.5 * z))     # stabil untuk |z| besar
+
+def matriks_fitur(features, band_power, delta_variability, correlation):
+    """Statistik band -> matriks fitur (..., F) sesuai urutan features."""
+    ctx = konteks_fitur(band_power, delta_variability, correlation)
+    return np.stack([FITUR_KRITERIA[f](ctx) for f in features], axis=-1)
+
+# ================== MODEL ==================
+class ModelLogistik:
+    """
+    p = sigmoid(a * (w . (x - mean) / scale + b) + c), dengan (a, c) hasil
+    kalibrasi Platt pada logit out-of-fold. Semua operasi array dengan
+    dimensi depan bebas (sesi, jendela, kanal).
+    """
+
+    def __init__(self, features, mean, scale, coef, intercept, kalibrasi=(1.0, 0.0), meta=None):
+        for f in features:
+            if f not in FITUR_KRITERIA:
+                raise ValueError(f"Fitur tidak dikenal: {f}")
+        self.features = list(features)
+        self.mean = np.asarray(mean, dtype=float)
+        self.scale = np.asarray(scale, dtype=float)
+        self.coef = np.asarray(coef, dtype=float)
+        self.intercept = float(intercept)
+        self.kalibrasi = tuple(float(v) for v in kalibrasi)
+        self.meta = dict(meta or {})
+
+    def matriks(self, band_power, delta_variability, correlation):
+        return matriks_fitur(self.features, band_power, delta_variability, correlation)
+
+    def logit(self, X):
+        """Logit mentah (sebelum kalibrasi) dari matriks fitur (..., F)."""
+        return ((np.asarray(X, dtype=float) - self.mean) / self.scale) @ self.coef + self.intercept
+
+    def prob(self, X):
+        a, c = self.kalibrasi
+        return sigmoid(a * self.logit(X) + c)
+
+    def prob_statistik(self, band_power, delta_variability, correlation):
+        return self.prob(self.matriks(band_power, delta_variability, correlation))
+
+    def to_config(self):
+        return {
+            'features': self.features,
+            'mean': self.mean.tolist(),
+            'scale': self.scale.tolist(),
+            'coef': self.coef.tolist(),
+            'intercept': self.intercept,
+            'kalibrasi': list(self.kalibrasi),
+            'meta': self.meta,
+        }
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config['features'], config['mean'], config['scale'], config['coef'],
+                   config['intercept'], config.get('kalibrasi', (1.0, 0.0)), config.get('meta'))
+
+# ================== PELATIHAN ==================
+def _newton(X, y, l2, penalized, iters=100, tol=1e-10):
+    # IRLS / Newton untuk log-loss + 0.5 * l2 * |w|^2 (hanya kolom penalized)
+    w = np.zeros(X.shape[1])
+    reg = l2 * penalized.astype(float)
+    for _ in range(iters):
+        p = sigmoid(X @ w)
+        grad = X.T @ (p - y) + reg * w
+        hess = (X * (p * (1 - p))[:, None]).T @ X + np.diag(reg + 1e-9)
+        step = np.linalg.solve(hess, grad)
+        w -= step
+        if np.max(np.abs(step)) < tol:
+            break
+    return w
+
+def fit_logistik(X, y, l2=1.0):
+    """Standarisasi + logistik L2 (intercept tidak dipenalti) -> (mean, scale, coef, intercept)."""
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    mean = X.mean(axis=0)
+    scale = X.std(axis=0)
+    scale[scale == 0] = 1.0
+    Z = np.column_stack([(X - mean) / scale, np.ones(len(X))])
+    penalized = np.r_[np.ones(X.shape[1], dtype=bool), False]
+    w = _newton(Z, y, l2, penalized)
+    return mean, scale, w[:-1], w[-1]
+
+def fit_platt(logit, y):
+    """Kalibrasi Platt: (a, c) sehingga sigmoid(a * logit + c) ~ P(y=1)."""
+    Z = np.column_stack([logit, np.ones(len(logit))])
+    # Penalti sangat kecil: tetap terhingga walau logit out-of-fold terpisah sempurna
+    a, c = _newton(Z, np.asarray(y, dtype=float), 1e-3, np.ones(2, dtype=bool))
+    return a, c
+
+def latih(X, y, features, l2=1.0, folds=5, seed=0):
+    """
+    Latih ModelLogistik pada matriks fitur (sesi, F) dan label bool.
+    Logit out-of-fold dari k-fold dipakai untuk kalibrasi Platt dan
+    evaluasi jujur (AUC, Brier); model akhir memakai seluruh data.
+    Return (model, logit_oof).
+    """
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=bool)
+    fold = np.random.default_rng(seed).permutation(len(y)) % max(2, folds)
+    oof = np.empty(len(y))
+    for k in np.unique(fold):
+        test = fold == k
+        mean, scale, coef, b = fit_logistik(X[~test], y[~test], l2)
+        oof[test] = ((X[test] - mean) / scale) @ coef + b
+
+    mean, scale, coef, b = fit_logistik(X, y, l2)
+    model = ModelLogistik(features, mean, scale, coef, b, fit_platt(oof, y),
+                          meta={'l2': l2, 'folds': int(max(2, folds)), 'n_sesi': int(len(y)),
+                                'n_positif': int(y.sum())})
+    return model, oof
+
+# ================== FILE BOBOT ==================
+def simpan_model(path, model):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(model.to_config(), f, indent=2)
+
+def muat_model(path=MODEL_PATH):
+    """File bobot JSON -> ModelLogistik, atau None jika belum ada model terlatih."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return ModelLogistik.from_config(json.load(f))
+
+@functools.lru_cache(maxsize=None)
+def model_aktif():
+    """Model dari MODEL_PATH, dibaca saat pertama kali dibutuhkan (bukan saat import); None tanpa model."""
+    return muat_model()
+
+def __getattr__(name):
+    # Nama lama: from eeg_model import MODEL
+    if name == 'MODEL':
+        return model_aktif()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
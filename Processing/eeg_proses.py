@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Analisis tanpa GUI (aman di-import di proses worker: tidak ada Tk/pygame).
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from eeg_alur import alur_eeg
+from eeg_arsip import ADC_COLUMNS, baca_csv, cek_kolom
+from eeg_bertahap import analisis_bertahap
+from eeg_cache import CacheHasil
+from eeg_dsp import DEFAULT_FS, detect_mains, minmax_decimate, resample_uniform
+from eeg_epoch import baca_marker, marker_path, statistik_soal
+from eeg_kriteria import BANDS, nilai_fitur
+
+# ================== ANALISIS HEADLESS ==================
+def siapkan_alur(filename, gain, vref, dtype=np.float64, multirate=False, mains_freq=None, resample_fs=None):
+    """CSV -> (t, fs, mains_hz, alur) dengan alur = DAG eeg_alur yang belum dijalankan."""
+    # CSV tanpa kolom logger -> FormatRekamanError (jangan pernah menganalisis / meng-cache data pengganti)
+    cek_kolom(filename)
+    rekaman = baca_csv(filename, gain, vref)
+
+    # Timestamp host tidak seragam (buffer USB) -> grid seragam dengan fs pasti.
+    # Sampel tetap uint16; ke µV lewat LUT kalibrasi hanya saat dibutuhkan.
+    t, adc, fs = resample_uniform(rekaman.t, rekaman.adc, resample_fs, dtype=np.uint16)
+    mains_hz = mains_freq or detect_mains(adc, fs)
+    return t, fs, mains_hz, alur_eeg(adc, fs, gain, vref, mains_hz, dtype, multirate)
+
+SOAL_TARGETS = ("bands_kiri", "mask_kiri", "bands_kanan", "mask_kanan")
+KANAL = ("kiri", "kanan")   # urutan sama dengan ADC_COLUMNS
+
+def _soal(hasil, fs_bands, t0, markers):
+    channels = ("kiri", "kanan")
+    return statistik_soal([hasil[f"bands_{ch}"] for ch in channels], [hasil[f"mask_{ch}"] for ch in channels],
+                          fs_bands, t0, markers)
+
+def soal_dari_alur(alur, t, markers):
+    """Statistik per soal (eeg_epoch) kedua kanal dari DAG rekaman; None tanpa marker."""
+    if markers is None:
+        return None
+    return _soal(alur.run(*SOAL_TARGETS), alur["fs_bands"], t[0], markers)
+
+def ringkasan_file(filename, gain, vref, dtype=np.float64, multirate=False, mains_freq=None,
+                   resample_fs=None, chunked_min_bytes=None, kanal="kiri"):
+    """
+    Analisis satu kanal (default kiri) -> dict ringkas (beberapa angka, statistik band,
+    jumlahan per segmen untuk bootstrap, fitur kriteria dan data grafik
+    yang sudah didesimasi), kecil untuk
+    dikirim antar proses / disimpan di cache. Sinyal penuh tidak ikut.
+    Jika rekaman punya file marker, 'soal' (hanya untuk kanal kiri) berisi
+    statistik per soal kedua kanal (lihat eeg_epoch.statistik_soal),
+    dihitung dalam run DAG yang sama. kanal="kanan" dipakai aplikasi untuk
+    analisis kanan / bilateral yang baru diminta belakangan.
+    File >= chunked_min_bytes dianalisis bertahap (eeg_bertahap, tanpa grafik).
+    CSV tanpa kolom logger -> eeg_arsip.FormatRekamanError.
+    """
+    i = KANAL.index(kanal)
+    cek_kolom(filename)
+    if chunked_min_bytes is not None and os.path.getsize(filename) >= chunked_min_bytes:
+        blok = analisis_bertahap(filename, gain, vref, fs=resample_fs, columns=ADC_COLUMNS[i:i + 1],
+                                 mains_hz=mains_freq, dtype=dtype, multirate=multirate)
+        statistik = blok['statistik'][0]
+        return {
+            'bertahap': True,
+            'kanal': kanal,
+            'fs': blok['fs'],
+            'fs_bands': blok['fs'],
+            'durasi': blok['t_end'] - blok['t_start'],
+            'mains_hz': blok['mains_hz'],
+            'statistik': statistik,
+            'rasio_artefak': float(blok['rasio_artefak'][0]),
+            'band_powers': dict(zip(BANDS, statistik[0])),
+            'fitur': {k: float(v) for k, v in nilai_fitur(*statistik).items()},
+            'segmen': blok['segmen'][0],
+        }
+
+    t, fs, mains_hz, alur = siapkan_alur(filename, gain, vref, dtype, multirate, mains_freq, resample_fs)
+    markers = baca_marker(filename) if kanal == "kiri" else None
+    targets = [f"{nama}_{kanal}" for nama in ("statistik", "band_powers", "artefak", "segmen", "uv", "filtered")]
+    awal = alur.run(*targets, *(SOAL_TARGETS if markers is not None else ()))
+    t_plot, raw = minmax_decimate(t, awal[f"uv_{kanal}"])
+    bands = {name: minmax_decimate(t, sig)[1] for name, sig in awal[f"filtered_{kanal}"].items()}
+    statistik = awal[f"statistik_{kanal}"]
+    return {
+        'bertahap': False,
+        'kanal': kanal,
+        'fs': fs,
+        'fs_bands': alur["fs_bands"],
+        'durasi': float(t[-1] - t[0]),
+        'mains_hz': mains_hz,
+        'statistik': statistik,
+        'rasio_artefak': awal[f"artefak_{kanal}"]['rasio_artefak'],
+        'band_powers': awal[f"band_powers_{kanal}"],
+        'fitur': {k: float(v) for k, v in nilai_fitur(*statistik).items()},
+        'segmen': awal[f"segmen_{kanal}"],
+        'plot': {'t': t_plot, 'raw': raw, 'bands': bands},
+        'soal': None if markers is None else _soal(awal, alur["fs_bands"], t[0], markers),
+    }
+
+def ringkasan_cache(filename, cache=None, **config):
+    """
+    ringkasan_file lewat cache dialamati konten (eeg_cache.CacheHasil):
+    rekaman + konfigurasi yang sama kembali dalam milidetik. Kunci 'cache'
+    pada hasil = True jika diambil dari cache.
+    """
+    cache = cache or CacheHasil()
+    # File marker ikut menentukan hasil (statistik per soal)
+    extra = [p for p in (marker_path(filename),) if os.path.exists(p)]
+    key = cache.kunci(filename, *extra, **config)
+    ringkasan = cache.get(key)
+    if ringkasan is not None:
+        return dict(ringkasan, cache=True)
+    ringkasan = ringkasan_file(filename, **config)
+    try:
+        cache.put(key, ringkasan)
+    except OSError:
+        pass    # folder cache tidak bisa ditulis: analisis tetap jalan
+    return dict(ringkasan, cache=False)
+
+def pemanasan(fs=None, detik=10, **config):
+    """
+    Jalankan ringkasan_file sekali pada CSV sintetis agar pustaka ter-import,
+    parser CSV, desain filter (lru_cache di eeg_dsp) dan jalur NumPy/SciPy
+    sudah "panas" sebelum analisis pertama. fs default = resample_fs
+    konfigurasi atau DEFAULT_FS; desain filter dikunci pada
+    eeg_dsp.design_fs sehingga fs estimasi rekaman nyata (mis. 255.93)
+    memakai desain yang sama. Return durasi (detik).
+    """
+    t0 = time.perf_counter()
+    fs = fs or config.get('resample_fs') or DEFAULT_FS
+    n = int(fs * detik)
+    t = np.arange(n) / fs
+    rng = np.random.default_rng(0)
+    adc = 2048 + rng.normal(0, 15, (2, n)) + 40 * np.sin(2 * np.pi * 10 * t)
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "pemanasan.csv")
+        np.savetxt(path, np.column_stack([t, adc.T.round()]), fmt=["%.6f", "%d", "%d"],
+                   delimiter=",", header="Timestamp," + ",".join(ADC_COLUMNS), comments="")
+        ringkasan_file(path, **config)
+    return time.perf_counter() - t0
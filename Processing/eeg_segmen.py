@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from eeg_kriteria import BANDS, OPERATORS
+
+# ================== SEGMENTASI ==================
+def segmen_view(data, samples_per_segment):
+    """
+    Potong sinyal 1D menjadi matriks (segmen x sampel). Sisa di ujung
+    dibuang seperti versi loop lama. Untuk array float yang kontigu
+    hasilnya adalah view, bukan salinan.
+    """
+    data = np.asarray(data, dtype=float)
+    samples_per_segment = int(samples_per_segment)
+    total_segments = len(data) // samples_per_segment
+    if total_segments == 0:
+        raise ValueError("Data terlalu pendek untuk dibagi menjadi segmen")
+    return data[:total_segments * samples_per_segment].reshape(total_segments, samples_per_segment)
+
+# ================== FITUR ==================
+def _zero_crossings(seg):
+    return np.count_nonzero(np.signbit(seg[:, 1:]) != np.signbit(seg[:, :-1]), axis=1)
+
+FITUR = {
+    'mean_abs': lambda seg: np.abs(seg).mean(axis=1),
+    'rms': lambda seg: np.sqrt(np.einsum('ij,ij->i', seg, seg) / seg.shape[1]),
+    'ptp': lambda seg: np.ptp(seg, axis=1),
+    'zero_crossings': _zero_crossings,
+}
+
+def _band_powers(seg, sampling_rate, bands):
+    # Satu rfft untuk semua segmen, lalu jumlahkan bin per band
+    spec = np.abs(np.fft.rfft(seg, axis=1))**2 / seg.shape[1]**2
+    spec[:, 1:] *= 2
+    freqs = np.fft.rfftfreq(seg.shape[1], 1.0 / sampling_rate)
+    out = {}
+    for name, (lo, hi) in bands.items():
+        sel = (freqs >= lo) & (freqs < hi)
+        out[name] = spec[:, sel].sum(axis=1)
+    return out
+
+def fitur_segmen(segments, sampling_rate, features=('mean_abs',), bands=None):
+    """
+    segments      : array (segmen x sampel), misalnya dari segmen_view
+    sampling_rate : Hz
+    features      : nama fitur dari FITUR
+    bands         : dict nama -> (low, high) Hz untuk band power (opsional),
+                    True untuk memakai BANDS standar
+
+    Return dict nama fitur -> array (segmen,)
+    """
+    out = {}
+    for name in features:
+        if name not in FITUR:
+            raise ValueError(f"Fitur tidak dikenal: {name}")
+        out[name] = FITUR[name](segments)
+    if bands:
+        if bands is True:
+            bands = {k.split()[0].lower(): v for k, v in BANDS.items()}
+        out.update(_band_powers(segments, sampling_rate, bands))
+    return out
+
+# ================== ATURAN ==================
+def _kolom(fitur, expr):
+    # "a/b" -> rasio dua fitur
+    if '/' in expr:
+        num, den = (s.strip() for s in expr.split('/', 1))
+        return fitur[num] / (fitur[den] + 1e-10)
+    return fitur[expr]
+
+def terapkan_aturan(fitur, rules):
+    """
+    rules : list (fitur, operator, threshold), fitur boleh berupa rasio
+            "a/b". Segmen terindikasi jika semua aturan terpenuhi.
+    """
+    mask = None
+    for expr, op, threshold in rules:
+        if op not in OPERATORS:
+            raise ValueError(f"Operator tidak dikenal: {op}")
+        hasil = OPERATORS[op](_kolom(fitur, expr), threshold)
+        mask = hasil if mask is None else (mask & hasil)
+    return mask
+
+def deteksi_segmen(
+    data,
+    sampling_rate,
+    segment_duration=10,
+    rules=(('mean_abs', '>', 50),),
+    indikasi_ratio=0.7,
+    bands=None
+):
+    """
+    data              : array 1D / Series EEG
+    sampling_rate     : Hz (contoh 256)
+    segment_duration  : durasi tiap kelompok (detik)
+    rules             : aturan per segmen, lihat terapkan_aturan
+    indikasi_ratio    : rasio minimal segmen terindikasi
+    bands             : band power yang ikut dihitung (lihat fitur_segmen)
+    """
+    segments = segmen_view(data, sampling_rate * segment_duration)
+
+    dipakai = {e.strip() for expr, _, _ in rules for e in expr.split('/')}
+    features = [f for f in FITUR if f in dipakai]
+    fitur = fitur_segmen(segments, sampling_rate, features, bands)
+
+    mask = terapkan_aturan(fitur, rules)
+    total_segments = len(segments)
+    indikasi = int(np.count_nonzero(mask))
+    rasio_indikasi = indikasi / total_segments
+
+    return {
+        "total_segmen": total_segments,
+        "segmen_terindikasi": indikasi,
+        "rasio": rasio_indikasi,
+        "hasil": "disleksia" if rasio_indikasi >= indikasi_ratio else "tidak disleksia",
+        "fitur": fitur,
+        "mask": mask
+    }
+
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(0)
+    data = rng.standard_normal(20_000_000) * 60
+
+    t0 = time.perf_counter()
+    hasil = deteksi_segmen(
+        data, 256, segment_duration=10,
+        rules=[('mean_abs', '>', 45), ('rms', '<', 80), ('ptp/rms', '>', 4)]
+    )
+    dt = time.perf_counter() - t0
+    print(f"{len(data):,} sampel, {hasil['total_segmen']} segmen dalam {dt:.3f} detik -> {hasil['hasil']}")
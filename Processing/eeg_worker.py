@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Worker analisis untuk aplikasi Tk. Sengaja ringan: pandas/SciPy (lewat
+eeg_proses) baru di-import di proses worker, bukan saat aplikasi start.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from eeg_layanan import SERVER_URL, KlienAnalisis, LayananTidakTersedia
+
+def _jalankan(fungsi, *args, **kwargs):
+    # Berjalan di proses worker
+    import eeg_proses
+    return getattr(eeg_proses, fungsi)(*args, **kwargs)
+
+def konteks_worker():
+    """Konteks multiprocessing aman-thread: forkserver (preload eeg_proses), atau spawn."""
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    ctx = multiprocessing.get_context("forkserver")
+    ctx.set_forkserver_preload(["eeg_proses"])
+    return ctx
+
+# ================== WORKER PROSES ==================
+class AnalysisWorker:
+    """
+    Satu proses worker persisten untuk analisis. Yang dikirim hanya path
+    file + konfigurasi, yang kembali hanya ringkasan eeg_proses.ringkasan_cache
+    (rekaman yang pernah dianalisis langsung diambil dari cache disk),
+    sehingga parsing pandas/NumPy tidak memegang GIL proses Tk dan
+    animasi tetap mulus.
+    Jika server diisi (default env EEG_SERVER, lihat eeg_layanan) rekaman
+    diupload ke layanan analisis dari thread latar; server tidak terjangkau
+    -> analisis jatuh kembali ke worker lokal. Future yang dikembalikan sama.
+    Future dipoll dari Tk dengan after(); jangan sentuh widget di callback.
+    """
+
+    def __init__(self, server=SERVER_URL):
+        self._pool = None
+        self._warm = None
+        self._lock = threading.Lock()
+        self.klien = KlienAnalisis(server) if server else None
+        self._upload = None
+
+    def start(self):
+        with self._lock:
+            if self._pool is None:
+                # Bukan fork: fork dari proses yang sedang menjalankan thread (Tk, antrian,
+                # upload) bisa mewarisi lock yang terkunci -> worker deadlock. forkserver
+                # mem-fork dari proses server bersih yang sudah meng-import eeg_proses.
+                self._pool = ProcessPoolExecutor(max_workers=1, mp_context=konteks_worker())
+        return self
+
+    def warm(self, **config):
+        """
+        Start worker + pemanasan di belakang layar (mis. selama animasi intro).
+        Analisis yang di-submit setelahnya mengantre di belakang pemanasan.
+        """
+        self.start()
+        if self._warm is None:
+            self._warm = self._pool.submit(_jalankan, "pemanasan", **config)
+        return self._warm
+
+    def submit(self, filename, **config):
+        if self.klien is not None:
+            with self._lock:
+                if self._upload is None:
+                    self._upload = ThreadPoolExecutor(max_workers=1, thread_name_prefix="eeg-upload")
+            return self._upload.submit(self._remote_atau_lokal, filename, config)
+        return self._submit_lokal(filename, **config)
+
+    def _remote_atau_lokal(self, filename, config):
+        # Thread upload: tunggu hasil server, atau hasil worker lokal sebagai cadangan
+        try:
+            return self.klien.ringkasan(filename, **config)
+        except LayananTidakTersedia:
+            return self._submit_lokal(filename, **config).result()
+
+    def _submit_lokal(self, filename, **config):
+        self.start()
+        try:
+            return self._pool.submit(_jalankan, "ringkasan_cache", filename, **config)
+        except BrokenProcessPool:
+            # Worker mati (mis. kehabisan memori) -> buat ulang sekali
+            self._tutup_pool()
+            return self.start()._pool.submit(_jalankan, "ringkasan_cache", filename, **config)
+
+    def _tutup_pool(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+                self._warm = None
+
+    def shutdown(self):
+        self._tutup_pool()
+        with self._lock:
+            if self._upload is not None:
+                self._upload.shutdown(wait=False, cancel_futures=True)
+                self._upload = None
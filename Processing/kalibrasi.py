@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kalibrasi threshold kriteria terhadap label klinisi (sweep grid + ROC).
+
+    python kalibrasi.py label.csv [--steps 5] [--vary high_delta,low_gamma]
+                        [--tier indikasi_rendah] [--fitur fitur.npz]
+                        [--out sweep.csv] [--simpan-aturan aturan_baru.json]
+
+label.csv berisi kolom file,label (1 = disleksia menurut klinisi, 0 =
+tidak), path relatif terhadap folder label.csv. Fitur kriteria tiap sesi
+diekstrak sekali (eeg_proses.ringkasan_cache) menjadi matriks sesi x
+kriteria dan disimpan ke --fitur; sweep berikutnya langsung memakainya.
+
+Setiap kombinasi threshold dievaluasi dengan broadcasting per blok
+(--max-mb membatasi memori): AUC dari skor berbobot, sensitivitas &
+spesifisitas di setiap batas tingkat, lalu front Pareto (sens, spec) di
+tingkat --tier.
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from eeg_kriteria import ATURAN
+
+# ================== DATASET & FITUR ==================
+def baca_label(path):
+    """label.csv -> (daftar path file, array label 0/1)."""
+    folder = os.path.dirname(os.path.abspath(path))
+    files, labels = [], []
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            files.append(os.path.join(folder, row['file']))
+            labels.append(int(row['label']))
+    return files, np.array(labels, dtype=bool)
+
+def _fitur_sesi(filename, aturan, **config):
+    from eeg_proses import ringkasan_cache
+    ringkasan = ringkasan_cache(filename, **config)
+    values, _ = aturan.evaluasi(*ringkasan['statistik'])
+    return values
+
+def ekstrak_fitur(files, aturan=ATURAN, jobs=None, **config):
+    """Matriks fitur (sesi x kriteria) dari semua file, paralel per file."""
+    with ProcessPoolExecutor(jobs) as pool:
+        rows = list(pool.map(partial(_fitur_sesi, aturan=aturan, **config), files))
+    return np.vstack(rows)
+
+# ================== GRID & SWEEP ==================
+def grid_threshold(values, aturan, steps, vary):
+    """
+    Grid (steps, K): kriteria di vary diisi steps - 1 kuantil 5..95% fitur
+    plus threshold protokol (selalu ada di grid, sehingga protokol sekarang
+    ikut dibandingkan); kriteria lain tetap di threshold protokol.
+    steps < 2 -> ValueError.
+    """
+    if steps < 2:
+        raise ValueError(f"steps minimal 2 (kuantil + threshold protokol), bukan {steps}")
+    grid = np.tile(aturan.thresholds, (steps, 1))
+    for k in vary:
+        q = np.quantile(values[:, k], np.linspace(0.05, 0.95, steps - 1))
+        grid[:, k] = np.sort(np.append(q, aturan.thresholds[k]))
+    return grid
+
+def _levels(aturan):
+    # Skor berbobot untuk setiap kombinasi bit lulus (kode 0 .. 2^K - 1)
+    k = len(aturan.weights)
+    bits = (np.arange(2**k)[:, None] >> np.arange(k)) & 1
+    levels, level_id = np.unique(bits @ aturan.weights, return_inverse=True)
+    return levels, level_id
+
+def sweep(values, labels, aturan, grid, vary, max_mb=256):
+    """
+    values : (sesi, K) fitur kriteria
+    labels : (sesi,) bool label klinisi
+    grid   : (S, K) dari grid_threshold
+    vary   : indeks kriteria yang divariasikan (S^len(vary) kombinasi)
+
+    Return dict 'index' (C, V) indeks grid per kriteria vary, 'auc' (C,),
+    'sens' / 'spec' (C, tingkat-1) di setiap batas tingkat.
+    """
+    n = len(labels)
+    pos, neg = labels, ~labels
+    n_pos, n_neg = max(pos.sum(), 1), max(neg.sum(), 1)
+    steps = grid.shape[0]
+    vary = list(vary)
+
+    passed = aturan.bandingkan(values[None], grid[:, None, :])          # (S, sesi, K)
+    base = np.zeros(n, dtype=np.int64)
+    for k in set(range(values.shape[1])) - set(vary):
+        base |= passed[0, :, k].astype(np.int64) << k
+
+    levels, level_id = _levels(aturan)
+    n_lvl = len(levels)
+    bounds = np.array(aturan.tingkat_batas, dtype=float)
+    atas = levels[None, :] >= bounds[:, None]                             # (tingkat-1, L)
+
+    total = steps ** len(vary)
+    chunk = max(1, int(max_mb * 1e6) // (n * 8 * 3))
+    out = {
+        'index': np.empty((total, len(vary)), dtype=np.int32),
+        'auc': np.empty(total),
+        'sens': np.empty((total, len(bounds))),
+        'spec': np.empty((total, len(bounds))),
+    }
+    for start in range(0, total, chunk):
+        stop = min(total, start + chunk)
+        if vary:
+            idx = np.stack(np.unravel_index(np.arange(start, stop), (steps,) * len(vary)), axis=1)
+        else:
+            idx = np.zeros((stop - start, 0), dtype=np.int64)
+        code = np.broadcast_to(base, (stop - start, n)).copy()
+        for j, k in enumerate(vary):
+            code |= passed[idx[:, j], :, k].astype(np.int64) << k
+        lid = level_id[code] + (np.arange(stop - start) * n_lvl)[:, None]
+        h_pos = np.bincount(lid[:, pos].ravel(), minlength=(stop - start) * n_lvl).reshape(-1, n_lvl)
+        h_neg = np.bincount(lid[:, neg].ravel(), minlength=(stop - start) * n_lvl).reshape(-1, n_lvl)
+
+        # AUC Mann-Whitney dari histogram level skor (ties = 1/2)
+        below = np.cumsum(h_neg, axis=1) - h_neg
+        out['auc'][start:stop] = (h_pos * (below + 0.5 * h_neg)).sum(axis=1) / (n_pos * n_neg)
+        out['sens'][start:stop] = h_pos @ atas.T / n_pos
+        out['spec'][start:stop] = h_neg @ (~atas).T / n_neg
+        out['index'][start:stop] = idx
+    return out
+
+def pareto(sens, spec):
+    """Indeks kombinasi yang tidak didominasi pada (sens, spec), urut sens menurun."""
+    order = np.lexsort((-spec, -sens))
+    s = spec[order]
+    best_before = np.maximum.accumulate(np.concatenate(([-np.inf], s[:-1])))
+    return order[s > best_before]
+
+def roc(values, labels, aturan, thresholds):
+    """Titik ROC (fpr, tpr) dari skor berbobot untuk satu set threshold."""
+    score = aturan.bandingkan(values, thresholds) @ aturan.weights
+    cuts = np.unique(score)[::-1]
+    tpr = [(score[labels] >= c).mean() for c in cuts]
+    fpr = [(score[~labels] >= c).mean() for c in cuts]
+    return np.array([0.0] + fpr), np.array([0.0] + tpr)
+
+# ================== OUTPUT ==================
+def simpan_csv(path, hasil, grid, vary, aturan):
+    names = aturan.names
+    tiers = aturan.tingkat_names[1:]
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        w = csv.writer(f)
+        w.writerow([names[k] for k in vary] + ['auc'] + [f'sens_{t}' for t in tiers] + [f'spec_{t}' for t in tiers])
+        for i in range(len(hasil['auc'])):
+            thr = [grid[hasil['index'][i, j], k] for j, k in enumerate(vary)]
+            w.writerow([f'{x:.6g}' for x in thr] + [f"{hasil['auc'][i]:.4f}"]
+                       + [f'{x:.4f}' for x in hasil['sens'][i]] + [f'{x:.4f}' for x in hasil['spec'][i]])
+
+def simpan_aturan(path, aturan, thresholds):
+    config = json.loads(json.dumps(aturan.config))
+    for c, thr in zip(config['criteria'], thresholds):
+        c['threshold'] = round(float(thr), 6)
+    config['name'] = config.get('name', '') + ' (kalibrasi)'
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2, ensure_ascii=False)
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("label", nargs="?", help="CSV file,label (tidak perlu jika --fitur sudah ada)")
+    ap.add_argument("--fitur", default="fitur_kalibrasi.npz")
+    ap.add_argument("--steps", type=int, default=5)
+    ap.add_argument("--vary", default=",".join(ATURAN.names))
+    ap.add_argument("--tier", default=ATURAN.tingkat_names[min(2, len(ATURAN.tingkat_names) - 1)])
+    ap.add_argument("--max-mb", type=float, default=256)
+    ap.add_argument("--jobs", type=int, default=None)
+    ap.add_argument("--gain", type=float, default=1000.0)
+    ap.add_argument("--vref", type=float, default=1.65)
+    ap.add_argument("--top", type=int, default=10)
+    ap.add_argument("--out")
+    ap.add_argument("--simpan-aturan")
+    args = ap.parse_args()
+
+    if args.label:
+        files, labels = baca_label(args.label)
+        t0 = time.perf_counter()
+        values = ekstrak_fitur(files, jobs=args.jobs, gain=args.gain, vref=args.vref)
+        np.savez(args.fitur, values=values, labels=labels, files=np.array(files))
+        print(f"Fitur {len(files)} sesi diekstrak dalam {time.perf_counter() - t0:.1f} detik -> {args.fitur}")
+    else:
+        with np.load(args.fitur) as z:
+            values, labels = z['values'], z['labels']
+
+    vary = [ATURAN.names.index(v) for v in args.vary.split(',') if v]
+    tier = ATURAN.tingkat_names.index(args.tier) - 1
+    if tier < 0:
+        raise SystemExit("--tier harus tingkat di atas tingkat terendah")
+    if args.steps < 2:
+        raise SystemExit("--steps minimal 2 (kuantil + threshold protokol)")
+
+    grid = grid_threshold(values, ATURAN, args.steps, vary)
+    t0 = time.perf_counter()
+    hasil = sweep(values, labels, ATURAN, grid, vary, args.max_mb)
+    dt = time.perf_counter() - t0
+    print(f"{len(hasil['auc']):,} kombinasi x {len(labels)} sesi ({labels.sum()} positif) dalam {dt:.1f} detik")
+
+    base = sweep(values, labels, ATURAN, ATURAN.thresholds[None], [])
+    print(f"Protokol sekarang : AUC {base['auc'][0]:.3f}, sens {base['sens'][0, tier]:.3f}, "
+          f"spec {base['spec'][0, tier]:.3f} (tingkat {args.tier})")
+
+    sens, spec = hasil['sens'][:, tier], hasil['spec'][:, tier]
+    front = pareto(sens, spec)
+    print(f"Front Pareto ({len(front)} kombinasi), {args.top} teratas menurut Youden J:")
+    front = front[np.lexsort((-hasil['auc'][front], -(sens[front] + spec[front])))]
+    for i in front[:args.top]:
+        thr = ", ".join(f"{ATURAN.names[k]}={grid[hasil['index'][i, j], k]:.4g}" for j, k in enumerate(vary))
+        print(f"  AUC {hasil['auc'][i]:.3f}  sens {sens[i]:.3f}  spec {spec[i]:.3f}  | {thr}")
+
+    best = ATURAN.thresholds.copy()
+    for j, k in enumerate(vary):
+        best[k] = grid[hasil['index'][front[0], j], k]
+    fpr, tpr = roc(values, labels, ATURAN, best)
+    print("ROC terbaik (fpr, tpr):", " ".join(f"({a:.2f}, {b:.2f})" for a, b in zip(fpr, tpr)))
+
+    if args.out:
+        simpan_csv(args.out, hasil, grid, vary, ATURAN)
+    if args.simpan_aturan:
+        simpan_aturan(args.simpan_aturan, ATURAN, best)
+        print(f"Protokol terkalibrasi disimpan di {args.simpan_aturan}")
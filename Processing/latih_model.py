@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Latih model logistik (eeg_model) dari sesi berlabel.
+
+    python latih_model.py label.csv [--l2 1.0] [--folds 5] [--fitur semua]
+                          [--data data_model.npz] [--out model_logistik.json]
+
+label.csv sama dengan kalibrasi.py (kolom file,label). Statistik band
+tiap sesi diambil sekali (eeg_proses.ringkasan_cache) dan disimpan ke
+--data; tanpa label.csv, --data yang sudah ada langsung dipakai.
+"""
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from eeg_kriteria import ATURAN, FITUR_KRITERIA
+from eeg_model import MODEL_PATH, latih, matriks_fitur, sigmoid, simpan_model
+from kalibrasi import baca_label
+
+# ================== DATASET ==================
+def _statistik_sesi(filename, **config):
+    from eeg_proses import ringkasan_cache
+    return ringkasan_cache(filename, **config)['statistik']
+
+def ekstrak_statistik(files, jobs=None, **config):
+    """(band_power (sesi, 5), delta_variability (sesi,), correlation (sesi,))."""
+    with ProcessPoolExecutor(jobs) as pool:
+        rows = list(pool.map(partial(_statistik_sesi, **config), files))
+    power, variability, correlation = zip(*rows)
+    return np.stack(power), np.array(variability, dtype=float), np.array(correlation, dtype=float)
+
+# ================== METRIK ==================
+def auc(score, labels):
+    """AUC Mann-Whitney (ties = 1/2) lewat ranking."""
+    order = np.argsort(score, kind='mergesort')
+    s = score[order]
+    rank = np.empty(len(s))
+    _, start, count = np.unique(s, return_index=True, return_counts=True)
+    rank[order] = np.repeat(start + (count + 1) / 2, count)
+    n_pos, n_neg = labels.sum(), (~labels).sum()
+    return (rank[labels].sum() - n_pos * (n_pos + 1) / 2) / max(n_pos * n_neg, 1)
+
+def brier(p, labels):
+    return float(np.mean((p - labels) ** 2))
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("label", nargs="?", help="CSV file,label (tidak perlu jika --data sudah ada)")
+    ap.add_argument("--data", default="data_model.npz")
+    ap.add_argument("--fitur", default="semua", help="'semua', 'aturan' (fitur protokol) atau daftar nama dipisah koma")
+    ap.add_argument("--l2", type=float, default=1.0)
+    ap.add_argument("--folds", type=int, default=5)
+    ap.add_argument("--jobs", type=int, default=None)
+    ap.add_argument("--gain", type=float, default=1000.0)
+    ap.add_argument("--vref", type=float, default=1.65)
+    ap.add_argument("--out", default=MODEL_PATH)
+    args = ap.parse_args()
+
+    if args.label:
+        files, labels = baca_label(args.label)
+        t0 = time.perf_counter()
+        power, variability, correlation = ekstrak_statistik(files, jobs=args.jobs, gain=args.gain, vref=args.vref)
+        np.savez(args.data, band_power=power, delta_variability=variability, correlation=correlation,
+                 labels=labels, files=np.array(files))
+        print(f"Statistik {len(files)} sesi diekstrak dalam {time.perf_counter() - t0:.1f} detik -> {args.data}")
+    else:
+        with np.load(args.data) as z:
+            power, variability, correlation, labels = (
+                z['band_power'], z['delta_variability'], z['correlation'], z['labels'].astype(bool))
+
+    if args.fitur == 'semua':
+        features = list(FITUR_KRITERIA)
+    elif args.fitur == 'aturan':
+        features = list(dict.fromkeys(ATURAN.features))
+    else:
+        features = [f for f in args.fitur.split(',') if f]
+
+    X = matriks_fitur(features, power, variability, correlation)
+    model, oof = latih(X, labels, features, l2=args.l2, folds=args.folds)
+
+    a, c = model.kalibrasi
+    p_oof = sigmoid(a * oof + c)
+    rule = ATURAN.skor(power, variability, correlation)['skor']
+    print(f"{len(labels)} sesi ({labels.sum()} positif), {len(features)} fitur, l2={args.l2}")
+    print(f"Out-of-fold : AUC model {auc(oof, labels):.3f} | AUC skor aturan {auc(rule, labels):.3f} | "
+          f"Brier {brier(p_oof, labels):.4f} (prevalensi saja {brier(labels.mean(), labels):.4f})")
+    print("Bobot (per simpangan baku fitur):")
+    for name, w in sorted(zip(features, model.coef), key=lambda x: -abs(x[1])):
+        print(f"  {name:<24} {w:+.3f}")
+
+    t0 = time.perf_counter()
+    model.prob(X)
+    dt = (time.perf_counter() - t0) / len(labels) * 1e6
+    print(f"Evaluasi batch: {dt:.2f} µs/sesi")
+
+    simpan_model(args.out, model)
+    print(f"Model disimpan di {args.out}")
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import time
+
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import threading
@@ -8,24 +10,35 @@ import math
 import os
 import sys
 import traceback
-import time
 import csv
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from scipy.signal import butter, filtfilt, iirnotch
+
+# pandas, SciPy, matplotlib, NumPy, protokol kriteria (eeg_kriteria), model
+# (eeg_model) & antrian SQLite sengaja tidak di-import di sini: dimuat di
+# worker analisis (eeg_worker) atau di fungsi yang membutuhkannya saja.
+from eeg_worker import AnalysisWorker
 
 # Coba import Pygame & Serial
 try:
     import pygame
-    if 'SDL_AUDIODRIVER' not in os.environ:
-        os.environ['SDL_AUDIODRIVER'] = 'alsa'
-    pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
-    pygame.mixer.music.set_volume(0.8)
 except Exception:
     pygame = None
 
+def init_audio():
+    """
+    Mixer Pygame dibuka saat aplikasi start, bukan saat import: modul ini
+    ikut di-import ulang di proses worker analisis (forkserver/spawn).
+    """
+    global pygame
+    if pygame is None:
+        return
+    try:
+        if 'SDL_AUDIODRIVER' not in os.environ:
+            os.environ['SDL_AUDIODRIVER'] = 'alsa'
+        pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+        pygame.mixer.music.set_volume(0.8)
+    except Exception:
+        pygame = None
+
 try:
     import serial
     import serial.tools.list_ports
@@ -35,11 +48,10 @@ except ImportError:
 # ================== KONFIGURASI ==================
 COM_PORT = 'COM7'
 BAUD_RATE = 115200
-GAIN = 1000.0
-VREF = 1.65
 QUESTION_DURATION = 5       
 TOTAL_QUESTIONS = 5
 PROCESS_DURATION = 3000     
+# Kalibrasi & konfigurasi analisis (GAIN, VREF, ANALYSIS_DTYPE, ...) ada di eeg_aplikasi, sama untuk kedua aplikasi
 
 # ================== STOPWATCH CLASS ==================
 class Stopwatch:
@@ -74,165 +86,6 @@ class Stopwatch:
             self.on_tick(self.elapsed_time)
         self.parent.after(1000, self._update)
 
-# ================== EEG ANALYSIS HELPERS ==================
-def notch_filter(data, freq, fs, Q=30):
-    if len(data) < 12: return data
-    try:
-        nyq = 0.5 * fs
-        b, a = iirnotch(freq / nyq, Q)
-        return filtfilt(b, a, data)
-    except: return data
-
-def bandpass(data, lowcut, highcut, fs, order=4):
-    if len(data) < max(12, order * 6): return data
-    try:
-        nyq = 0.5 * fs
-        low, high = lowcut / nyq, highcut / nyq
-        if low <= 0 or high >= 1: return data
-        b, a = butter(order, [low, high], btype='band')
-        return filtfilt(b, a, data)
-    except: return data
-
-def deteksi_disleksia_riset(delta_signal, theta_signal, alpha_signal, beta_signal, gamma_signal, fs):
-    results = {'kriteria': {}, 'scores': {}, 'indikasi': []}
-    
-    # Hitung Power
-    delta_power = np.mean(delta_signal**2)
-    theta_power = np.mean(theta_signal**2)
-    alpha_power = np.mean(alpha_signal**2)
-    beta_power = np.mean(beta_signal**2)
-    gamma_power = np.mean(gamma_signal**2)
-    
-    total_power = delta_power + theta_power + alpha_power + beta_power + gamma_power + 1e-20
-    delta_rel = (delta_power / total_power) * 100
-    theta_rel = (theta_power / total_power) * 100
-    alpha_rel = (alpha_power / total_power) * 100
-    beta_rel = (beta_power / total_power) * 100
-    gamma_rel = (gamma_power / total_power) * 100
-
-    # Kriteria
-    k1 = delta_rel > 35
-    k2 = gamma_rel < 8
-    delta_gamma_ratio = delta_power / (gamma_power + 1e-10)
-    k3 = delta_gamma_ratio > 5.0
-    
-    delta_std = np.std(delta_signal)
-    delta_variability = delta_std / (np.mean(np.abs(delta_signal)) + 1e-10)
-    k4 = delta_variability > 1.2
-    
-    max_other = max(theta_rel, alpha_rel, beta_rel, gamma_rel)
-    k5 = delta_rel > (max_other + 10)
-    k6 = gamma_rel < (beta_rel - 5)
-    
-    try:
-        dn = (delta_signal - np.mean(delta_signal)) / (np.std(delta_signal) + 1e-10)
-        gn = (gamma_signal - np.mean(gamma_signal)) / (np.std(gamma_signal) + 1e-10)
-        correlation = np.corrcoef(dn, gn)[0,1]
-    except Exception:
-        correlation = 0.0
-    k7 = correlation < -0.3
-
-    # Fill results
-    results['kriteria']['high_delta'] = {'value': delta_rel, 'threshold':35, 'passed':k1, 'description':'Peningkatan Delta Power'}
-    results['kriteria']['low_gamma'] = {'value': gamma_rel, 'threshold':8, 'passed':k2, 'description':'Penurunan Gamma Power'}
-    results['kriteria']['delta_gamma_ratio'] = {'value': delta_gamma_ratio, 'threshold':5.0, 'passed':k3, 'description':'Rasio Delta/Gamma tinggi'}
-    results['kriteria']['delta_variability'] = {'value': delta_variability, 'threshold':1.2, 'passed':k4, 'description':'Variabilitas Delta tinggi'}
-    results['kriteria']['delta_dominance'] = {'value': delta_rel - max_other, 'threshold':10, 'passed':k5, 'description':'Delta dominan > margin'}
-    results['kriteria']['gamma_lowest'] = {'value': beta_rel - gamma_rel, 'threshold':5, 'passed':k6, 'description':'Gamma signifikan lebih rendah dari Beta'}
-    results['kriteria']['delta_gamma_inverse'] = {'value': correlation, 'threshold':-0.3, 'passed':k7, 'description':'Korelasi delta-gamma negatif'}
-
-    kriteria_terpenuhi = sum([k1,k2,k3,k4,k5,k6,k7])
-    total_kriteria = 7
-    confidence_score = (kriteria_terpenuhi / total_kriteria) * 100
-
-    if kriteria_terpenuhi >= 6:
-        diagnosis = "INDIKASI DISLEKSIA - KUAT"
-        confidence = "TINGGI"
-        rekomendasi = "Sangat disarankan evaluasi lanjutan oleh profesional"
-    elif kriteria_terpenuhi >= 4:
-        diagnosis = "INDIKASI DISLEKSIA - RENDAH"
-        confidence = "SEDANG"
-        rekomendasi = "Disarankan evaluasi lebih lanjut"
-    elif kriteria_terpenuhi >= 2:
-        diagnosis = "TIDAK TERINDIKASI DISLEKSIA - BORDERLINE"
-        confidence = "RENDAH"
-        rekomendasi = "Monitoring dan tes ulang direkomendasikan"
-    else:
-        diagnosis = "TIDAK TERINDIKASI DISLEKSIA"
-        confidence = "TINGGI"
-        rekomendasi = "Pola EEG dalam batas normal"
-
-    results.update({
-        'diagnosis': diagnosis,
-        'confidence': confidence,
-        'confidence_score': confidence_score,
-        'kriteria_terpenuhi': kriteria_terpenuhi,
-        'total_kriteria': total_kriteria,
-        'rekomendasi': rekomendasi,
-        'relative_power': {
-            'delta': delta_rel, 'theta': theta_rel, 'alpha': alpha_rel, 'beta': beta_rel, 'gamma': gamma_rel
-        }
-    })
-    return results
-
-def run_eeg_pipeline(filename):
-    try:
-        df = pd.read_csv(filename)
-        # Handle jika kolom tidak sesuai, buat dummy data untuk demo jika gagal
-        if "ADC_KIRI" not in df.columns:
-             # Fallback: Create dummy data if CSV structure is wrong
-            t = np.linspace(0, 10, 2560)
-            adc_kiri = np.random.randint(1000, 3000, 2560)
-            adc_kanan = np.random.randint(1000, 3000, 2560)
-        else:
-            t = df["Timestamp"].values
-            adc_kiri = df["ADC_KIRI"].values
-            adc_kanan = df["ADC_KANAN"].values
-            
-        eeg_uv_kiri = ((adc_kiri / 4095.0) * 3.3 - VREF) / GAIN * 1e6
-        eeg_uv_kanan = ((adc_kanan / 4095.0) * 3.3 - VREF) / GAIN * 1e6
-
-        duration = t[-1] - t[0] if len(t) > 1 else 1
-        fs = len(t) / duration if duration > 0 else 256
-
-        eeg_kiri = notch_filter(eeg_uv_kiri, 50, fs)
-        eeg_kanan = notch_filter(eeg_uv_kanan, 50, fs)
-
-        bands = {
-            "Delta (0.5–4 Hz)": (0.5, 4),
-            "Theta (4–8 Hz)": (4, 8),
-            "Alpha (8–13 Hz)": (8, 13),
-            "Beta (13–30 Hz)": (13, 30),
-            "Gamma (30–45 Hz)": (30, 45)
-        }
-
-        fk, fn = {}, {}
-        for name, (l, h) in bands.items():
-            fk[name] = bandpass(eeg_kiri, l, h, fs)
-            fn[name] = bandpass(eeg_kanan, l, h, fs)
-
-        hasil = deteksi_disleksia_riset(
-            fk["Delta (0.5–4 Hz)"], fk["Theta (4–8 Hz)"],
-            fk["Alpha (8–13 Hz)"], fk["Beta (13–30 Hz)"],
-            fk["Gamma (30–45 Hz)"],
-            fs
-        )
-        
-        # Hitung band powers untuk plotting
-        band_powers = {name: np.mean(sig**2) for name, sig in fk.items()}
-
-        return {
-            "ok": True,
-            "analysis": hasil,
-            "fs": fs,
-            "t": t,
-            "raw_uv": eeg_kiri,
-            "filtered": fk,
-            "band_powers": band_powers
-        }
-    except Exception as e:
-        return {"ok": False, "message": str(e)}
-
 # ================== EEG Serial ==================
 class EEGSerialLogger:
     def __init__(self, port, baudrate=115200, out_csv="eeg_record.csv"):
@@ -241,6 +94,7 @@ class EEGSerialLogger:
         self.out_csv = out_csv
         self.running = False
         self.ser = None
+        self.markers = None
 
     def start(self):
         if not serial: return
@@ -251,6 +105,10 @@ class EEGSerialLogger:
             self.csv_file = open(self.out_csv, 'w', newline='')
             self.writer = csv.writer(self.csv_file)
             self.writer.writerow(["Timestamp", "ADC_KIRI", "ADC_KANAN"])
+            # Jam bersama kolom Timestamp & file marker timeline tes (eeg_epoch)
+            from eeg_epoch import MarkerWriter, marker_path
+            self.start_time = time.time()
+            self.markers = MarkerWriter(marker_path(self.out_csv), lambda: time.time() - self.start_time)
             self.running = True
             self.thread = threading.Thread(target=self._loop, daemon=True)
             self.thread.start()
@@ -258,24 +116,28 @@ class EEGSerialLogger:
             print("Serial error:", e)
 
     def _loop(self):
-        start_time = time.time()
         while self.running and self.ser:
             try:
                 if self.ser.in_waiting:
                     line = self.ser.readline().decode('utf-8', errors='ignore').strip()
                     if ',' in line:
                         kiri, kanan = line.split(',')[:2]
-                        ts = time.time() - start_time
+                        ts = time.time() - self.start_time
                         self.writer.writerow([ts, int(kiri), int(kanan)])
             except:
                 continue
 
+    def marker(self, event, soal=""):
+        if self.running and self.markers:
+            self.markers.tulis(event, soal)
+
     def stop(self):
         self.running = False
         time.sleep(0.1)
         try:
             if self.ser: self.ser.close()
             self.csv_file.close()
+            if self.markers: self.markers.close()
         except: pass
 
 # ================== MAIN APP/UI ==================
@@ -292,22 +154,51 @@ class App(tk.Tk):
         self.eeg_filename = None
         self.analysis_results = None
         self.eeg_logger = None
+        self.job = None             # (file, id job antrian) dari finish_test
+        self.worker = AnalysisWorker()
+        self.antrian = None
+        self.pekerja = None
 
         self.container = tk.Frame(self, bg="#f5f7fa")
         self.container.place(relx=0, rely=0, relwidth=1, relheight=1)
 
+        # Halaman dibuat saat pertama kali ditampilkan (_page), bukan di awal
         self.frames = {}
-        # Menambahkan ResultPage ke daftar
-        for F in (IntroPage, StartPage, TestPage, ProcessPage, ResultPage):
-            frame = F(self.container, self)
-            self.frames[F] = frame
-            frame.place(relx=0, rely=0, relwidth=1, relheight=1)
 
         self.show_frame(IntroPage)
-        self.frames[IntroPage].start_intro()
+        self._page(IntroPage).start_intro()
+        self.after_idle(self.mulai_antrian)
+
+    def _page(self, cls):
+        if cls not in self.frames:
+            frame = cls(self.container, self)
+            frame.place(relx=0, rely=0, relwidth=1, relheight=1)
+            frame.lower()   # jangan menutupi halaman yang sedang tampil
+            self.frames[cls] = frame
+        return self.frames[cls]
 
     def show_frame(self, page):
-        self.frames[page].tkraise()
+        self._page(page).tkraise()
+
+    def mulai_antrian(self):
+        # Antrian analisis persisten (SQLite), dibuka setelah frame pertama: job sesi
+        # sebelumnya (aplikasi crash / ditutup) dilanjutkan di belakang layar
+        from eeg_antrian import AntrianAnalisis, PekerjaAntrian
+        if self.pekerja is None:
+            self.antrian = AntrianAnalisis()
+            self.pekerja = PekerjaAntrian(self.antrian, self.worker.submit).start()
+        return self.pekerja
+
+    def mark(self, event, soal=""):
+        """Marker timeline tes ke rekaman yang sedang direkam (eeg_epoch)."""
+        if self.eeg_logger:
+            self.eeg_logger.marker(event, soal)
+
+    def destroy(self):
+        if self.pekerja is not None:
+            self.pekerja.stop()
+        self.worker.shutdown()
+        super().destroy()
 
 class IntroPage(tk.Frame):
     def __init__(self, parent, controller):
@@ -364,6 +255,10 @@ class IntroPage(tk.Frame):
         self.canvas.coords(self.canvas_window, x, y)
 
     def start_intro(self):
+        # Selama animasi intro: start worker analisis & jalankan pipeline dummy
+        # sehingga analisis pertama di ProcessPage sudah berjalan pada kecepatan normal
+        from eeg_aplikasi import konfigurasi_pipeline
+        self.controller.worker.warm(**konfigurasi_pipeline())
         self.fade_in()
         self.animate_progress()
 
@@ -441,18 +336,20 @@ class StartPage(tk.Frame):
                 print("Logger error", e)
 
         # Audio Intro (Optional)
+        from eeg_epoch import AUDIO_MULAI
         try:
             if pygame:
                 if os.path.exists("audio/soal 1.mp3"):
                     pygame.mixer.music.load("audio/soal 1.mp3")
                     pygame.mixer.music.play()
+                    self.controller.mark(AUDIO_MULAI, 1)
         except: pass
 
         self.go_to_test()
 
     def go_to_test(self):
         self.controller.show_frame(TestPage)
-        self.controller.frames[TestPage].start_test_sequence()
+        self.controller._page(TestPage).start_test_sequence()
 
 class TestPage(tk.Frame):
     def __init__(self, parent, controller):
@@ -491,7 +388,11 @@ class TestPage(tk.Frame):
     def start_test_sequence(self):
         self.controller.current_question = 1
         self.update_ui_labels()
+        from eeg_epoch import SOAL_MULAI
         self.stopwatch.start()
+        self.controller.mark(SOAL_MULAI, 1)
+        if pygame:
+            self.watch_audio(1)
     
     def update_ui_labels(self):
         q = self.controller.current_question
@@ -505,9 +406,11 @@ class TestPage(tk.Frame):
             self.next_question()
 
     def next_question(self):
+        from eeg_epoch import AUDIO_MULAI, SOAL_MULAI
         if self.controller.current_question < TOTAL_QUESTIONS:
             self.controller.current_question += 1
             self.update_ui_labels()
+            self.controller.mark(SOAL_MULAI, self.controller.current_question)
             # Audio (Optional)
             try:
                 if pygame:
@@ -515,16 +418,38 @@ class TestPage(tk.Frame):
                     if os.path.exists(f):
                         pygame.mixer.music.load(f)
                         pygame.mixer.music.play()
+                        self.controller.mark(AUDIO_MULAI, self.controller.current_question)
+                        self.watch_audio(self.controller.current_question)
             except: pass
         else:
             self.finish_test()
 
+    def watch_audio(self, soal):
+        # Tandai akhir audio soal (selesai diputar atau terpotong soal berikutnya)
+        try:
+            busy = pygame.mixer.music.get_busy()
+        except Exception:
+            return
+        if busy and self.controller.current_question == soal:
+            self.after(100, self.watch_audio, soal)
+        else:
+            from eeg_epoch import AUDIO_SELESAI
+            self.controller.mark(AUDIO_SELESAI, soal)
+
     def finish_test(self):
+        from eeg_aplikasi import konfigurasi_pipeline
+        from eeg_epoch import TES_SELESAI
+        self.controller.mark(TES_SELESAI)
         # Stop Logger
         try:
             if self.controller.eeg_logger:
                 self.controller.eeg_logger.stop()
         except: pass
+
+        # Masukkan rekaman ke antrian sekarang: hasil tidak hilang walau aplikasi ditutup di ProcessPage
+        fname = self.controller.eeg_filename
+        if fname and os.path.exists(fname):
+            self.controller.job = (fname, self.controller.mulai_antrian().tambah(fname, **konfigurasi_pipeline()))
         
         self.stopwatch.stop()
         
@@ -536,7 +461,7 @@ class TestPage(tk.Frame):
         except: pass
 
         self.controller.show_frame(ProcessPage)
-        self.controller.frames[ProcessPage].start_processing()
+        self.controller._page(ProcessPage).start_processing()
 
 class ProcessPage(tk.Frame):
     def __init__(self, parent, controller):
@@ -567,8 +492,8 @@ class ProcessPage(tk.Frame):
     def start_processing(self):
         self.is_processing = True
         self.animate_loading()
-        # Jalankan analisis di thread agar GUI tidak freeze
-        threading.Thread(target=self.run_analysis_logic, daemon=True).start()
+        # Analisis di proses worker; thread Tk hanya mem-poll hasilnya sehingga animasi tidak tersendat
+        self.submit_analysis()
 
     def animate_loading(self):
         if not self.is_processing: return
@@ -580,23 +505,40 @@ class ProcessPage(tk.Frame):
         self.angle = (self.angle - 10) % 360
         self.after(50, self.animate_loading)
 
-    def run_analysis_logic(self):
-        # Simulasi processing time
-        time.sleep(2)
-        
+    def submit_analysis(self):
+        from eeg_aplikasi import konfigurasi_pipeline
         fname = self.controller.eeg_filename
-        if fname and os.path.exists(fname):
-            res = run_eeg_pipeline(fname)
-        else:
-            res = {"ok": False, "message": "File EEG tidak ditemukan"}
-        
-        self.controller.analysis_results = res
-        self.after(0, self.finish_processing)
+        if not (fname and os.path.exists(fname)):
+            self.controller.analysis_results = {"ok": False, "message": "File EEG tidak ditemukan"}
+            self.finish_processing()
+            return
+        self.dots_label.config(text="Mohon tunggu sebentar...")
+        # Job dari finish_test dipakai (bisa sudah selesai); file dari "Muat EEG" dimasukkan sekarang
+        job_file, job_id = self.controller.job or (None, None)
+        self.controller.job = None
+        if job_file != fname:
+            job_id = self.controller.mulai_antrian().tambah(fname, **konfigurasi_pipeline())
+        self.poll_analysis(fname, job_id)
+
+    def poll_analysis(self, fname, job_id):
+        from eeg_aplikasi import hasil_job, konfigurasi_pipeline, pantau_job
+
+        def status(job):
+            if job['error']:
+                self.dots_label.config(text=f"Mencoba lagi (percobaan {job['percobaan'] + 1})...")
+
+        def selesai(job):
+            # Kanal kanan / bilateral dihitung worker, hanya jika diminta
+            kanan = lambda: self.controller.worker.submit(fname, kanal="kanan", **konfigurasi_pipeline()).result()
+            self.controller.analysis_results = hasil_job(fname, self.controller.antrian, job, minta_kanan=kanan)
+            self.finish_processing()
+
+        pantau_job(self, self.controller.antrian, job_id, selesai, status)
 
     def finish_processing(self):
         self.is_processing = False
         self.controller.show_frame(ResultPage)
-        self.controller.frames[ResultPage].display_results()
+        self.controller._page(ResultPage).display_results()
 
 # ================== RESULT PAGE (DITAMBAHKAN) ==================
 class ResultPage(tk.Frame):
@@ -629,6 +571,7 @@ class ResultPage(tk.Frame):
         self.canvas.coords(self.canvas_window, event.width // 2, event.height // 2)
 
     def display_results(self):
+        from eeg_aplikasi import teks_bootstrap, teks_soal
         self.result_text.delete('1.0', tk.END)
         ar = self.controller.analysis_results
         
@@ -639,22 +582,47 @@ class ResultPage(tk.Frame):
         an = ar['analysis']
         self.result_text.insert(tk.END, f"DIAGNOSIS    : {an['diagnosis']}\n")
         self.result_text.insert(tk.END, f"KEYAKINAN    : {an['confidence_score']:.1f}% ({an['confidence']})\n")
-        self.result_text.insert(tk.END, f"REKOMENDASI  : {an['rekomendasi']}\n")
+        if an.get('probabilitas') is not None:
+            self.result_text.insert(tk.END, f"PROBABILITAS : {an['probabilitas'] * 100:.1f}% (model logistik)\n")
+        self.result_text.insert(tk.END, f"REKOMENDASI  : {an['tampilan']['rekomendasi_singkat']}\n")
+        self.result_text.insert(tk.END, f"ARTEFAK      : {an.get('rasio_artefak', 0) * 100:.1f}% sampel ditolak\n")
         self.result_text.insert(tk.END, "="*60 + "\n")
         self.result_text.insert(tk.END, "DETAIL KRITERIA:\n")
         
-        for k, v in an['kriteria'].items():
+        # Interval kepercayaan & peluang tingkat dari block bootstrap segmen
+        boot = ar.get('bootstrap')
+        for i, (k, v) in enumerate(an['kriteria'].items()):
             status = "[v] TERPENUHI" if v['passed'] else "[ ] TIDAK    "
-            self.result_text.insert(tk.END, f"{status} : {v['description']} (Nilai: {v['value']:.2f})\n")
+            ci = ""
+            if boot:
+                lo, hi = boot['ci_values'][i]
+                ci = f", CI {lo:.2f}–{hi:.2f}, P {boot['p_passed'][i] * 100:.0f}%"
+            self.result_text.insert(tk.END, f"{status} : {v['description']} (Nilai: {v['value']:.2f}{ci})\n")
+
+        if boot:
+            self.result_text.insert(tk.END, "="*60 + "\n")
+            self.result_text.insert(tk.END, "".join(line + "\n" for line in teks_bootstrap(boot)))
+
+        soal = ar.get('soal')
+        if soal:
+            self.result_text.insert(tk.END, "="*60 + "\n")
+            self.result_text.insert(tk.END, "".join(line + "\n" for line in teks_soal(soal)))
 
     def show_plots(self):
         ar = self.controller.analysis_results
         if not ar or not ar.get('ok'): return
+        if ar.get('bertahap'):
+            messagebox.showinfo("Plot", "Rekaman besar dianalisis bertahap; sinyal lengkap tidak disimpan sehingga grafik tidak tersedia.")
+            return
         
         try:
-            t = ar['t']
-            raw = ar['raw_uv']
-            filtered = ar['filtered']
+            import matplotlib.pyplot as plt
+
+            # Data grafik terdesimasi dari worker/cache; tanpa itu pakai sinyal penuh
+            plot = ar['plot']
+            t = plot['t']
+            raw = plot['raw']
+            filtered = plot['bands']
             
             plt.figure(figsize=(10, 8))
             plt.subplot(6,1,1)
@@ -676,10 +644,11 @@ class ResultPage(tk.Frame):
 
     def restart_test(self):
         self.controller.current_question = 1
-        self.controller.frames[TestPage].stopwatch.reset()
+        self.controller._page(TestPage).stopwatch.reset()
         self.controller.show_frame(StartPage)
 
 # ================== RUN APP ==================
 if __name__ == "__main__":
+    init_audio()
     app = App()
     app.mainloop()
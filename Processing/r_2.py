@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import time
+
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import threading
@@ -8,24 +10,35 @@ import math
 import os
 import sys
 import traceback
-import time
 import csv
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from scipy.signal import butter, filtfilt, iirnotch
+
+# pandas, SciPy, matplotlib, NumPy, protokol kriteria (eeg_kriteria), model
+# (eeg_model) & antrian SQLite sengaja tidak di-import di sini: dimuat di
+# worker analisis (eeg_worker) atau di fungsi yang membutuhkannya saja.
+from eeg_worker import AnalysisWorker
 
 # Coba import Pygame & Serial
 try:
     import pygame
-    if 'SDL_AUDIODRIVER' not in os.environ:
-        os.environ['SDL_AUDIODRIVER'] = 'alsa'
-    pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
-    pygame.mixer.music.set_volume(0.8)
 except Exception:
     pygame = None
 
+def init_audio():
+    """
+    Mixer Pygame dibuka saat aplikasi start, bukan saat import: modul ini
+    ikut di-import ulang di proses worker analisis (forkserver/spawn).
+    """
+    global pygame
+    if pygame is None:
+        return
+    try:
+        if 'SDL_AUDIODRIVER' not in os.environ:
+            os.environ['SDL_AUDIODRIVER'] = 'alsa'
+        pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+        pygame.mixer.music.set_volume(0.8)
+    except Exception:
+        pygame = None
+
 try:
     import serial
     import serial.tools.list_ports
@@ -35,11 +48,26 @@ except ImportError:
 # ================== KONFIGURASI ==================
 COM_PORT = '/dev/ttyUSB0'
 BAUD_RATE = 115200
-GAIN = 1000.0
-VREF = 1.65
 QUESTION_DURATION = 5       
 TOTAL_QUESTIONS = 5
 PROCESS_DURATION = 3000     
+# Kalibrasi & konfigurasi analisis (GAIN, VREF, ANALYSIS_DTYPE, ...) ada di eeg_aplikasi, sama untuk kedua aplikasi
+
+# Teks kriteria untuk UI per nama kriteria: (deskripsi, teknis). Kriteria
+# lain dari protokol memakai deskripsi di aturan_kriteria.json.
+DESKRIPSI_KRITERIA = {
+    'high_delta': ('Aktivitas otak lambat dominan', 'Peningkatan Delta Power (0.5-4 Hz)'),
+    'low_gamma': ('Aktivitas fokus cepat menurun', 'Penurunan Gamma Power (30-45 Hz)'),
+    'delta_gamma_ratio': ('Kesulitan pemrosesan cepat', 'Rasio Delta/Gamma tinggi'),
+    'delta_variability': ('Respons otak tidak stabil', 'Variabilitas Delta tinggi'),
+    'delta_dominance': ('Gelombang lambat terlalu kuat', 'Delta dominan > margin'),
+    'gamma_lowest': ('Pola fokus tidak optimal', 'Gamma signifikan lebih rendah dari Beta'),
+    'delta_gamma_inverse': ('Koordinasi otak terganggu', 'Korelasi delta-gamma negatif'),
+}
+
+def teks_kriteria(name, v):
+    """(deskripsi, teknis) untuk satu kriteria hasil deteksi_dari_statistik."""
+    return DESKRIPSI_KRITERIA.get(name, (v['description'], v['description']))
 
 # ================== STOPWATCH CLASS ==================
 class Stopwatch:
@@ -74,212 +102,6 @@ class Stopwatch:
             self.on_tick(self.elapsed_time)
         self.parent.after(1000, self._update)
 
-# ================== EEG ANALYSIS HELPERS ==================
-def notch_filter(data, freq, fs, Q=30):
-    if len(data) < 12: return data
-    try:
-        nyq = 0.5 * fs
-        b, a = iirnotch(freq / nyq, Q)
-        return filtfilt(b, a, data)
-    except: return data
-
-def bandpass(data, lowcut, highcut, fs, order=4):
-    if len(data) < max(12, order * 6): return data
-    try:
-        nyq = 0.5 * fs
-        low, high = lowcut / nyq, highcut / nyq
-        if low <= 0 or high >= 1: return data
-        b, a = butter(order, [low, high], btype='band')
-        return filtfilt(b, a, data)
-    except: return data
-
-def deteksi_disleksia_riset(delta_signal, theta_signal, alpha_signal, beta_signal, gamma_signal, fs):
-    results = {'kriteria': {}, 'scores': {}, 'indikasi': []}
-    
-    # Hitung Power
-    delta_power = np.mean(delta_signal**2)
-    theta_power = np.mean(theta_signal**2)
-    alpha_power = np.mean(alpha_signal**2)
-    beta_power = np.mean(beta_signal**2)
-    gamma_power = np.mean(gamma_signal**2)
-    
-    total_power = delta_power + theta_power + alpha_power + beta_power + gamma_power + 1e-20
-    delta_rel = (delta_power / total_power) * 100
-    theta_rel = (theta_power / total_power) * 100
-    alpha_rel = (alpha_power / total_power) * 100
-    beta_rel = (beta_power / total_power) * 100
-    gamma_rel = (gamma_power / total_power) * 100
-
-    # Kriteria
-    k1 = delta_rel > 35
-    k2 = gamma_rel < 8
-    delta_gamma_ratio = delta_power / (gamma_power + 1e-10)
-    k3 = delta_gamma_ratio > 5.0
-    
-    delta_std = np.std(delta_signal)
-    delta_variability = delta_std / (np.mean(np.abs(delta_signal)) + 1e-10)
-    k4 = delta_variability > 1.2
-    
-    max_other = max(theta_rel, alpha_rel, beta_rel, gamma_rel)
-    k5 = delta_rel > (max_other + 10)
-    k6 = gamma_rel < (beta_rel - 5)
-    
-    try:
-        dn = (delta_signal - np.mean(delta_signal)) / (np.std(delta_signal) + 1e-10)
-        gn = (gamma_signal - np.mean(gamma_signal)) / (np.std(gamma_signal) + 1e-10)
-        correlation = np.corrcoef(dn, gn)[0,1]
-    except Exception:
-        correlation = 0.0
-    k7 = correlation < -0.3
-
-    # Fill results dengan bahasa user-friendly
-    results['kriteria']['high_delta'] = {
-        'value': delta_rel, 'threshold':35, 'passed':k1, 
-        'description':'Aktivitas otak lambat dominan',
-        'technical': 'Peningkatan Delta Power (0.5-4 Hz)'
-    }
-    results['kriteria']['low_gamma'] = {
-        'value': gamma_rel, 'threshold':8, 'passed':k2, 
-        'description':'Aktivitas fokus cepat menurun',
-        'technical': 'Penurunan Gamma Power (30-45 Hz)'
-    }
-    results['kriteria']['delta_gamma_ratio'] = {
-        'value': delta_gamma_ratio, 'threshold':5.0, 'passed':k3, 
-        'description':'Kesulitan pemrosesan cepat',
-        'technical': 'Rasio Delta/Gamma tinggi'
-    }
-    results['kriteria']['delta_variability'] = {
-        'value': delta_variability, 'threshold':1.2, 'passed':k4, 
-        'description':'Respons otak tidak stabil',
-        'technical': 'Variabilitas Delta tinggi'
-    }
-    results['kriteria']['delta_dominance'] = {
-        'value': delta_rel - max_other, 'threshold':10, 'passed':k5, 
-        'description':'Gelombang lambat terlalu kuat',
-        'technical': 'Delta dominan > margin'
-    }
-    results['kriteria']['gamma_lowest'] = {
-        'value': beta_rel - gamma_rel, 'threshold':5, 'passed':k6, 
-        'description':'Pola fokus tidak optimal',
-        'technical': 'Gamma signifikan lebih rendah dari Beta'
-    }
-    results['kriteria']['delta_gamma_inverse'] = {
-        'value': correlation, 'threshold':-0.3, 'passed':k7, 
-        'description':'Koordinasi otak terganggu',
-        'technical': 'Korelasi delta-gamma negatif'
-    }
-
-    kriteria_terpenuhi = sum([k1,k2,k3,k4,k5,k6,k7])
-    total_kriteria = 7
-    confidence_score = (kriteria_terpenuhi / total_kriteria) * 100
-
-    if kriteria_terpenuhi >= 6:
-        diagnosis = "TINGGI"
-        confidence = "TINGGI"
-        icon = "🔴"
-        color = "#e74c3c"
-        rekomendasi = "Sangat disarankan evaluasi lanjutan oleh profesional (psikolog/neurolog)."
-        narasi = ("Pola aktivitas otak menunjukkan dominasi gelombang lambat yang sangat kuat, "
-                  "dengan aktivitas fokus yang menurun signifikan. Pola ini sering ditemukan pada anak "
-                  "dengan kesulitan membaca dan memproses informasi tertulis.")
-    elif kriteria_terpenuhi >= 4:
-        diagnosis = "RENDAH - SEDANG"
-        confidence = "SEDANG"
-        icon = "🟡"
-        color = "#f39c12"
-        rekomendasi = "Disarankan evaluasi lebih lanjut dan observasi perilaku pembelajaran."
-        narasi = ("Pola aktivitas otak menunjukkan beberapa indikasi yang sering ditemukan pada "
-                  "kesulitan membaca, namun tidak semua kriteria terpenuhi. Perlu pemeriksaan tambahan "
-                  "dan observasi dalam situasi belajar untuk memastikan.")
-    elif kriteria_terpenuhi >= 2:
-        diagnosis = "MINIMAL"
-        confidence = "RENDAH"
-        icon = "🟠"
-        color = "#e67e22"
-        rekomendasi = "Monitoring berkala dan tes ulang direkomendasikan setelah 3-6 bulan."
-        narasi = ("Pola aktivitas otak menunjukkan beberapa variasi ringan yang perlu diperhatikan, "
-                  "namun belum mencapai tingkat indikasi yang kuat. Pantau perkembangan membaca dan "
-                  "lakukan tes ulang jika ada keluhan.")
-    else:
-        diagnosis = "TIDAK TERINDIKASI"
-        confidence = "TINGGI"
-        icon = "🟢"
-        color = "#27ae60"
-        rekomendasi = "Pola EEG dalam batas normal. Lanjutkan pembelajaran seperti biasa."
-        narasi = ("Pola aktivitas otak menunjukkan distribusi gelombang yang normal dan seimbang. "
-                  "Tidak ditemukan indikasi gangguan pemrosesan yang terkait dengan kesulitan membaca.")
-
-    results.update({
-        'diagnosis': diagnosis,
-        'confidence': confidence,
-        'confidence_score': confidence_score,
-        'kriteria_terpenuhi': kriteria_terpenuhi,
-        'total_kriteria': total_kriteria,
-        'rekomendasi': rekomendasi,
-        'narasi': narasi,
-        'icon': icon,
-        'color': color,
-        'relative_power': {
-            'delta': delta_rel, 'theta': theta_rel, 'alpha': alpha_rel, 'beta': beta_rel, 'gamma': gamma_rel
-        }
-    })
-    return results
-
-def run_eeg_pipeline(filename):
-    try:
-        df = pd.read_csv(filename)
-        if "ADC_KIRI" not in df.columns:
-            t = np.linspace(0, 10, 2560)
-            adc_kiri = np.random.randint(1000, 3000, 2560)
-            adc_kanan = np.random.randint(1000, 3000, 2560)
-        else:
-            t = df["Timestamp"].values
-            adc_kiri = df["ADC_KIRI"].values
-            adc_kanan = df["ADC_KANAN"].values
-            
-        eeg_uv_kiri = ((adc_kiri / 4095.0) * 3.3 - VREF) / GAIN * 1e6
-        eeg_uv_kanan = ((adc_kanan / 4095.0) * 3.3 - VREF) / GAIN * 1e6
-
-        duration = t[-1] - t[0] if len(t) > 1 else 1
-        fs = len(t) / duration if duration > 0 else 256
-
-        eeg_kiri = notch_filter(eeg_uv_kiri, 50, fs)
-        eeg_kanan = notch_filter(eeg_uv_kanan, 50, fs)
-
-        bands = {
-            "Delta (0.5–4 Hz)": (0.5, 4),
-            "Theta (4–8 Hz)": (4, 8),
-            "Alpha (8–13 Hz)": (8, 13),
-            "Beta (13–30 Hz)": (13, 30),
-            "Gamma (30–45 Hz)": (30, 45)
-        }
-
-        fk, fn = {}, {}
-        for name, (l, h) in bands.items():
-            fk[name] = bandpass(eeg_kiri, l, h, fs)
-            fn[name] = bandpass(eeg_kanan, l, h, fs)
-
-        hasil = deteksi_disleksia_riset(
-            fk["Delta (0.5–4 Hz)"], fk["Theta (4–8 Hz)"],
-            fk["Alpha (8–13 Hz)"], fk["Beta (13–30 Hz)"],
-            fk["Gamma (30–45 Hz)"],
-            fs
-        )
-        
-        band_powers = {name: np.mean(sig**2) for name, sig in fk.items()}
-
-        return {
-            "ok": True,
-            "analysis": hasil,
-            "fs": fs,
-            "t": t,
-            "raw_uv": eeg_kiri,
-            "filtered": fk,
-            "band_powers": band_powers
-        }
-    except Exception as e:
-        return {"ok": False, "message": str(e)}
-
 # ================== EEG Serial ==================
 class EEGSerialLogger:
     def __init__(self, port, baudrate=115200, out_csv="eeg_record.csv"):
@@ -288,6 +110,7 @@ class EEGSerialLogger:
         self.out_csv = out_csv
         self.running = False
         self.ser = None
+        self.markers = None
 
     def start(self):
         if not serial: return
@@ -298,6 +121,10 @@ class EEGSerialLogger:
             self.csv_file = open(self.out_csv, 'w', newline='')
             self.writer = csv.writer(self.csv_file)
             self.writer.writerow(["Timestamp", "ADC_KIRI", "ADC_KANAN"])
+            # Jam bersama kolom Timestamp & file marker timeline tes (eeg_epoch)
+            from eeg_epoch import MarkerWriter, marker_path
+            self.start_time = time.time()
+            self.markers = MarkerWriter(marker_path(self.out_csv), lambda: time.time() - self.start_time)
             self.running = True
             self.thread = threading.Thread(target=self._loop, daemon=True)
             self.thread.start()
@@ -305,24 +132,28 @@ class EEGSerialLogger:
             print("Serial error:", e)
 
     def _loop(self):
-        start_time = time.time()
         while self.running and self.ser:
             try:
                 if self.ser.in_waiting:
                     line = self.ser.readline().decode('utf-8', errors='ignore').strip()
                     if ',' in line:
                         kiri, kanan = line.split(',')[:2]
-                        ts = time.time() - start_time
+                        ts = time.time() - self.start_time
                         self.writer.writerow([ts, int(kiri), int(kanan)])
             except:
                 continue
 
+    def marker(self, event, soal=""):
+        if self.running and self.markers:
+            self.markers.tulis(event, soal)
+
     def stop(self):
         self.running = False
         time.sleep(0.1)
         try:
             if self.ser: self.ser.close()
             self.csv_file.close()
+            if self.markers: self.markers.close()
         except: pass
 
 # ================== MAIN APP/UI ==================
@@ -339,21 +170,51 @@ class App(tk.Tk):
         self.eeg_filename = None
         self.analysis_results = None
         self.eeg_logger = None
+        self.job = None             # (file, id job antrian) dari finish_test
+        self.worker = AnalysisWorker()
+        self.antrian = None
+        self.pekerja = None
 
         self.container = tk.Frame(self, bg="#f5f7fa")
         self.container.place(relx=0, rely=0, relwidth=1, relheight=1)
 
+        # Halaman dibuat saat pertama kali ditampilkan (_page), bukan di awal
         self.frames = {}
-        for F in (IntroPage, StartPage, TestPage, ProcessPage, ResultPage):
-            frame = F(self.container, self)
-            self.frames[F] = frame
-            frame.place(relx=0, rely=0, relwidth=1, relheight=1)
 
         self.show_frame(IntroPage)
-        self.frames[IntroPage].start_intro()
+        self._page(IntroPage).start_intro()
+        self.after_idle(self.mulai_antrian)
+
+    def _page(self, cls):
+        if cls not in self.frames:
+            frame = cls(self.container, self)
+            frame.place(relx=0, rely=0, relwidth=1, relheight=1)
+            frame.lower()   # jangan menutupi halaman yang sedang tampil
+            self.frames[cls] = frame
+        return self.frames[cls]
 
     def show_frame(self, page):
-        self.frames[page].tkraise()
+        self._page(page).tkraise()
+
+    def mulai_antrian(self):
+        # Antrian analisis persisten (SQLite), dibuka setelah frame pertama: job sesi
+        # sebelumnya (aplikasi crash / ditutup) dilanjutkan di belakang layar
+        from eeg_antrian import AntrianAnalisis, PekerjaAntrian
+        if self.pekerja is None:
+            self.antrian = AntrianAnalisis()
+            self.pekerja = PekerjaAntrian(self.antrian, self.worker.submit).start()
+        return self.pekerja
+
+    def mark(self, event, soal=""):
+        """Marker timeline tes ke rekaman yang sedang direkam (eeg_epoch)."""
+        if self.eeg_logger:
+            self.eeg_logger.marker(event, soal)
+
+    def destroy(self):
+        if self.pekerja is not None:
+            self.pekerja.stop()
+        self.worker.shutdown()
+        super().destroy()
 
 class IntroPage(tk.Frame):
     def __init__(self, parent, controller):
@@ -410,6 +271,10 @@ class IntroPage(tk.Frame):
         self.canvas.coords(self.canvas_window, x, y)
 
     def start_intro(self):
+        # Selama animasi intro: start worker analisis & jalankan pipeline dummy
+        # sehingga analisis pertama di ProcessPage sudah berjalan pada kecepatan normal
+        from eeg_aplikasi import konfigurasi_pipeline
+        self.controller.worker.warm(**konfigurasi_pipeline())
         self.fade_in()
         self.animate_progress()
 
@@ -485,11 +350,13 @@ class StartPage(tk.Frame):
             except Exception as e:
                 print("Logger error", e)
 
+        from eeg_epoch import AUDIO_MULAI
         try:
             if pygame:
                 if os.path.exists("audio/soal 1.mp3"):
                     pygame.mixer.music.load("audio/soal 1.mp3")
                     pygame.mixer.music.play()
+                    self.controller.mark(AUDIO_MULAI, 1)
         except: pass
 
         self.check_audio_finished()
@@ -499,13 +366,15 @@ class StartPage(tk.Frame):
             if pygame.mixer.music.get_busy():
                 self.after(200, self.check_audio_finished)
             else:
+                from eeg_epoch import AUDIO_SELESAI
+                self.controller.mark(AUDIO_SELESAI, 1)
                 self.go_to_test()
         except:
             self.go_to_test()
 
     def go_to_test(self):
         self.controller.show_frame(TestPage)
-        self.controller.frames[TestPage].start_test_sequence()
+        self.controller._page(TestPage).start_test_sequence()
 
 class TestPage(tk.Frame):
     def __init__(self, parent, controller):
@@ -545,6 +414,8 @@ class TestPage(tk.Frame):
         self.controller.current_question = 1
         self.update_ui_labels()
         self.stopwatch.start()
+        from eeg_epoch import SOAL_MULAI
+        self.controller.mark(SOAL_MULAI, 1)
     
     def update_ui_labels(self):
         q = self.controller.current_question
@@ -557,24 +428,48 @@ class TestPage(tk.Frame):
             self.next_question()
 
     def next_question(self):
+        from eeg_epoch import AUDIO_MULAI, SOAL_MULAI
         if self.controller.current_question < TOTAL_QUESTIONS:
             self.controller.current_question += 1
             self.update_ui_labels()
+            self.controller.mark(SOAL_MULAI, self.controller.current_question)
             try:
                 if pygame:
                     f = f"audio/soal {self.controller.current_question}.mp3"
                     if os.path.exists(f):
                         pygame.mixer.music.load(f)
                         pygame.mixer.music.play()
+                        self.controller.mark(AUDIO_MULAI, self.controller.current_question)
+                        self.watch_audio(self.controller.current_question)
             except: pass
         else:
             self.finish_test()
 
+    def watch_audio(self, soal):
+        # Tandai akhir audio soal (selesai diputar atau terpotong soal berikutnya)
+        try:
+            busy = pygame.mixer.music.get_busy()
+        except Exception:
+            return
+        if busy and self.controller.current_question == soal:
+            self.after(100, self.watch_audio, soal)
+        else:
+            from eeg_epoch import AUDIO_SELESAI
+            self.controller.mark(AUDIO_SELESAI, soal)
+
     def finish_test(self):
+        from eeg_aplikasi import konfigurasi_pipeline
+        from eeg_epoch import TES_SELESAI
+        self.controller.mark(TES_SELESAI)
         try:
             if self.controller.eeg_logger:
                 self.controller.eeg_logger.stop()
         except: pass
+
+        # Masukkan rekaman ke antrian sekarang: hasil tidak hilang walau aplikasi ditutup di ProcessPage
+        fname = self.controller.eeg_filename
+        if fname and os.path.exists(fname):
+            self.controller.job = (fname, self.controller.mulai_antrian().tambah(fname, **konfigurasi_pipeline()))
         
         self.stopwatch.stop()
         
@@ -585,7 +480,7 @@ class TestPage(tk.Frame):
         except: pass
 
         self.controller.show_frame(ProcessPage)
-        self.controller.frames[ProcessPage].start_processing()
+        self.controller._page(ProcessPage).start_processing()
 
 class ProcessPage(tk.Frame):
     def __init__(self, parent, controller):
@@ -616,7 +511,8 @@ class ProcessPage(tk.Frame):
     def start_processing(self):
         self.is_processing = True
         self.animate_loading()
-        threading.Thread(target=self.run_analysis_logic, daemon=True).start()
+        # Analisis di proses worker; thread Tk hanya mem-poll hasilnya sehingga animasi tidak tersendat
+        self.submit_analysis()
 
     def animate_loading(self):
         if not self.is_processing: return
@@ -628,22 +524,40 @@ class ProcessPage(tk.Frame):
         self.angle = (self.angle - 10) % 360
         self.after(50, self.animate_loading)
 
-    def run_analysis_logic(self):
-        time.sleep(2)
-        
+    def submit_analysis(self):
+        from eeg_aplikasi import konfigurasi_pipeline
         fname = self.controller.eeg_filename
-        if fname and os.path.exists(fname):
-            res = run_eeg_pipeline(fname)
-        else:
-            res = {"ok": False, "message": "File EEG tidak ditemukan"}
-        
-        self.controller.analysis_results = res
-        self.after(0, self.finish_processing)
+        if not (fname and os.path.exists(fname)):
+            self.controller.analysis_results = {"ok": False, "message": "File EEG tidak ditemukan"}
+            self.finish_processing()
+            return
+        self.dots_label.config(text="Mohon tunggu sebentar...")
+        # Job dari finish_test dipakai (bisa sudah selesai); file dari "Muat EEG" dimasukkan sekarang
+        job_file, job_id = self.controller.job or (None, None)
+        self.controller.job = None
+        if job_file != fname:
+            job_id = self.controller.mulai_antrian().tambah(fname, **konfigurasi_pipeline())
+        self.poll_analysis(fname, job_id)
+
+    def poll_analysis(self, fname, job_id):
+        from eeg_aplikasi import hasil_job, konfigurasi_pipeline, pantau_job
+
+        def status(job):
+            if job['error']:
+                self.dots_label.config(text=f"Mencoba lagi (percobaan {job['percobaan'] + 1})...")
+
+        def selesai(job):
+            # Kanal kanan / bilateral dihitung worker, hanya jika diminta
+            kanan = lambda: self.controller.worker.submit(fname, kanal="kanan", **konfigurasi_pipeline()).result()
+            self.controller.analysis_results = hasil_job(fname, self.controller.antrian, job, minta_kanan=kanan)
+            self.finish_processing()
+
+        pantau_job(self, self.controller.antrian, job_id, selesai, status)
 
     def finish_processing(self):
         self.is_processing = False
         self.controller.show_frame(ResultPage)
-        self.controller.frames[ResultPage].display_results()
+        self.controller._page(ResultPage).display_results()
 
 # ================== RESULT PAGE (USER-FRIENDLY VERSION) ==================
 class ResultPage(tk.Frame):
@@ -675,6 +589,7 @@ class ResultPage(tk.Frame):
         self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
 
     def display_results(self):
+        from eeg_aplikasi import teks_bootstrap, teks_soal
         # Clear previous content
         for widget in self.content_container.winfo_children():
             widget.destroy()
@@ -689,6 +604,7 @@ class ResultPage(tk.Frame):
             return
             
         an = ar['analysis']
+        tampilan = an['tampilan']
         
         # ========== HEADER ==========
         title_label = tk.Label(self.content_container, text="HASIL PEMERIKSAAN DISLEKSIA", 
@@ -701,21 +617,27 @@ class ResultPage(tk.Frame):
         subtitle_label.pack(pady=(0,20))
         
         # ========== STATUS CARD (BESAR & BERWARNA) ==========
-        status_frame = tk.Frame(self.content_container, bg=an['color'], relief="flat", bd=0)
+        status_frame = tk.Frame(self.content_container, bg=tampilan['color'], relief="flat", bd=0)
         status_frame.pack(pady=5, fill="x")
         
-        icon_label = tk.Label(status_frame, font=("Arial", 24), bg=an['color'])
+        icon_label = tk.Label(status_frame, font=("Arial", 24), bg=tampilan['color'])
         icon_label.pack(pady=(15,5))
         
         diagnosis_label = tk.Label(status_frame, 
-                                    text=f"Kemungkinan Disleksia: {an['diagnosis']}", 
-                                    font=("Arial", 12, "bold"), bg=an['color'], fg="white")
+                                    text=f"Kemungkinan Disleksia: {tampilan['ringkas']}", 
+                                    font=("Arial", 12, "bold"), bg=tampilan['color'], fg="white")
         diagnosis_label.pack()
         
         confidence_label = tk.Label(status_frame, 
                                      text=f"Tingkat Keyakinan Sistem: {an['confidence_score']:.0f}% ({an['confidence']})", 
-                                     font=("Arial", 14), bg=an['color'], fg="white")
-        confidence_label.pack(pady=(5,15))
+                                     font=("Arial", 14), bg=tampilan['color'], fg="white")
+        confidence_label.pack(pady=(5,15) if an.get('probabilitas') is None else 5)
+
+        if an.get('probabilitas') is not None:
+            prob_label = tk.Label(status_frame,
+                                  text=f"Probabilitas Model: {an['probabilitas'] * 100:.0f}%",
+                                  font=("Arial", 11), bg=tampilan['color'], fg="white")
+            prob_label.pack(pady=(0,15))
         
         # ========== NARASI KESIMPULAN ==========
         narasi_frame = tk.Frame(self.content_container, bg="white", relief="solid", bd=1)
@@ -725,7 +647,7 @@ class ResultPage(tk.Frame):
                                 font=("Arial", 14, "bold"), bg="white", fg="#2c5aa0")
         narasi_title.pack(anchor="w", padx=15, pady=(12,8))
         
-        narasi_text = tk.Label(narasi_frame, text=an['narasi'], 
+        narasi_text = tk.Label(narasi_frame, text=tampilan['narasi'], 
                                font=("Arial", 8), bg="white", fg="#34495e", 
                                wraplength=600, justify="left")
         narasi_text.pack(anchor="w", padx=15, pady=(0,12))
@@ -794,7 +716,7 @@ class ResultPage(tk.Frame):
             text_color = "#27ae60" if v['passed'] else "#95a5a6"
             
             pola_item = tk.Label(pattern_frame, 
-                                 text=f"{icon}  {v['description']}", 
+                                 text=f"{icon}  {teks_kriteria(k, v)[0]}", 
                                  font=("Arial", 11), bg="white", fg=text_color, anchor="w")
             pola_item.pack(anchor="w", padx=20, pady=3)
         
@@ -821,14 +743,30 @@ class ResultPage(tk.Frame):
         
         # Isi detail teknis
         tech_text.insert(tk.END, f"Sampling Rate: {ar['fs']:.2f} Hz\n")
-        tech_text.insert(tk.END, f"Durasi Rekaman: {ar['t'][-1]:.2f} detik\n")
+        tech_text.insert(tk.END, f"Durasi Rekaman: {ar['durasi']:.2f} detik\n")
+        tech_text.insert(tk.END, f"Sampel Artefak: {an.get('rasio_artefak', 0) * 100:.1f}% ditolak\n")
         tech_text.insert(tk.END, "="*60 + "\n")
         tech_text.insert(tk.END, "KRITERIA TEKNIS:\n")
         
-        for k, v in an['kriteria'].items():
+        # Interval kepercayaan & peluang tingkat dari block bootstrap segmen
+        boot = ar.get('bootstrap')
+        for i, (k, v) in enumerate(an['kriteria'].items()):
             status = "[✓] PASS" if v['passed'] else "[✗] FAIL"
-            tech_text.insert(tk.END, f"{status} : {v['technical']}\n")
+            tech_text.insert(tk.END, f"{status} : {teks_kriteria(k, v)[1]}\n")
             tech_text.insert(tk.END, f"      Nilai: {v['value']:.3f} | Threshold: {v['threshold']}\n")
+            if boot:
+                lo, hi = boot['ci_values'][i]
+                tech_text.insert(tk.END, f"      CI {boot['level'] * 100:.0f}%: {lo:.3f} – {hi:.3f} | "
+                                         f"P(terpenuhi): {boot['p_passed'][i] * 100:.0f}%\n")
+
+        if boot:
+            tech_text.insert(tk.END, "="*60 + "\n")
+            tech_text.insert(tk.END, "".join(line + "\n" for line in teks_bootstrap(boot)))
+
+        soal = ar.get('soal')
+        if soal:
+            tech_text.insert(tk.END, "="*60 + "\n")
+            tech_text.insert(tk.END, "".join(line + "\n" for line in teks_soal(soal)))
         
         tech_text.config(state="disabled")
         
@@ -867,10 +805,17 @@ class ResultPage(tk.Frame):
     def show_plots(self):
         ar = self.controller.analysis_results
         if not ar or not ar.get('ok'): return
+        if ar.get('bertahap'):
+            messagebox.showinfo("Plot", "Rekaman besar dianalisis bertahap; sinyal lengkap tidak disimpan sehingga grafik tidak tersedia.")
+            return
         
         try:
-            t = ar['t']
-            filtered = ar['filtered']
+            import matplotlib.pyplot as plt
+
+            # Data grafik terdesimasi dari worker/cache; tanpa itu pakai sinyal penuh
+            plot = ar['plot']
+            t = plot['t']
+            filtered = plot['bands']
             rel_power = ar['analysis']['relative_power']
             
             # Create 2 subplots: signals + bar chart
@@ -927,23 +872,31 @@ class ResultPage(tk.Frame):
             )
             
             if filename:
+                from eeg_aplikasi import teks_bootstrap
                 an = ar['analysis']
+                tampilan = an['tampilan']
                 with open(filename, 'w', encoding='utf-8') as f:
                     f.write("="*60 + "\n")
                     f.write("      LAPORAN HASIL TES DISLEKSIA (EEG)\n")
                     f.write("="*60 + "\n\n")
                     f.write(f"Tanggal: {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-                    f.write(f"HASIL: {an['diagnosis']}\n")
-                    f.write(f"Keyakinan Sistem: {an['confidence_score']:.1f}% ({an['confidence']})\n\n")
+                    f.write(f"HASIL: {tampilan['ringkas']}\n")
+                    f.write(f"Keyakinan Sistem: {an['confidence_score']:.1f}% ({an['confidence']})\n")
+                    if an.get('probabilitas') is not None:
+                        f.write(f"Probabilitas Model: {an['probabilitas'] * 100:.1f}%\n")
+                    boot = ar.get('bootstrap')
+                    if boot:
+                        f.write("".join(line + "\n" for line in teks_bootstrap(boot)))
+                    f.write("\n")
                     f.write("KESIMPULAN:\n")
-                    f.write(f"{an['narasi']}\n\n")
+                    f.write(f"{tampilan['narasi']}\n\n")
                     f.write("REKOMENDASI:\n")
                     f.write(f"{an['rekomendasi']}\n\n")
                     f.write("-"*60 + "\n")
                     f.write("POLA YANG TERDETEKSI:\n")
                     for k, v in an['kriteria'].items():
                         status = "[v] TERPENUHI" if v['passed'] else "[ ] TIDAK"
-                        f.write(f"{status} : {v['description']}\n")
+                        f.write(f"{status} : {teks_kriteria(k, v)[0]}\n")
                     f.write("="*60 + "\n")
                 
                 messagebox.showinfo("Export Berhasil", f"Laporan disimpan di:\n{filename}")
@@ -952,10 +905,11 @@ class ResultPage(tk.Frame):
 
     def restart_test(self):
         self.controller.current_question = 1
-        self.controller.frames[TestPage].stopwatch.reset()
+        self.controller._page(TestPage).stopwatch.reset()
         self.controller.show_frame(StartPage)
 
 # ================== RUN APP ==================
 if __name__ == "__main__":
+    init_audio()
     app = App()
     app.mainloop()
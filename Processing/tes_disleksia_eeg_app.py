@@ -41,6 +41,8 @@ import matplotlib.pyplot as plt
 from scipy.signal import butter, filtfilt, iirnotch, welch
 from scipy.stats import skew, kurtosis
 
+from eeg_kriteria import kriteria_bilateral, statistik_band
+
 # ================== KONFIGURASI ==================
 QUESTION_DURATION = 5      # detik per soal
 TOTAL_QUESTIONS = 5
@@ -183,7 +185,10 @@ def deteksi_disleksia_riset(delta_signal, theta_signal, alpha_signal, beta_signa
         'rekomendasi': rekomendasi,
         'relative_power': {
             'delta': delta_rel, 'theta': theta_rel, 'alpha': alpha_rel, 'beta': beta_rel, 'gamma': gamma_rel
-        }
+        },
+        # Sama dengan eeg_kriteria.statistik_band kanal ini (dipakai ulang untuk bilateral)
+        'statistik': (np.array([delta_power, theta_power, alpha_power, beta_power, gamma_power]),
+                      delta_variability, correlation)
     })
     return results
 
@@ -220,11 +225,12 @@ def run_eeg_pipeline(filename):
         fk["Delta (0.5–4 Hz)"], fk["Theta (4–8 Hz)"],
         fk["Alpha (8–13 Hz)"], fk["Beta (13–30 Hz)"],
         fk["Gamma (30–45 Hz)"],
-        fn["Delta (0.5–4 Hz)"], fn["Theta (4–8 Hz)"],
-        fn["Alpha (8–13 Hz)"], fn["Beta (13–30 Hz)"],
-        fn["Gamma (30–45 Hz)"],
         fs
     )
+    # Kriteria per hemisfer + indeks asimetri (kiri vs kanan) sekaligus; statistik
+    # kiri sudah dihitung deteksi_disleksia_riset, cukup kanal kanan
+    statistik_kanan = statistik_band(fn)
+    hasil['bilateral'] = kriteria_bilateral(*(np.stack(pair) for pair in zip(hasil['statistik'], statistik_kanan)))
 
     return {
         "ok": True,
@@ -0,0 +1,91 @@
+import os
+
+import eeg_antrian
+from eeg_antrian import ANTRE, SELESAI, AntrianAnalisis
+
+def test_path_default_tidak_bergantung_folder_kerja():
+    assert os.path.isabs(eeg_antrian.ANTRIAN_PATH) or "EEG_ANTRIAN" in os.environ
+
+def test_tambah_hanya_menggabung_job_yang_belum_selesai(tmp_path):
+    antrian = AntrianAnalisis(str(tmp_path / "antrian.sqlite"))
+    rekaman = tmp_path / "sesi.csv"
+    rekaman.write_text("Timestamp,ADC_KIRI,ADC_KANAN\n")
+
+    pertama = antrian.tambah(str(rekaman), gain=1000.0)
+    assert antrian.tambah(str(rekaman), gain=1000.0) == pertama
+    assert antrian.tambah(str(rekaman), gain=500.0) != pertama
+
+    job = antrian.klaim("uji:1:1")
+    assert job['id'] == pertama
+    assert antrian.selesaikan(pertama, "uji:1:1", {'statistik': None})
+    assert antrian.job(pertama)['status'] == SELESAI
+
+    # Rekaman di path yang sama direkam ulang -> job baru, bukan hasil lama
+    baru = antrian.tambah(str(rekaman), gain=1000.0)
+    assert baru != pertama
+    assert antrian.job(baru)['status'] == ANTRE
+
+def test_job_format_salah_gagal_permanen(tmp_path):
+    from concurrent.futures import Future
+    from eeg_antrian import GAGAL, PekerjaAntrian
+    from eeg_arsip import FormatRekamanError
+
+    def analisis(filename, **config):
+        fut = Future()
+        fut.set_exception(FormatRekamanError("kolom tidak ada: Timestamp"))
+        return fut
+
+    antrian = AntrianAnalisis(str(tmp_path / "antrian.sqlite"))
+    job_id = antrian.tambah(str(tmp_path / "thingspeak.csv"))
+    pekerja = PekerjaAntrian(antrian, analisis)
+    pekerja._jalankan(antrian.klaim("uji:1:1"), "uji:1:1")
+
+    job = antrian.job(job_id)
+    assert job['status'] == GAGAL and job['percobaan'] == 1
+    assert "Timestamp" in job['error']
+
+class _Widget:
+    # Pengganti widget Tk: after() dijalankan langsung, interval dicatat
+    def __init__(self):
+        self.interval = []
+
+    def after(self, ms, fungsi, *args):
+        self.interval.append(ms)
+        fungsi(*args)
+
+def test_pantau_job_mundur_lalu_selesai(tmp_path):
+    from eeg_aplikasi import POLL_MAKS_MS, pantau_job
+
+    antrian = AntrianAnalisis(str(tmp_path / "antrian.sqlite"))
+    job_id = antrian.tambah(str(tmp_path / "sesi.csv"))
+    widget, hasil = _Widget(), []
+
+    def status(job):
+        if len(widget.interval) == 5:
+            antrian.klaim("uji:1:1")
+            antrian.selesaikan(job_id, "uji:1:1", {'statistik': None})
+
+    pantau_job(widget, antrian, job_id, hasil.append, status)
+    assert [job['status'] for job in hasil] == [SELESAI]
+    assert widget.interval == [100, 200, 400, 800, POLL_MAKS_MS, POLL_MAKS_MS]
+
+def test_pantau_job_hilang_dianggap_gagal(tmp_path):
+    from eeg_aplikasi import hasil_job, pantau_job
+    from eeg_antrian import GAGAL
+
+    antrian = AntrianAnalisis(str(tmp_path / "antrian.sqlite"))
+    widget, hasil = _Widget(), []
+    pantau_job(widget, antrian, 42, hasil.append)
+
+    assert widget.interval == []
+    assert hasil[0]['status'] == GAGAL
+    res = hasil_job(str(tmp_path / "sesi.csv"), antrian, hasil[0])
+    assert res['ok'] is False and "42" in res['message']
+
+def test_pulihkan_abaikan_pemilik_rusak(tmp_path):
+    antrian = AntrianAnalisis(str(tmp_path / "antrian.sqlite"))
+    for pemilik in ("rusak", f"{eeg_antrian.socket.gethostname()}:bukan-pid:1"):
+        antrian.tambah(str(tmp_path / f"{len(pemilik)}.csv"))
+        assert antrian.klaim(pemilik) is not None
+    assert antrian.pulihkan() == 0
+    assert eeg_antrian._pid_pemilik("host:123:4") == 123
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from eeg_arsip import FormatRekamanError, RekamanEEG, as_adc, baca_csv, cek_kolom
+
+def _csv(tmp_path, teks):
+    path = tmp_path / "rekaman.csv"
+    path.write_text(teks)
+    return str(path)
+
+@pytest.mark.parametrize("header, hilang", [
+    ("created_at,entry_id,field1,field2", "Timestamp"),
+    ("Timestamp,ADC_KIRI", "ADC_KANAN"),
+    ("Timestamp;ADC_KIRI;ADC_KANAN", "Timestamp"),     # pemisah salah = satu kolom
+])
+def test_cek_kolom_menolak_csv_bukan_logger(tmp_path, header, hilang):
+    with pytest.raises(FormatRekamanError, match=hilang):
+        cek_kolom(_csv(tmp_path, header + "\n0,1,2\n"))
+
+def test_cek_kolom_header_dengan_spasi_dan_urutan_lain(tmp_path):
+    cek_kolom(_csv(tmp_path, "ADC_KANAN, Timestamp ,ADC_KIRI\n1,0.0,2\n"))
+
+def test_baca_csv_uint16(tmp_path):
+    rekaman = baca_csv(_csv(tmp_path, "Timestamp,ADC_KIRI,ADC_KANAN\n0.0,2048,2050\n0.004,2049,2051\n"), 1000.0, 1.65)
+    assert isinstance(rekaman, RekamanEEG) and rekaman.adc.dtype == np.uint16
+    np.testing.assert_array_equal(rekaman.adc, [[2048, 2049], [2050, 2051]])
+
+def test_baca_csv_sel_kosong_dan_di_luar_rentang(tmp_path):
+    teks = "Timestamp,ADC_KIRI,ADC_KANAN\n0.0,2048,2050\n0.004,,2051\n0.008,70000,-5\n0.012,2047.6,1\n"
+    rekaman = baca_csv(_csv(tmp_path, teks), 1000.0, 1.65)
+    np.testing.assert_array_equal(rekaman.t, [0.0, 0.008, 0.012])
+    np.testing.assert_array_equal(rekaman.adc, [[2048, 4095, 2048], [2050, 0, 1]])
+
+def test_as_adc_clip_12_bit():
+    np.testing.assert_array_equal(as_adc(np.array([-1.0, 4095.4, 5000])), [0, 4095, 4095])
@@ -0,0 +1,66 @@
+import numpy as np
+
+from eeg_artefak import _dilate, _runs, deteksi_artefak, kriteria_bersih
+from eeg_kriteria import hitung_kriteria, statistik_band
+
+FS = 100
+
+def _rekaman(n=10 * FS, seed=0):
+    adc = 2048 + np.random.default_rng(seed).integers(-20, 21, n)
+    return adc, (adc - 2048) * 1.0
+
+def _dilate_loop(mask, margin):
+    n = len(mask)
+    return np.array([mask[max(0, i - margin):i + margin + 1].any() for i in range(n)])
+
+def _runs_loop(eq, min_len):
+    out, i = np.zeros(len(eq), dtype=bool), 0
+    while i < len(eq):
+        j = i
+        while j < len(eq) and eq[j]:
+            j += 1
+        if j - i >= min_len:
+            out[i:j] = True
+        i = max(j, i + 1)
+    return out
+
+def test_dilate_dan_runs_sama_dengan_loop():
+    rng = np.random.default_rng(1)
+    for _ in range(20):
+        mask = rng.random(200) > 0.9
+        margin = int(rng.integers(0, 6))
+        np.testing.assert_array_equal(_dilate(mask, margin), _dilate_loop(mask, margin))
+        eq = rng.random(200) > 0.4
+        min_len = int(rng.integers(1, 6))
+        np.testing.assert_array_equal(_runs(eq, min_len), _runs_loop(eq, min_len))
+
+def test_rekaman_bersih_tanpa_artefak():
+    adc, uv = _rekaman()
+    hasil = deteksi_artefak(adc, uv, FS)
+    assert hasil['rasio_artefak'] == 0.0 and hasil['bersih'].all()
+
+def test_jenis_artefak_dan_margin():
+    adc, uv = _rekaman()
+    adc[100] = 4095                     # saturasi
+    adc[300:320] = adc[300]             # flat-line 0.2 detik
+    uv[500] += 500                      # ekskursi amplitudo (+ lompatan)
+    uv[700:] += 150                     # electrode pop
+
+    hasil = deteksi_artefak(adc, uv, FS, margin=0.05)
+    assert hasil['saturasi'][100] and hasil['saturasi'].sum() == 1
+    assert hasil['flat'][300:320].all() and not hasil['flat'][:299].any()
+    assert hasil['amplitudo'][500]
+    assert hasil['lompatan'][699] and hasil['lompatan'][700]
+    # Margin 5 sampel di sekitar saturasi
+    assert hasil['artefak'][95:106].all() and not hasil['artefak'][94]
+    np.testing.assert_array_equal(hasil['bersih'], ~hasil['artefak'])
+    assert 0 < hasil['rasio_artefak'] < 1
+
+def test_kriteria_bersih_mengabaikan_sampel_artefak():
+    rng = np.random.default_rng(2)
+    bands = rng.normal(0, [[20], [10], [8], [5], [3]], (5, 2000))
+    mask = np.ones(2000, dtype=bool)
+    mask[500:700] = False
+    kotor = bands.copy()
+    kotor[:, 500:700] *= 50
+    np.testing.assert_allclose(kriteria_bersih(kotor, mask)[0], hitung_kriteria(*statistik_band(bands, mask))[0])
@@ -0,0 +1,52 @@
+import io
+import json
+import multiprocessing
+import os
+
+import pytest
+
+import analisis_batch
+from analisis_batch import jalankan_batch, kumpulkan_file
+from eeg_cache import CacheHasil
+from test_bertahap import _rekaman
+from test_proses import THINGSPEAK
+
+CONFIG = dict(gain=1000.0, vref=1.65, chunked_min_bytes=None)
+
+def _arsip(tmp_path):
+    folder = tmp_path / "arsip"
+    folder.mkdir()
+    _rekaman(folder / "sesi_1.csv", False, menit=1)
+    (folder / "thingspeak.csv").write_text(THINGSPEAK)
+    return kumpulkan_file([str(folder)])
+
+def _baris(out):
+    return {os.path.basename(r['file']): r for r in map(json.loads, out.getvalue().splitlines())}
+
+def test_batch_satu_file_rusak(tmp_path):
+    out = io.StringIO()
+    cache = CacheHasil(str(tmp_path / "cache"))
+
+    assert jalankan_batch(_arsip(tmp_path), out, jobs=1, progress=None, cache=cache, **CONFIG) == (1, 1)
+    baris = _baris(out)
+    assert baris["sesi_1.csv"]['ok'] and baris["sesi_1.csv"]['tingkat']
+    assert not baris["thingspeak.csv"]['ok'] and "FormatRekamanError" in baris["thingspeak.csv"]['error']
+
+def test_file_hilang_jadi_baris_gagal(tmp_path):
+    row, size = analisis_batch.analisis_satu(str(tmp_path / "hilang.csv"), **CONFIG)
+    assert not row['ok'] and "FileNotFoundError" in row['error'] and size == 0
+
+def _mati_di_thingspeak(filename, bootstrap=False, **config):
+    if filename.endswith("thingspeak.csv"):
+        os._exit(1)     # seperti worker yang dibunuh kernel
+    return {'file': filename, 'ok': True}, 0
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="patch fungsi worker butuh fork")
+def test_worker_mati_tidak_menghentikan_batch(tmp_path, monkeypatch):
+    monkeypatch.setattr(analisis_batch, "analisis_satu", _mati_di_thingspeak)
+    out = io.StringIO()
+
+    n_ok, n_fail = jalankan_batch(_arsip(tmp_path), out, jobs=1, progress=None, **CONFIG)
+    baris = _baris(out)
+    assert n_fail == 1 and "BrokenProcessPool" in baris["thingspeak.csv"]['error']
+    assert baris["sesi_1.csv"]['ok'] and n_ok == 1
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from eeg_bertahap import analisis_bertahap
+from eeg_kriteria import hitung_kriteria
+from eeg_proses import ringkasan_file
+
+FS = 256
+
+def _rekaman(path, irregular, menit=3, seed=0):
+    # EEG sintetis (delta dominan + alpha + gamma + 50 Hz); irregular = jitter timestamp host
+    rng = np.random.default_rng(seed)
+    n = menit * 60 * FS
+    t = np.arange(n) / FS
+    if irregular:
+        t = np.cumsum(rng.gamma(4, 1 / (4 * FS), n))
+        t -= t[0]
+    sig = (40 * np.sin(2 * np.pi * 2 * t) + 15 * np.sin(2 * np.pi * 10 * t) + 5 * np.sin(2 * np.pi * 38 * t)
+           + 6 * np.sin(2 * np.pi * 50 * t) + rng.normal(0, 8, n))
+    adc = np.clip(np.rint(2048 + np.stack([sig, 0.8 * sig + rng.normal(0, 5, n)])), 0, 4095)
+    np.savetxt(path, np.column_stack([t, adc.T]), fmt=["%.6f", "%d", "%d"], delimiter=",",
+               header="Timestamp,ADC_KIRI,ADC_KANAN", comments="")
+    return str(path)
+
+@pytest.mark.parametrize("irregular", [False, True])
+def test_bertahap_sama_dengan_memori_penuh(tmp_path, irregular):
+    path = _rekaman(tmp_path / "sesi.csv", irregular)
+
+    penuh = ringkasan_file(path, gain=1000.0, vref=1.65, chunked_min_bytes=None)
+    bertahap = analisis_bertahap(path, 1000.0, 1.65)
+
+    assert bertahap['fs'] == pytest.approx(penuh['fs'])
+    assert bertahap['mains_hz'] == penuh['mains_hz'] == 50
+    expected = hitung_kriteria(*penuh['statistik'])[0]
+    np.testing.assert_allclose(bertahap['values'][0], expected, rtol=0.01, atol=0.01)
+
+@pytest.mark.parametrize("chunked_min_bytes", [None, 0])
+def test_ringkasan_kanal_kanan(tmp_path, chunked_min_bytes):
+    path = _rekaman(tmp_path / "sesi.csv", False, menit=1)
+
+    kiri = ringkasan_file(path, gain=1000.0, vref=1.65, chunked_min_bytes=chunked_min_bytes)
+    kanan = ringkasan_file(path, gain=1000.0, vref=1.65, chunked_min_bytes=chunked_min_bytes, kanal="kanan")
+
+    assert (kiri['kanal'], kanan['kanal']) == ("kiri", "kanan")
+    # Kanal kanan sintetis = 0.8 x kiri (+ derau) -> power band lebih kecil
+    assert kanan['statistik'][0][0] < kiri['statistik'][0][0]
+    with pytest.raises(ValueError):
+        ringkasan_file(path, gain=1000.0, vref=1.65, kanal="tengah")
+
+def test_bertahap_sel_kosong_dan_di_luar_rentang(tmp_path):
+    path = _rekaman(tmp_path / "sesi.csv", False, menit=2)
+    baris = open(path).read().splitlines()
+    # Sel kosong dan nilai di luar 12-bit, seperti logger yang tersendat
+    baris[100] = baris[100].rsplit(',', 2)[0] + ",,2050"
+    baris[200] = baris[200].rsplit(',', 2)[0] + ",70000,2050"
+    (tmp_path / "rusak.csv").write_text("\n".join(baris) + "\n")
+
+    penuh = ringkasan_file(str(tmp_path / "rusak.csv"), gain=1000.0, vref=1.65, chunked_min_bytes=None)
+    bertahap = ringkasan_file(str(tmp_path / "rusak.csv"), gain=1000.0, vref=1.65, chunked_min_bytes=0)
+    np.testing.assert_allclose(hitung_kriteria(*bertahap['statistik'])[0], hitung_kriteria(*penuh['statistik'])[0],
+                               rtol=0.02, atol=0.02)
+
+@pytest.mark.parametrize("config", [dict(dtype=np.float32), dict(multirate=True)])
+def test_bertahap_memakai_konfigurasi(tmp_path, config):
+    path = _rekaman(tmp_path / "sesi.csv", False, menit=2)
+
+    penuh = ringkasan_file(path, gain=1000.0, vref=1.65, chunked_min_bytes=None, **config)
+    bertahap = ringkasan_file(path, gain=1000.0, vref=1.65, chunked_min_bytes=0, **config)
+    np.testing.assert_allclose(hitung_kriteria(*bertahap['statistik'])[0], hitung_kriteria(*penuh['statistik'])[0],
+                               rtol=0.02, atol=0.02)
+
+def test_bertahap_resample_ke_bawah_ditolak(tmp_path):
+    path = _rekaman(tmp_path / "sesi.csv", False, menit=1)
+
+    with pytest.raises(ValueError, match="resampling"):
+        ringkasan_file(path, gain=1000.0, vref=1.65, chunked_min_bytes=0, resample_fs=FS / 2)
+    assert ringkasan_file(path, gain=1000.0, vref=1.65, chunked_min_bytes=0, resample_fs=2 * FS)['fs'] == 2 * FS
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from eeg_bootstrap import N_JUMLAH, bootstrap_kriteria, jumlah_segmen, statistik_dari_jumlah
+from eeg_kriteria import aturan_aktif, statistik_band
+
+FS = 128
+
+def _bands(n=60 * FS, seed=0):
+    rng = np.random.default_rng(seed)
+    return [rng.normal(0, s, n) for s in (20, 10, 8, 5, 3)]
+
+def test_jumlah_segmen_konsisten_dengan_statistik_band():
+    bands = _bands()
+    mask = np.random.default_rng(1).random(len(bands[0])) > 0.1
+    sums = jumlah_segmen(bands, mask, FS)
+    assert sums.shape == (30, N_JUMLAH)
+    for a, b in zip(statistik_dari_jumlah(sums.sum(axis=0)), statistik_band(bands, mask)):
+        np.testing.assert_allclose(a, b, rtol=1e-9, atol=1e-12)
+
+def test_bootstrap_bentuk_hasil():
+    aturan = aturan_aktif()
+    K, T = len(aturan.thresholds), len(aturan.tingkat_names)
+    hasil = bootstrap_kriteria(jumlah_segmen(_bands(), None, FS), n_boot=300, budget=None, batch=128)
+    assert hasil['n_boot'] == 300 and hasil['n_segmen'] == 30 and hasil['block'] == 3
+    assert hasil['ci_values'].shape == (K, 2)
+    assert np.all(hasil['ci_values'][:, 0] <= hasil['ci_values'][:, 1])
+    assert hasil['p_passed'].shape == (K,)
+    assert hasil['p_tingkat'].shape == (T,) and hasil['p_tingkat'].sum() == pytest.approx(1.0)
+    assert hasil['ci_relative_power'].shape == (5, 2)
+    assert hasil['ci_confidence_score'].shape == (2,)
+
+def test_bootstrap_deterministik_per_seed():
+    sums = jumlah_segmen(_bands(), None, FS)
+    a, b = (bootstrap_kriteria(sums, n_boot=200, budget=None, seed=7) for _ in range(2))
+    c = bootstrap_kriteria(sums, n_boot=200, budget=None, seed=8)
+    for key in ('ci_values', 'p_passed', 'p_tingkat', 'ci_relative_power', 'ci_confidence_score'):
+        np.testing.assert_array_equal(a[key], b[key])
+    assert not np.array_equal(a['ci_relative_power'], c['ci_relative_power'])
+
+def test_bootstrap_segmen_kurang_dari_dua():
+    assert bootstrap_kriteria(np.zeros((1, N_JUMLAH))) is None
@@ -0,0 +1,84 @@
+import threading
+
+import numpy as np
+import pytest
+
+from eeg_alur import alur_eeg
+from eeg_dag import PipelineDAG
+from eeg_kriteria import BANDS
+
+def _dag_hitung():
+    # Setiap tahap mencatat berapa kali dipanggil
+    calls = {}
+    lock = threading.Lock()
+
+    def tahap(name, func):
+        def wrapped(*args):
+            with lock:
+                calls[name] = calls.get(name, 0) + 1
+            return func(*args)
+        return wrapped
+
+    dag = PipelineDAG(max_workers=2).set("x", 3)
+    dag.add("kuadrat", tahap("kuadrat", lambda x: x * x), inputs=["x"])
+    dag.add("besar", tahap("besar", lambda x: [x] * 1000), inputs=["x"], cache=False)
+    dag.add("jumlah", tahap("jumlah", lambda b: sum(b)), inputs=["besar"])
+    dag.add("bagi", tahap("bagi", lambda k: divmod(k, 4)), inputs=["kuadrat"], outputs=["hasil_bagi", "sisa"])
+    dag.add("tak_dipakai", tahap("tak_dipakai", lambda x: 1 / 0), inputs=["x"])
+    return dag, calls
+
+def test_dag_cache_dan_hanya_tahap_yang_dibutuhkan():
+    dag, calls = _dag_hitung()
+    assert dag.run("hasil_bagi", "sisa") == {"hasil_bagi": 2, "sisa": 1}
+    assert dag["kuadrat"] == 9 and dag["sisa"] == 1
+    assert calls == {"kuadrat": 1, "bagi": 1}
+    assert dag.is_cached("kuadrat") and dag.is_cached("sisa")
+
+def test_dag_cache_false_dilepas_dan_dihitung_ulang():
+    dag, calls = _dag_hitung()
+    assert dag["jumlah"] == 3000
+    assert not dag.is_cached("besar") and dag.is_cached("jumlah")
+    assert dag["jumlah"] == 3000 and calls["besar"] == 1
+    # Diminta langsung -> dihitung ulang dari input yang di-cache
+    assert len(dag["besar"]) == 1000 and calls["besar"] == 2
+    assert "besar" in dag and not dag.is_cached("besar")
+
+def test_dag_set_menimpa_hasil_tahap():
+    dag, calls = _dag_hitung()
+    dag.set("kuadrat", 10)
+    assert dag["sisa"] == 2 and "kuadrat" not in calls
+
+def test_dag_error_tahap_diteruskan():
+    dag, _ = _dag_hitung()
+    with pytest.raises(ZeroDivisionError):
+        dag.run("tak_dipakai")
+    assert not dag.is_cached("tak_dipakai")
+
+def test_dag_validasi():
+    dag, _ = _dag_hitung()
+    with pytest.raises(ValueError, match="sudah ada"):
+        dag.add("kuadrat", abs, inputs=["x"])
+    with pytest.raises(ValueError, match="sudah dihasilkan"):
+        dag.add("lain", abs, inputs=["x"], outputs=["sisa"])
+    with pytest.raises(KeyError):
+        dag.run("tidak_ada")
+    dag.add("a", abs, inputs=["b"]).add("b", abs, inputs=["a"])
+    with pytest.raises(ValueError, match="Siklus"):
+        dag.run("a")
+
+def test_alur_eeg_filtered_menghitung_ulang_bandpass():
+    fs = 256
+    adc = np.random.default_rng(0).integers(1900, 2200, (2, 8 * fs)).astype(np.uint16)
+    dag = alur_eeg(adc, fs, 1000.0, 1.65, 50, channels=("kiri",), max_workers=2)
+
+    dag.run("statistik_kiri", "band_powers_kiri")
+    assert dag.is_cached("uv_kiri") and dag.is_cached("statistik_kiri")
+    assert not dag.is_cached("bands_kiri") and not dag.is_cached("filtered_kiri")
+    assert not any(dag.is_cached(f"kiri/{name}") for name in BANDS)
+
+    dag.timing.clear()
+    filtered = dag["filtered_kiri"]
+    assert set(filtered) == set(BANDS)
+    # Bandpass dihitung ulang dari uv_kiri yang di-cache, notch tidak
+    assert {f"kiri/{name}" for name in BANDS} <= set(dag.timing)
+    assert "uv_kiri" not in dag.timing
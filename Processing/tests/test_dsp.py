@@ -0,0 +1,154 @@
+import numpy as np
+import pytest
+
+from eeg_dsp import detect_mains, mains_filter
+
+FS = 256
+
+def _daya(x, freq, fs=FS):
+    spec = np.abs(np.fft.rfft(x))**2
+    freqs = np.fft.rfftfreq(len(x), 1 / fs)
+    return spec[np.abs(freqs - freq) <= 0.5].sum()
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_mains_filter_membuang_50hz_dan_harmonik(dtype):
+    t = np.arange(20 * FS) / FS
+    rng = np.random.default_rng(0)
+    x = (rng.normal(0, 1, len(t)) + 3 * np.sin(2 * np.pi * 50 * t) + np.sin(2 * np.pi * 100 * t)).astype(dtype)
+
+    y = mains_filter(x, FS, freq=50)
+
+    assert y.dtype == dtype
+    for f in (50, 100):
+        assert _daya(y, f) < 1e-2 * _daya(x, f)
+    # Di luar notch sinyal tidak berubah
+    assert _daya(y, 10) == pytest.approx(_daya(x, 10), rel=0.05)
+
+def test_mains_filter_deteksi_otomatis_float64():
+    t = np.arange(20 * FS) / FS
+    x = np.random.default_rng(1).normal(0, 1, (2, len(t))) + 3 * np.sin(2 * np.pi * 50 * t)
+    y = mains_filter(x, FS)
+    assert _daya(y[0], 50) < 1e-2 * _daya(x[0], 50)
+
+@pytest.mark.parametrize("freq", [50, 60])
+def test_detect_mains_50_atau_60hz(freq):
+    t = np.arange(4 * FS) / FS
+    x = np.random.default_rng(freq).normal(0, 1, (2, len(t))) + 0.5 * np.sin(2 * np.pi * freq * t)
+    assert detect_mains(x, FS) == freq
+    assert detect_mains(x[0].astype(np.float32), FS) == freq
+
+def test_detect_mains_kandidat_di_atas_nyquist_diabaikan():
+    # fs 100 Hz: 60 Hz di atas Nyquist, hanya 50 Hz yang mungkin
+    t = np.arange(4 * 100) / 100
+    x = np.random.default_rng(4).normal(0, 1, len(t)) + np.sin(2 * np.pi * 40 * t)
+    assert detect_mains(x, 100) == 50
+
+@pytest.mark.parametrize("freq", [50, 60])
+def test_mains_filter_deteksi_otomatis_membuang_frekuensi_terdeteksi(freq):
+    t = np.arange(20 * FS) / FS
+    x = (np.random.default_rng(5).normal(0, 1, len(t)) + 3 * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+    y = mains_filter(x, FS)
+    assert y.dtype == np.float32 and y.flags.writeable
+    assert _daya(y, freq) < 1e-2 * _daya(x, freq)
+
+def test_mains_filter_rekaman_pendek_tidak_difilter():
+    x = np.ones(10)
+    assert mains_filter(x, FS, freq=50) is x
+
+def test_mains_filter_di_atas_nyquist_tidak_difilter():
+    # fs 80 Hz: 50 Hz di atas Nyquist, tidak ada notch
+    x = np.random.default_rng(2).normal(0, 1, 2000)
+    assert mains_filter(x, 80, freq=50) is x
+
+def test_design_fs_estimasi_memakai_desain_pemanasan():
+    from eeg_dsp import bandpass, band_design, design_fs
+    assert design_fs(255.93) == design_fs(256.026) == 256.0
+    x = np.random.default_rng(3).normal(0, 1, 4000)
+    bandpass(x, 8, 13, 256.0)
+    misses = band_design.cache_info().misses
+    bandpass(x, 8, 13, 255.93)
+    assert band_design.cache_info().misses == misses
+
+def test_resample_uniform_timestamp_seragam_tidak_diubah():
+    from eeg_dsp import resample_uniform
+    t = np.arange(1000) / FS
+    x = np.random.default_rng(4).normal(size=(2, 1000))
+    t_out, y, fs = resample_uniform(t, x)
+    assert t_out is t
+    np.testing.assert_array_equal(y, x)
+    assert fs == pytest.approx(FS, rel=1e-2)
+
+def test_resample_uniform_jitter_dan_duplikat():
+    from eeg_dsp import is_irregular, resample_uniform
+    rng = np.random.default_rng(5)
+    t = np.cumsum(rng.uniform(0.5, 1.5, 2000)) / FS
+    t[100] = t[99]                                   # timestamp duplikat
+    x = np.stack([3 * t + 1, -2 * t])                # linier: interpolasi eksak
+    assert is_irregular(t)
+
+    # fs_target None = fs estimasi: grid langsung, tanpa desimasi
+    t_out, y, fs = resample_uniform(t, x)
+    assert fs == pytest.approx(FS, rel=0.05)
+    np.testing.assert_allclose(np.diff(t_out), 1 / fs)
+    np.testing.assert_allclose(y[0], 3 * t_out + 1, atol=1e-9)
+    np.testing.assert_allclose(y[1], -2 * t_out, atol=1e-9)
+
+def test_resample_uniform_turun_dan_dtype_integer():
+    from eeg_dsp import resample_uniform
+    t = np.arange(4 * FS) / FS
+    adc = (2048 + 500 * np.sin(2 * np.pi * 2 * t)).astype(np.uint16)
+    t_out, y, fs = resample_uniform(t, [adc], fs_target=FS / 4, dtype=np.uint16)
+    assert fs == FS / 4 and y.dtype == np.uint16 and y.shape == (1, len(t_out))
+    np.testing.assert_allclose(np.diff(t_out), 4 / FS)
+    # Sinyal 2 Hz lolos anti-alias; tepi dibiarkan (efek filter)
+    tengah = slice(8, -8)
+    ref = 2048 + 500 * np.sin(2 * np.pi * 2 * t_out)
+    assert np.max(np.abs(y[0, tengah] - ref[tengah])) < 10
+
+@pytest.mark.parametrize("output", ["native", "common", "full"])
+def test_filter_bands_multirate_panjang_dan_rate(output):
+    from eeg_dsp import analysis_rate, filter_bands_multirate
+    from eeg_kriteria import BANDS
+    x = np.random.default_rng(6).normal(0, 1, 30 * FS)
+    signals, rates = filter_bands_multirate(x, FS, output=output)
+    assert set(signals) == set(BANDS)
+    for name, sig in signals.items():
+        assert len(sig) == pytest.approx(len(x) * rates[name] / FS, abs=1)
+        assert rates[name] >= 2.5 * BANDS[name][1]
+    if output == "full":
+        assert set(rates.values()) == {FS}
+    if output == "common":
+        assert len({len(s) for s in signals.values()}) == 1
+        assert set(rates.values()) == {analysis_rate(FS, multirate=True)}
+
+def test_filter_bands_multirate_setara_bandpass_fs_asli():
+    from eeg_dsp import filter_bands_multirate, filter_bands
+    from eeg_kriteria import BANDS
+    t = np.arange(60 * FS) / FS
+    rng = np.random.default_rng(7)
+    # Satu sinus di tengah setiap band
+    x = sum(np.sin(2 * np.pi * (l + h) / 2 * t + rng.uniform(0, 6)) for l, h in BANDS.values())
+    x = x + rng.normal(0, 0.1, len(t))
+    multi, _ = filter_bands_multirate(x, FS, output='full')
+    asli = filter_bands(x, FS)
+    inti = slice(5 * FS, -5 * FS)
+    for name in BANDS:
+        daya_multi, daya_asli = np.mean(multi[name][inti]**2), np.mean(asli[name][inti]**2)
+        assert daya_multi == pytest.approx(daya_asli, rel=0.1)
+
+def test_filter_bands_multirate_output_tidak_dikenal():
+    from eeg_dsp import filter_bands_multirate
+    with pytest.raises(ValueError, match="output"):
+        filter_bands_multirate(np.zeros(4 * FS), FS, output='lain')
+
+def test_analysis_bands_mask_ikut_diturunkan():
+    from eeg_dsp import analysis_bands
+    x = np.random.default_rng(8).normal(0, 1, 20 * FS)
+    mask = np.arange(len(x)) % 7 != 0
+    signals, m, fs_bands = analysis_bands(x, FS, mask, multirate=True)
+    k = int(round(FS / fs_bands))
+    assert k > 1
+    np.testing.assert_array_equal(m, mask[::k])
+    assert all(len(s) == len(m) for s in signals.values())
+    signals, m, fs_bands = analysis_bands(x, FS, mask)
+    assert fs_bands == FS and m is mask
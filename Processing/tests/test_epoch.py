@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from eeg_epoch import (AUDIO_MULAI, SOAL_MULAI, TES_SELESAI, MarkerWriter, baca_marker, epoch,
+                       jadwal_soal, marker_path, skor_soal, statistik_soal)
+from eeg_kriteria import BANDS, statistik_band
+
+FS = 64
+
+def _tulis_marker(tmp_path, events):
+    rekaman = str(tmp_path / "sesi.csv")
+    jam = iter(t for t, _, _ in events)
+    writer = MarkerWriter(marker_path(rekaman), lambda: next(jam))
+    for _, event, soal in events:
+        writer.tulis(event, soal)
+    writer.close()
+    writer.tulis(SOAL_MULAI, 99)        # setelah close diabaikan
+    return rekaman
+
+def test_marker_tulis_baca_dan_jadwal(tmp_path):
+    rekaman = _tulis_marker(tmp_path, [
+        (10.0, SOAL_MULAI, 1), (12.5, AUDIO_MULAI, 1), (20.0, SOAL_MULAI, 2), (35.0, TES_SELESAI, ""),
+    ])
+    markers = baca_marker(rekaman)
+    assert list(markers['event']) == [SOAL_MULAI, AUDIO_MULAI, SOAL_MULAI, TES_SELESAI]
+    assert baca_marker(marker_path(rekaman)) is not None
+    nomor, onset, akhir = jadwal_soal(markers)
+    np.testing.assert_array_equal(nomor, [1, 2])
+    np.testing.assert_array_equal(onset, [10.0, 20.0])
+    np.testing.assert_array_equal(akhir, [20.0, 35.0])
+    assert baca_marker(str(tmp_path / "lain.csv")) is None
+
+@pytest.mark.parametrize("starts", [[0, 50, 100, 150], [3, 40, 41, 170]])
+def test_epoch_sama_dengan_loop(starts):
+    x = np.random.default_rng(0).normal(size=(2, 5, 200))
+    ep = epoch(x, starts, 25)
+    assert ep.shape == (len(starts), 2, 5, 25)
+    for q, s in enumerate(starts):
+        np.testing.assert_array_equal(ep[q], x[..., s:s + 25])
+    assert np.shares_memory(ep, x) == (starts == [0, 50, 100, 150])
+
+def test_epoch_di_luar_rekaman():
+    with pytest.raises(ValueError, match="rentang"):
+        epoch(np.zeros(100), [0, 90], 20)
+
+def test_statistik_soal_per_soal_dan_kanal(tmp_path):
+    rng = np.random.default_rng(1)
+    n = 40 * FS
+    bands = [dict(zip(BANDS, rng.normal(0, 1, (5, n)))) for _ in range(2)]
+    masks = [None, rng.random(n) > 0.2]
+    t0 = 100.0
+    markers = baca_marker(_tulis_marker(tmp_path, [
+        (t0 + 5, SOAL_MULAI, 1), (t0 + 15, SOAL_MULAI, 2), (t0 + 27, SOAL_MULAI, 3), (t0 + 38, TES_SELESAI, ""),
+        (t0 + 90, SOAL_MULAI, 4),       # di luar rekaman -> dibuang
+    ]))
+
+    soal = statistik_soal(bands, masks, FS, t0, markers)
+    np.testing.assert_array_equal(soal['nomor'], [1, 2, 3])
+    assert soal['panjang'] == 10.0
+    power = soal['statistik'][0]
+    assert power.shape == (3, 2, 5)
+    L = 10 * FS
+    for q, mulai in enumerate([5, 15, 27]):
+        s = slice(mulai * FS, mulai * FS + L)
+        for k in range(2):
+            m = None if masks[k] is None else masks[k][s]
+            ref = statistik_band({b: sig[s] for b, sig in bands[k].items()}, m)
+            np.testing.assert_allclose(power[q, k], ref[0])
+            np.testing.assert_allclose(soal['statistik'][2][q, k], ref[2])
+    assert skor_soal(soal).shape == (3, 2)
+
+def test_statistik_soal_tanpa_soal_di_rekaman(tmp_path):
+    bands = [dict(zip(BANDS, np.zeros((5, FS))))]
+    markers = baca_marker(_tulis_marker(tmp_path, [(50.0, SOAL_MULAI, 1)]))
+    assert statistik_soal(bands, [None], FS, 0.0, markers) is None
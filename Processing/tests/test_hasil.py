@@ -0,0 +1,37 @@
+import pytest
+
+from eeg_hasil import LazyResult
+
+def test_loader_hanya_dipanggil_sekali_saat_diakses():
+    panggilan = []
+    res = LazyResult({"ok": True}).lazy("kanan", lambda: panggilan.append(1) or [1, 2])
+
+    assert "kanan" in res and not res.is_loaded("kanan")
+    assert res.loaded() == {"ok": True}
+    assert panggilan == []
+
+    assert res["kanan"] == [1, 2]
+    assert res.get("kanan") == [1, 2]
+    assert panggilan == [1]
+    assert res.is_loaded("kanan")
+
+def test_get_kunci_tidak_ada_memberi_default():
+    res = LazyResult()
+    assert res.get("soal") is None
+    assert res.get("soal", 0) == 0
+    with pytest.raises(KeyError):
+        res["soal"]
+
+def test_error_loader_tidak_ditelan():
+    def loader():
+        return {}["kolom_hilang"]
+
+    res = LazyResult().lazy("bilateral", loader)
+    with pytest.raises(KeyError, match="kolom_hilang"):
+        res.get("bilateral")
+
+    res = LazyResult().lazy("bootstrap", lambda: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        res.get("bootstrap")
+    # Kunci tetap ada setelah loader gagal (tidak berubah jadi default diam-diam)
+    assert "bootstrap" in res
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from eeg_kriteria import aturan_aktif
+from kalibrasi import grid_threshold
+
+@pytest.mark.parametrize("steps", [2, 3, 5, 9])
+def test_grid_threshold_memuat_threshold_protokol(steps):
+    aturan = aturan_aktif()
+    K = len(aturan.thresholds)
+    values = np.random.default_rng(0).normal(size=(40, K))
+    vary = [0, K - 1]
+    grid = grid_threshold(values, aturan, steps, vary)
+    assert grid.shape == (steps, K)
+    for k in range(K):
+        assert aturan.thresholds[k] in grid[:, k]
+        if k in vary:
+            assert np.all(np.diff(grid[:, k]) >= 0)
+        else:
+            assert np.all(grid[:, k] == aturan.thresholds[k])
+
+def test_grid_threshold_threshold_di_luar_sebaran_fitur():
+    aturan = aturan_aktif()
+    values = np.full((10, len(aturan.thresholds)), -1e6)
+    grid = grid_threshold(values, aturan, 2, [0])
+    assert aturan.thresholds[0] in grid[:, 0]
+
+@pytest.mark.parametrize("steps", [0, 1])
+def test_grid_threshold_steps_terlalu_kecil(steps):
+    aturan = aturan_aktif()
+    with pytest.raises(ValueError, match="steps"):
+        grid_threshold(np.zeros((4, len(aturan.thresholds))), aturan, steps, [0])
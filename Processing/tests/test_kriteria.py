@@ -0,0 +1,90 @@
+import copy
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import eeg_kriteria
+from eeg_kriteria import ATURAN_PATH, TAMPILAN_TINGKAT, AturanKriteria, aturan_aktif
+
+def _config():
+    with open(ATURAN_PATH, encoding='utf-8') as f:
+        return json.load(f)
+
+def test_protokol_default_punya_teks_tampilan_setiap_tingkat():
+    aturan = AturanKriteria(_config())
+    assert len(aturan.tampilan) == len(aturan.tingkat_names)
+    for tampilan in aturan.tampilan:
+        assert set(tampilan) == set(TAMPILAN_TINGKAT)
+
+def test_tingkat_diganti_nama_memakai_teks_dari_protokol():
+    config = _config()
+    config['tiers'] = [
+        {**config['tiers'][0], 'name': 'normal', 'min_score': 0},
+        {**config['tiers'][-1], 'name': 'rujuk', 'min_score': 3, 'ringkas': 'RUJUK', 'label': 'PERLU RUJUKAN'},
+    ]
+    aturan = AturanKriteria(config)
+
+    # Semua kriteria terpenuhi: delta sangat dominan, gamma hampir nol, korelasi negatif
+    skor = aturan.skor(np.array([[1000.0, 10, 10, 50, 1]]), [2.0], [-0.9])[0]
+    assert aturan.tingkat_names[skor['tingkat']] == 'rujuk'
+    assert aturan.tampilan[skor['tingkat']]['ringkas'] == 'RUJUK'
+    assert aturan.tampilan[skor['tingkat']]['label'] == 'PERLU RUJUKAN'
+
+def test_tingkat_tanpa_teks_tampilan_ditolak():
+    config = _config()
+    config['tiers'] = copy.deepcopy(config['tiers']) + [{'name': 'indikasi_sangat_kuat', 'min_score': 7}]
+    with pytest.raises(ValueError, match="indikasi_sangat_kuat"):
+        AturanKriteria(config)
+
+def test_nama_lama_dari_protokol_aktif():
+    assert eeg_kriteria.ATURAN is aturan_aktif()
+    assert eeg_kriteria.KRITERIA_NAMES == aturan_aktif().names
+    assert eeg_kriteria.TINGKAT_NAMES == aturan_aktif().tingkat_names
+    with pytest.raises(AttributeError):
+        eeg_kriteria.TIDAK_ADA
+
+def test_import_tidak_memuat_protokol_model_atau_numpy():
+    # Aplikasi Tk meng-import eeg_worker saat start; protokol, model & NumPy dimuat belakangan
+    folder = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    kode = ("import sys, eeg_worker; print('numpy' in sys.modules, 'eeg_antrian' in sys.modules); "
+            "import eeg_kriteria, eeg_model; "
+            "print(eeg_kriteria.aturan_aktif.cache_info().currsize, eeg_model.model_aktif.cache_info().currsize)")
+    out = subprocess.run([sys.executable, "-c", kode], cwd=folder, capture_output=True, text=True, check=True)
+    assert out.stdout.split() == ["False", "False", "0", "0"]
+
+def test_skor_batch_sama_dengan_loop_per_sesi():
+    from eeg_kriteria import OPERATORS, nilai_fitur, skor_batch
+    config = _config()
+    aturan = aturan_aktif()
+    rng = np.random.default_rng(0)
+    n = 200
+    power = rng.lognormal(0, 1.5, (n, 5)) * [50, 20, 15, 10, 3]
+    var = rng.uniform(0, 2, n)
+    corr = rng.uniform(-1, 1, n)
+
+    hasil = skor_batch(power, var, corr)
+    assert hasil.dtype == eeg_kriteria.SKOR_DTYPE and hasil.shape == (n,)
+    bobot = sum(c.get('weight', 1) for c in config['criteria'])
+    batas = sorted(t['min_score'] for t in config['tiers'])[1:]
+    for i in range(n):
+        fitur = nilai_fitur(power[i], var[i], corr[i])
+        skor = 0
+        for k, c in enumerate(config['criteria']):
+            nilai = float(fitur[c['feature']])
+            lolos = OPERATORS[c['operator']](nilai, c['threshold'])
+            assert hasil['values'][i, k] == pytest.approx(nilai)
+            assert hasil['passed'][i, k] == lolos
+            skor += c.get('weight', 1) * lolos
+        assert hasil['kriteria_terpenuhi'][i] == hasil['passed'][i].sum()
+        assert hasil['skor'][i] == pytest.approx(skor)
+        assert hasil['confidence_score'][i] == pytest.approx(skor / bobot * 100, rel=1e-5)
+        assert hasil['tingkat'][i] == sum(skor >= b for b in batas)
+    assert len(set(hasil['tingkat'])) > 1
+    np.testing.assert_allclose(hasil['relative_power'].sum(axis=1), 100)
+    # Dimensi depan bebas: (kanal, sesi) sama dengan per baris
+    dua = aturan.skor(np.stack([power, power[::-1]]), np.stack([var, var[::-1]]), np.stack([corr, corr[::-1]]))
+    np.testing.assert_array_equal(dua[1]['tingkat'], hasil['tingkat'][::-1])
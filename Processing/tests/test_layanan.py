@@ -0,0 +1,79 @@
+import asyncio
+import functools
+import json
+import socket
+import threading
+
+import pytest
+
+import eeg_proses
+from eeg_cache import CacheHasil
+from eeg_layanan import KlienAnalisis, LayananAnalisis
+from test_bertahap import _rekaman
+from test_proses import THINGSPEAK
+
+@pytest.fixture
+def layanan(tmp_path, monkeypatch):
+    # Cache di tmp (worker pool di-fork setelah patch ini)
+    monkeypatch.setattr(eeg_proses, "CacheHasil", functools.partial(CacheHasil, str(tmp_path / "cache")))
+    layanan = LayananAnalisis(jobs=1, max_upload=4 * 1024 * 1024)
+    loop = asyncio.new_event_loop()
+    port, siap, task = [], threading.Event(), []
+
+    def jalan():
+        asyncio.set_event_loop(loop)
+        task.append(loop.create_task(layanan.serve(port=0, ready=lambda p: (port.append(p), siap.set()))))
+        try:
+            loop.run_until_complete(task[0])
+        except asyncio.CancelledError:
+            pass
+
+    thread = threading.Thread(target=jalan, daemon=True)
+    thread.start()
+    assert siap.wait(10)
+    yield layanan, port[0]
+    loop.call_soon_threadsafe(task[0].cancel)
+    thread.join(10)
+    loop.close()
+
+def _kirim(port, head, body=b""):
+    # Request mentah (header bebas, tanpa Content-Length otomatis) -> (status, json)
+    with socket.create_connection(("127.0.0.1", port), timeout=10) as sock:
+        sock.sendall(head.encode('latin-1') + b"\r\n" + body)
+        data = b""
+        while chunk := sock.recv(65536):
+            data += chunk
+    status = int(data.split(b" ", 2)[1])
+    return status, json.loads(data.split(b"\r\n\r\n", 1)[1])
+
+def test_upload_dan_status(layanan, tmp_path):
+    server, port = layanan
+    path = _rekaman(tmp_path / "sesi.csv", False, menit=1)
+
+    ringkasan = KlienAnalisis(f"http://127.0.0.1:{port}").ringkasan(path, gain=1000.0, vref=1.65)
+    assert ringkasan['fs'] == pytest.approx(256, rel=1e-3)
+    assert ringkasan['server'] == f"http://127.0.0.1:{port}"
+
+    # Rekaman bukan CSV logger -> 400 dan dihitung gagal, bukan selesai
+    (tmp_path / "thingspeak.csv").write_text(THINGSPEAK)
+    with pytest.raises(ValueError, match="Timestamp"):
+        KlienAnalisis(f"http://127.0.0.1:{port}").ringkasan(str(tmp_path / "thingspeak.csv"), gain=1000.0, vref=1.65)
+    status, body = _kirim(port, "GET /status HTTP/1.1\r\n")
+    assert status == 200 and (body['selesai'], body['gagal'], body['antrian']) == (1, 1, 0)
+
+def test_request_ditolak(layanan):
+    server, port = layanan
+
+    status, body = _kirim(port, "POST /analisis HTTP/1.1\r\n")
+    assert status == 411
+    status, body = _kirim(port, f"POST /analisis HTTP/1.1\r\nContent-Length: {server.max_upload + 1}\r\n", b"x" * 1000)
+    assert status == 413
+    status, body = _kirim(port, "POST /analisis HTTP/1.1\r\nContent-Length: banyak\r\n")
+    assert status == 400 and "Content-Length" in body['error']
+    status, body = _kirim(port, "POST /analisis HTTP/1.1\r\nContent-Length: 3\r\nX-Marker-Bytes: -1\r\n", b"abc")
+    assert status == 400 and "X-Marker-Bytes" in body['error']
+    status, body = _kirim(port, "POST /analisis HTTP/1.1\r\nContent-Length: 3\r\nX-Marker-Bytes: 9\r\n", b"abc")
+    assert status == 400
+
+    status, body = _kirim(port, "GET /status HTTP/1.1\r\n")
+    assert (body['selesai'], body['gagal']) == (0, 0)
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+import eeg_model
+from eeg_model import ModelLogistik, fit_logistik, latih, muat_model, sigmoid, simpan_model
+
+FITUR = ['delta_rel', 'delta_gamma_ratio', 'delta_gamma_correlation']
+
+def _data(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 3))
+    y = rng.random(n) < sigmoid(2 * X[:, 0] - X[:, 2])
+    return X, y
+
+def test_sigmoid_stabil_untuk_logit_besar():
+    with np.errstate(over='raise'):
+        p = sigmoid(np.array([-1e4, 0.0, 1e4]))
+    np.testing.assert_array_equal(p, [0.0, 0.5, 1.0])
+
+def test_fit_logistik_memulihkan_arah_koefisien():
+    X, y = _data()
+    mean, scale, coef, _ = fit_logistik(X, y, l2=0.1)
+    np.testing.assert_allclose(mean, X.mean(axis=0))
+    assert coef[0] > 0.5 and coef[2] < -0.2 and abs(coef[1]) < 0.3
+    # Penalti besar menyusutkan koefisien ke nol
+    assert np.all(np.abs(fit_logistik(X, y, l2=1e6)[2]) < 1e-2)
+
+def test_latih_probabilitas_terkalibrasi():
+    X, y = _data(600)
+    model, oof = latih(X, y, FITUR, l2=1.0, folds=5)
+    p = model.prob(X)
+    assert oof.shape == (600,) and p.shape == (600,)
+    assert np.all((p > 0) & (p < 1))
+    assert p.mean() == pytest.approx(y.mean(), abs=0.05)
+    assert model.meta['n_sesi'] == 600 and model.meta['n_positif'] == int(y.sum())
+    # Dimensi depan bebas
+    assert model.prob(X.reshape(2, 300, 3)).shape == (2, 300)
+
+def test_simpan_muat_model(tmp_path):
+    X, y = _data()
+    model, _ = latih(X, y, FITUR)
+    path = tmp_path / "model.json"
+    simpan_model(path, model)
+    dimuat = muat_model(path)
+    np.testing.assert_allclose(dimuat.prob(X), model.prob(X))
+    assert dimuat.features == FITUR and dimuat.kalibrasi == model.kalibrasi
+    assert muat_model(tmp_path / "tidak_ada.json") is None
+
+def test_prob_statistik_dari_statistik_band():
+    model = ModelLogistik(FITUR, np.zeros(3), np.ones(3), [1.0, 0.0, 0.0], 0.0)
+    power = np.array([[50.0, 20, 15, 10, 5]])
+    p = model.prob_statistik(power, [0.5], [0.1])
+    assert p[0] == pytest.approx(sigmoid(50.0))
+
+def test_fitur_tidak_dikenal_dan_nama_lama():
+    with pytest.raises(ValueError, match="Fitur"):
+        ModelLogistik(['bukan_fitur'], [0], [1], [1], 0)
+    assert eeg_model.MODEL is eeg_model.model_aktif()
@@ -0,0 +1,17 @@
+import pytest
+
+from eeg_arsip import FormatRekamanError
+from eeg_cache import CacheHasil
+from eeg_proses import ringkasan_cache
+
+THINGSPEAK = "created_at,entry_id,field1,field2\n2024-08-16 10:00:00 UTC,1,2048,2050\n"
+
+@pytest.mark.parametrize("chunked_min_bytes", [None, 0])
+def test_csv_bukan_logger_ditolak_dan_tidak_di_cache(tmp_path, chunked_min_bytes):
+    path = tmp_path / "thingspeak.csv"
+    path.write_text(THINGSPEAK)
+    cache = CacheHasil(str(tmp_path / "cache"))
+
+    with pytest.raises(FormatRekamanError, match="Timestamp"):
+        ringkasan_cache(str(path), cache=cache, gain=1000.0, vref=1.65, chunked_min_bytes=chunked_min_bytes)
+    assert cache.entries() == []
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from eeg_segmen import deteksi_segmen, fitur_segmen, segmen_view, terapkan_aturan
+
+def _segmen_loop(data, n):
+    # Versi loop lama: potong per segmen, sisa di ujung dibuang
+    return np.array([data[i * n:(i + 1) * n] for i in range(len(data) // n)])
+
+@pytest.mark.parametrize("panjang, n", [(1000, 100), (1057, 100), (256, 256), (999, 7)])
+def test_segmen_view_sama_dengan_loop(panjang, n):
+    data = np.random.default_rng(0).normal(size=panjang)
+    seg = segmen_view(data, n)
+    np.testing.assert_array_equal(seg, _segmen_loop(data, n))
+    assert np.shares_memory(seg, data)
+
+def test_segmen_view_terlalu_pendek():
+    with pytest.raises(ValueError):
+        segmen_view(np.zeros(10), 11)
+
+def test_fitur_segmen_sama_dengan_loop():
+    fs = 128
+    seg = segmen_view(np.random.default_rng(1).normal(0, 20, 10 * fs), fs)
+    fitur = fitur_segmen(seg, fs, ('mean_abs', 'rms', 'ptp', 'zero_crossings'), bands={'alpha': (8, 13)})
+    for i, s in enumerate(seg):
+        assert fitur['mean_abs'][i] == pytest.approx(np.mean(np.abs(s)))
+        assert fitur['rms'][i] == pytest.approx(np.sqrt(np.mean(s**2)))
+        assert fitur['ptp'][i] == pytest.approx(s.max() - s.min())
+        assert fitur['zero_crossings'][i] == sum((a < 0) != (b < 0) for a, b in zip(s[:-1], s[1:]))
+    assert fitur['alpha'].shape == (len(seg),) and np.all(fitur['alpha'] > 0)
+
+def test_fitur_tidak_dikenal():
+    with pytest.raises(ValueError, match="Fitur"):
+        fitur_segmen(np.zeros((2, 4)), 4, ('bukan_fitur',))
+
+def test_terapkan_aturan_dan_rasio():
+    fitur = {'mean_abs': np.array([10., 60., 70.]), 'rms': np.array([20., 30., 200.])}
+    mask = terapkan_aturan(fitur, [('mean_abs', '>', 50), ('rms/mean_abs', '<', 1)])
+    np.testing.assert_array_equal(mask, [False, True, False])
+
+def test_deteksi_segmen_mengikuti_rasio():
+    fs = 16
+    data = np.concatenate([np.full(fs * 30, 100.0), np.full(fs * 10, 1.0)])
+    hasil = deteksi_segmen(data, fs, segment_duration=10, rules=[('mean_abs', '>', 50)], indikasi_ratio=0.7)
+    assert (hasil['total_segmen'], hasil['segmen_terindikasi']) == (4, 3)
+    assert hasil['hasil'] == "disleksia"
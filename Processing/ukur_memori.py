@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bandingkan puncak memori pipeline analisis (eeg_proses.ringkasan_file,
+yang dijalankan worker aplikasi) mode float64 vs float32.
+
+    python ukur_memori.py [file.csv] [--menit 30]
+
+Tanpa file, rekaman sintetis (Timestamp, ADC_KIRI, ADC_KANAN) dibuat di
+folder sementara. Setiap dtype dijalankan sekali tanpa diukur sebelum
+tracemalloc dimulai: import pandas/SciPy (lazy) dan desain filter yang
+di-cache tidak ikut terhitung di dtype yang diukur pertama.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from eeg_kriteria import TINGKAT_NAMES, skor_batch
+from eeg_proses import ringkasan_file
+
+GAIN = 1000.0
+VREF = 1.65
+
+def buat_csv_sintetis(path, menit, fs=256):
+    n = int(menit * 60 * fs)
+    rng = np.random.default_rng(0)
+    t = np.arange(n) / fs
+    adc = 2048 + rng.normal(0, 15, (2, n)) + 40 * np.sin(2 * np.pi * 2 * t)
+    pd.DataFrame({
+        "Timestamp": t,
+        "ADC_KIRI": adc[0].astype(int),
+        "ADC_KANAN": adc[1].astype(int),
+    }).to_csv(path, index=False)
+
+def analisis(filename, dtype):
+    # Selalu di memori penuh (tanpa jalur bertahap), sama seperti aplikasi untuk file < CHUNKED_MIN_BYTES
+    return ringkasan_file(filename, GAIN, VREF, dtype=dtype, chunked_min_bytes=None)
+
+def ukur(filename, dtype):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    ringkasan = analisis(filename, dtype)
+    dt = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1e6, dt, ringkasan
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("csv", nargs="?")
+    ap.add_argument("--menit", type=float, default=30)
+    args = ap.parse_args()
+
+    filename = args.csv
+    if not filename:
+        filename = os.path.join(tempfile.mkdtemp(), "eeg_sintetis.csv")
+        buat_csv_sintetis(filename, args.menit)
+
+    dtypes = (np.float64, np.float32)
+    for dtype in dtypes:
+        analisis(filename, dtype)      # pemanasan, tidak diukur
+    for dtype in dtypes:
+        peak, dt, ringkasan = ukur(filename, dtype)
+        band_power, delta_variability, correlation = ringkasan['statistik']
+        tingkat = skor_batch(np.asarray(band_power)[None], [delta_variability], [correlation])[0]['tingkat']
+        print(f"{np.dtype(dtype).name:8s}: puncak {peak:8.1f} MB, {dt:6.2f} detik, "
+              f"tingkat {TINGKAT_NAMES[tingkat]}")